@@ -0,0 +1,63 @@
+"""
+Benchmark update_allocations_batch_async as the number of updates grows.
+
+Every update in a batch shifts the end date of one allocation belonging to
+a single engineer, the worst case for per-engineer grouping. Time per
+update should stay roughly flat as the batch grows. Run from the
+ProjectAllocationManagerMCP directory:
+
+    python -m benchmarks.bench_bulk_update --sizes 500 1000 2000 4000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import timedelta
+from benchmarks.dataset import write_dataset
+from service.allocation_service import AllocationService
+from service.json_storage import JsonStorageBackend
+
+
+async def run(sizes: list[int]) -> None:
+    print(f"{'updates':>8}{'seconds':>10}{'us/update':>11}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            # One engineer holding every allocation
+            write_dataset(folder, 1, 10, size)
+            service = AllocationService(
+                backend=JsonStorageBackend(folder, compact_threshold=10 * size)
+            )
+            await service.load_data_async()
+
+            updates = [
+                {
+                    "allocationId": allocation.id,
+                    "endDate": (allocation.end_date - timedelta(days=1)).strftime(
+                        "%Y-%m-%d"
+                    ),
+                }
+                for allocation in await service.get_allocations_async()
+            ]
+            started = time.perf_counter()
+            success, message, _ = await service.update_allocations_batch_async(updates)
+            elapsed = time.perf_counter() - started
+            await service.close_async()
+            if not success:
+                raise RuntimeError(message)
+
+        print(f"{size:>8}{elapsed:>10.3f}{elapsed / size * 1e6:>11.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[500, 1_000, 2_000, 4_000],
+        help="updates per batch",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark id lookups on AllocationService as the dataset grows.
+
+Compares the indexed get_*_by_id_async lookups with the linear scans they
+replaced. Indexed lookups should stay flat while scans grow with the data.
+Run from the ProjectAllocationManagerMCP directory:
+
+    python -m benchmarks.bench_lookups --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from benchmarks.dataset import write_dataset
+from service.allocation_service import AllocationService
+from service.json_storage import JsonStorageBackend
+
+
+async def time_lookups(service: AllocationService, ids: dict, lookups: int) -> dict:
+    """Average microseconds per indexed lookup of each kind."""
+    lookup_functions = {
+        "engineer": service.get_engineer_by_id_async,
+        "project": service.get_project_by_id_async,
+        "allocation": service.get_allocation_by_id_async,
+    }
+    timings = {}
+    for kind, lookup in lookup_functions.items():
+        sample = random.choices(ids[kind], k=lookups)
+        started = time.perf_counter()
+        for id in sample:
+            await lookup(id)
+        timings[kind] = (time.perf_counter() - started) / lookups * 1e6
+    return timings
+
+
+def time_scans(service: AllocationService, ids: dict, lookups: int) -> dict:
+    """Average microseconds per linear-scan lookup, as done before the id indexes."""
+    backend = service._backend
+    collections = {
+        "engineer": backend.get_engineers(),
+        "project": backend.get_projects(),
+        "allocation": backend.get_allocations(),
+    }
+    timings = {}
+    for kind, items in collections.items():
+        sample = random.choices(ids[kind], k=lookups)
+        started = time.perf_counter()
+        for id in sample:
+            next((item for item in items if item.id == id), None)
+        timings[kind] = (time.perf_counter() - started) / lookups * 1e6
+    return timings
+
+
+async def run(sizes: list[int], lookups: int, scan_lookups: int) -> None:
+    print(
+        f"{'allocations':>12}{'engineers':>11}"
+        f"{'eng us':>9}{'proj us':>9}{'alloc us':>10}"
+        f"{'scan eng':>10}{'scan proj':>11}{'scan alloc':>12}"
+    )
+    for size in sizes:
+        engineers = max(size // 10, 1)
+        projects = max(size // 100, 1)
+        with tempfile.TemporaryDirectory() as folder:
+            write_dataset(folder, engineers, projects, size)
+            service = AllocationService(backend=JsonStorageBackend(folder))
+            await service.load_data_async()
+
+            ids = {
+                "engineer": [e.id for e in await service.get_engineers_async()],
+                "project": [p.id for p in await service.get_projects_async()],
+                "allocation": [a.id for a in await service.get_allocations_async()],
+            }
+            indexed = await time_lookups(service, ids, lookups)
+            scanned = time_scans(service, ids, scan_lookups)
+
+        print(
+            f"{size:>12}{engineers:>11}"
+            f"{indexed['engineer']:>9.2f}{indexed['project']:>9.2f}{indexed['allocation']:>10.2f}"
+            f"{scanned['engineer']:>10.1f}{scanned['project']:>11.1f}{scanned['allocation']:>12.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+        help="allocation counts to benchmark",
+    )
+    parser.add_argument("--lookups", type=int, default=100_000, help="indexed lookups per kind")
+    parser.add_argument("--scan-lookups", type=int, default=200, help="linear scans per kind")
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.lookups, args.scan_lookups))
+
+
+if __name__ == "__main__":
+    main()
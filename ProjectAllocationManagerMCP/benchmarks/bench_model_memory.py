@@ -0,0 +1,142 @@
+"""
+Benchmark memory used by the model classes before and after __slots__.
+
+Builds the same rows with the previous __dict__-based models and with the
+current slotted ones, and reports the memory allocated for each set.
+Run from the ProjectAllocationManagerMCP directory:
+
+    python -m benchmarks.bench_model_memory --rows 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from models.allocation import Allocation
+from models.engineer import Engineer
+from models.project import Project
+
+
+class DictAllocation:
+    """The Allocation model as it was before __slots__."""
+
+    def __init__(
+        self,
+        id: str,
+        engineer_id: str,
+        project_id: str,
+        allocation_percentage: int,
+        start_date: datetime,
+        end_date: Optional[datetime] = None,
+    ):
+        self.id = id
+        self.engineer_id = engineer_id
+        self.project_id = project_id
+        self.allocation_percentage = allocation_percentage
+        self.start_date = start_date
+        self.end_date = end_date
+
+
+class DictEngineer:
+    """The Engineer model as it was before __slots__."""
+
+    def __init__(self, id: str, name: str, **kwargs):
+        self.id = id
+        self.name = name
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class DictProject:
+    """The Project model as it was before __slots__."""
+
+    def __init__(self, id: str, name: str, **kwargs):
+        self.id = id
+        self.name = name
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def build_allocations(model: type, rows: int, shared: bool) -> list:
+    epoch = datetime(2024, 1, 1)
+    end = epoch + timedelta(days=30)
+    return [
+        model(
+            id="alloc-shared" if shared else f"alloc-{i:08d}",
+            engineer_id="eng-shared" if shared else f"eng-{i % 10_000:06d}",
+            project_id="proj-shared" if shared else f"proj-{i % 1_000:06d}",
+            allocation_percentage=50,
+            start_date=epoch if shared else epoch + timedelta(days=i % 700),
+            end_date=end if shared else epoch + timedelta(days=i % 700 + 30),
+        )
+        for i in range(rows)
+    ]
+
+
+def build_engineers(model: type, rows: int, shared: bool) -> list:
+    skills = ["Python", "SQL"]
+    return [
+        model(
+            id="eng-shared" if shared else f"eng-{i:06d}",
+            name="Engineer" if shared else f"Engineer {i}",
+            role="Software Engineer",
+            skills=skills if shared else ["Python", "SQL"],
+        )
+        for i in range(rows)
+    ]
+
+
+def build_projects(model: type, rows: int, shared: bool) -> list:
+    return [
+        model(
+            id="proj-shared" if shared else f"proj-{i:06d}",
+            name="Project" if shared else f"Project {i}",
+            status="Active",
+        )
+        for i in range(rows)
+    ]
+
+
+def measure(build: Callable[[], list]) -> int:
+    """Bytes still allocated after building a list of rows."""
+    gc.collect()
+    tracemalloc.start()
+    rows = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="allocation rows")
+    parser.add_argument(
+        "--people-rows", type=int, default=100_000, help="engineer and project rows"
+    )
+    args = parser.parse_args()
+
+    cases = [
+        ("Allocation", args.rows, build_allocations, DictAllocation, Allocation),
+        ("Engineer", args.people_rows, build_engineers, DictEngineer, Engineer),
+        ("Project", args.people_rows, build_projects, DictProject, Project),
+    ]
+    # "rows" holds distinct field values like real data; "objects" shares one
+    # set of values across all rows, leaving only the per-object overhead
+    print(
+        f"{'model':<12}{'rows':>10}{'measured':>10}"
+        f"{'__dict__ MB':>13}{'slots MB':>10}{'saved':>8}"
+    )
+    for name, rows, build, old_model, new_model in cases:
+        for measured, shared in (("rows", False), ("objects", True)):
+            old = measure(lambda: build(old_model, rows, shared))
+            new = measure(lambda: build(new_model, rows, shared))
+            print(
+                f"{name:<12}{rows:>10}{measured:>10}"
+                f"{old / 2**20:>13.1f}{new / 2**20:>10.1f}{1 - new / old:>8.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+
+def write_dataset(
+    data_folder: str,
+    engineer_count: int,
+    project_count: int,
+    allocation_count: int,
+    seed: int = 0,
+) -> None:
+    """
+    Write a synthetic engineers/projects/allocations data folder.
+
+    Allocations are short, non-overlapping date ranges spread over the
+    engineers, in the same JSON format as the files in data/.
+
+    Args:
+        data_folder: Folder to write engineers.json, projects.json and allocations.json to.
+        engineer_count: Number of engineers.
+        project_count: Number of projects.
+        allocation_count: Number of allocations.
+        seed: Random seed, for repeatable datasets.
+    """
+    rng = random.Random(seed)
+    os.makedirs(data_folder, exist_ok=True)
+
+    engineers = [
+        {"id": f"eng-{i:06d}", "name": f"Engineer {i}", "role": "Software Engineer"}
+        for i in range(engineer_count)
+    ]
+    projects = [
+        {"id": f"proj-{i:06d}", "name": f"Project {i}", "status": "Active"}
+        for i in range(project_count)
+    ]
+
+    allocations = []
+    epoch = datetime(2024, 1, 1)
+    for i in range(allocation_count):
+        engineer_index = i % engineer_count
+        # Each engineer's allocations follow each other in 30-day slots
+        slot = i // engineer_count
+        start = epoch + timedelta(days=30 * slot)
+        allocations.append(
+            {
+                "id": f"alloc-{i:08d}",
+                "engineerId": engineers[engineer_index]["id"],
+                "projectId": projects[rng.randrange(project_count)]["id"],
+                "allocationPercentage": rng.choice((25, 50, 75, 100)),
+                "startDate": start.strftime("%Y-%m-%dT%H:%M:%S"),
+                "endDate": (start + timedelta(days=rng.randint(7, 30))).strftime(
+                    "%Y-%m-%dT%H:%M:%S"
+                ),
+            }
+        )
+
+    for name, records in (
+        ("engineers", engineers),
+        ("projects", projects),
+        ("allocations", allocations),
+    ):
+        with open(os.path.join(data_folder, f"{name}.json"), "w") as f:
+            json.dump(records, f)
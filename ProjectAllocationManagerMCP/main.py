@@ -1,11 +1,16 @@
 from project_mcp.mcp import mcp
+import asyncio
 import logging
 import project_mcp.mcp_tools  # Ensure tools are registered
 
 
 def main():
     logging.info("Initialize server")
-    mcp.run(transport="stdio")
+    try:
+        mcp.run(transport="stdio")
+    finally:
+        # Make the last allocation changes durable before exiting
+        asyncio.run(project_mcp.mcp_tools.allocation_service.close_async())
 
 
 if __name__ == "__main__":
@@ -5,6 +5,15 @@ from typing import Optional
 class Allocation:
     """Represents an allocation of an engineer to a project."""
 
+    __slots__ = (
+        "id",
+        "engineer_id",
+        "project_id",
+        "allocation_percentage",
+        "start_date",
+        "end_date",
+    )
+
     def __init__(
         self,
         id: str,
@@ -1,17 +1,38 @@
 class Project:
     """Represents a project in the system."""
 
+    # Optional fields every record is expected to have get their own slot.
+    # Any other fields go in extra, which stays None unless a record has some.
+    _optional_fields = ("status", "description")
+    __slots__ = ("id", "name", "status", "description", "extra")
+
     def __init__(self, id: str, name: str, **kwargs):
         self.id = id
         self.name = name
+        for key in self._optional_fields:
+            if key in kwargs:
+                setattr(self, key, kwargs.pop(key))
         # Store any additional attributes
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self.extra = kwargs or None
+
+    def __getattr__(self, key: str):
+        """Expose additional attributes as regular attributes."""
+        # Only reached for unset slots and names without a slot
+        extra = None if key in self.__slots__ else self.extra
+        if extra is None or key not in extra:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{key}'"
+            )
+        return extra[key]
 
     def to_dict(self) -> dict:
         """Convert project to dictionary."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            **{k: v for k, v in self.__dict__.items() if k not in ['id', 'name']}
-        }
\ No newline at end of file
+        data = {"id": self.id, "name": self.name}
+        for key in self._optional_fields:
+            try:
+                data[key] = getattr(self, key)
+            except AttributeError:
+                pass
+        if self.extra:
+            data.update(self.extra)
+        return data
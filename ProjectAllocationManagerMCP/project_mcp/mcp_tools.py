@@ -8,7 +8,9 @@ from datetime import datetime
 import asyncio
 
 
-# Initialize the allocation service
+# Initialize the allocation service. The columnar store used by the analytics
+# tools is built on their first call and then kept up to date, so servers that
+# never run analytics don't hold a second copy of every allocation.
 allocation_service = AllocationService()
 
 
@@ -43,4 +45,98 @@ async def list_projects() -> List[dict]:
     projects = await allocation_service.get_projects_async()
     return [project.to_dict() for project in projects]
 
+@mcp.tool(
+    "allocate_engineers_batch",
+    description="Allocate several engineers to projects at once. Either all allocations are made or none are.",
+)
+async def allocate_engineers_batch(allocations: List[dict]) -> dict:
+    """
+    Allocate several engineers to projects in a single all-or-nothing batch.
+
+    Args:
+        allocations: Items with 'engineerId', 'projectId', 'allocationPercentage' (1-100)
+                     and optional 'startDate' and 'endDate' in YYYY-MM-DD format.
+
+    Returns:
+        Whether the batch was committed, a summary message and per-item results.
+    """
+    success, message, results = (
+        await allocation_service.allocate_engineers_batch_async(allocations)
+    )
+    return {"success": success, "message": message, "results": results}
+
+
+@mcp.tool(
+    "update_allocations_batch",
+    description="Update several allocations at once. Either all updates are applied or none are.",
+)
+async def update_allocations_batch(updates: List[dict]) -> dict:
+    """
+    Update several allocations in a single all-or-nothing batch.
+
+    Args:
+        updates: Items with 'allocationId' and optional 'allocationPercentage' (1-100),
+                 'startDate' and 'endDate' in YYYY-MM-DD format.
+
+    Returns:
+        Whether the batch was applied, a summary message and per-item results.
+    """
+    success, message, results = (
+        await allocation_service.update_allocations_batch_async(updates)
+    )
+    return {"success": success, "message": message, "results": results}
+
+
+@mcp.tool(
+    "get_utilization_matrix",
+    description="Get each engineer's average allocation percentage per day, week or month for a date range",
+)
+async def get_utilization_matrix(
+    start_date: str,
+    end_date: str,
+    granularity: str = "weekly",
+    offset: int = 0,
+    limit: int = 100,
+) -> dict:
+    """
+    Get a page of the engineers x time-buckets utilization matrix.
+
+    Args:
+        start_date: First day of the range in YYYY-MM-DD format.
+        end_date: Last day of the range (inclusive) in YYYY-MM-DD format.
+        granularity: Bucket size, one of 'daily', 'weekly' or 'monthly'.
+        offset: Index of the first engineer to return.
+        limit: Maximum number of engineers to return.
+
+    Returns:
+        The utilization rows for the requested engineers and the offset of the next page.
+    """
+    if limit < 1:
+        return {"success": False, "message": "Limit must be at least 1."}
+    if offset < 0:
+        return {"success": False, "message": "Offset must not be negative."}
+
+    engineers = await allocation_service.get_engineers_async()
+    page = engineers[offset : offset + limit]
+
+    rows = []
+    try:
+        async for chunk in allocation_service.iter_utilization_matrix_async(
+            start_date,
+            end_date,
+            granularity,
+            engineer_ids=[engineer.id for engineer in page],
+        ):
+            rows.extend(chunk)
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+
+    next_offset = offset + limit if offset + limit < len(engineers) else None
+    return {
+        "success": True,
+        "message": f"Utilization for {len(rows)} engineers from {start_date} to {end_date}.",
+        "rows": rows,
+        "nextOffset": next_offset,
+    }
+
 # Additional tools can be added here following the same pattern.
\ No newline at end of file
@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+import time
+from typing import Iterator, List, Optional
+
+
+class AllocationLog:
+    """
+    Append-only write-ahead log of allocation mutations.
+
+    Each mutation is written as one JSON line holding the full allocation
+    record, so replaying the log in order and upserting by id restores the
+    latest state. A batch of mutations is written as one line holding all of
+    its records, so after a crash it is replayed either whole or not at all. Lines are flushed to the OS on every append, while the
+    more expensive fsync is batched by record count and by a timer, so no
+    record waits longer than fsync_interval to reach the disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_batch_size: int = 64,
+        fsync_interval: float = 1.0,
+    ):
+        """
+        Initialize the log.
+
+        Args:
+            path: Path of the log file. It is created on first append.
+            fsync_batch_size: Number of unsynced records that triggers an fsync.
+            fsync_interval: Maximum seconds an appended record waits before it is fsynced.
+        """
+        self.path = path
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.record_count = 0
+
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        # Fsyncs pending records that no later append or close picks up
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def replay(self) -> Iterator[dict]:
+        """
+        Read the records currently in the log, oldest first.
+
+        A torn last line left by a crash mid-append is ignored, and once
+        every record has been read the log is truncated after the last
+        complete record, so the next append starts on a clean line.
+
+        Returns:
+            An iterator over the logged allocation records.
+        """
+        self.record_count = 0
+        if not os.path.exists(self.path):
+            return
+
+        # End offset of the last record that was read back intact
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    print(f"Skipping corrupt allocation log entry in {self.path}")
+                    continue
+                # A complete record is only missing its newline if the crash hit
+                # between the two; keep it and let the next append add one
+                valid_end = offset
+                records = record["batch"] if "batch" in record else [record]
+                self.record_count += len(records)
+                yield from records
+
+        if os.path.getsize(self.path) > valid_end:
+            with self._lock:
+                self.close()
+                os.truncate(self.path, valid_end)
+
+    def append(self, record: dict) -> None:
+        """
+        Append a single allocation record to the log.
+
+        Args:
+            record: The allocation record to log.
+        """
+        self._write(record, 1)
+
+    def append_batch(self, records: List[dict]) -> None:
+        """
+        Append several allocation records as one entry that is replayed all or nothing.
+
+        Args:
+            records: The allocation records to log.
+        """
+        if records:
+            self._write({"batch": records}, len(records))
+
+    def sync(self) -> None:
+        """Fsync any records appended since the last sync."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._file is not None and self._pending:
+                os.fsync(self._file.fileno())
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def write_snapshot(self, snapshot_path: str, records: List[dict]) -> None:
+        """
+        Atomically replace a snapshot file and truncate the log.
+
+        The snapshot is written to a temporary file, fsynced and renamed over
+        the old one before the log is emptied, so a crash at any point leaves
+        either the old snapshot plus the log or the new snapshot.
+
+        Args:
+            snapshot_path: Path of the JSON snapshot file to replace.
+            records: All allocation records to write to the snapshot.
+        """
+        temp_path = f"{snapshot_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(records, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, snapshot_path)
+
+        self.close()
+        with open(self.path, "w") as f:
+            os.fsync(f.fileno())
+        self.record_count = 0
+
+    def close(self, sync: bool = True) -> None:
+        """
+        Close the log file.
+
+        Args:
+            sync: Whether to fsync pending records before closing.
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            if sync:
+                self.sync()
+            elif self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: dict, record_count: int) -> None:
+        """Write one log line and fsync it once the batch size or interval is reached."""
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a")
+                if not self._ends_with_newline():
+                    line = "\n" + line
+
+            self._file.write(line)
+            self._file.flush()
+            self.record_count += record_count
+            self._pending += 1
+
+            if (
+                self._pending >= self.fsync_batch_size
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self.sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.fsync_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _ends_with_newline(self) -> bool:
+        """Check whether the log is empty or its last record is newline-terminated."""
+        size = os.path.getsize(self.path)
+        if size == 0:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(size - 1)
+            return f.read(1) == b"\n"
@@ -1,11 +1,21 @@
-import json
+import asyncio
 import os
 import uuid
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from models.allocation import Allocation
 from models.engineer import Engineer
 from models.project import Project
+from service.capacity_timeline import CapacityTimeline
+from service.columnar_store import (
+    UTILIZATION_GRANULARITIES,
+    ColumnarAllocationStore,
+    utilization_buckets,
+)
+from service.interval_index import IntervalIndex, overlaps
+from service.json_storage import JsonStorageBackend
+from service.sqlite_storage import SqliteStorageBackend
+from service.storage_backend import StorageBackend
 
 
 class AllocationService:
@@ -16,22 +26,48 @@ class AllocationService:
     and data persistence.
     """
 
-    def __init__(self, data_folder: Optional[str] = None):
+    def __init__(
+        self,
+        data_folder: Optional[str] = None,
+        compact_threshold: int = 1000,
+        backend: Optional[StorageBackend] = None,
+        columnar: bool = False,
+    ):
         """
         Initialize the AllocationService with an optional custom data folder path.
 
         Args:
             data_folder: Optional path to the data folder. If not provided,
                         defaults to 'data' folder in the current directory.
+            compact_threshold: Number of logged allocation changes after which the
+                        log is compacted into allocations.json.
+            backend: Optional storage backend. If not provided, the backend is
+                        chosen by the ALLOCATION_STORAGE_BACKEND environment variable:
+                        'sqlite' stores data in allocations.db in the data folder
+                        (importing the JSON files on first use), anything else
+                        keeps the JSON files as storage.
+            columnar: If True, maintain a columnar copy of the allocations for
+                        analytics and lightweight allocation views from the start.
+                        Otherwise it is built the first time analytics need it.
         """
         if data_folder is None:
             self.data_folder = os.path.join(os.getcwd(), "data")
         else:
             self.data_folder = data_folder
 
-        self._engineers: List[Engineer] = []
-        self._projects: List[Project] = []
-        self._allocations: List[Allocation] = []
+        if backend is None:
+            if os.environ.get("ALLOCATION_STORAGE_BACKEND", "json").lower() == "sqlite":
+                backend = SqliteStorageBackend(
+                    os.path.join(self.data_folder, "allocations.db"),
+                    import_folder=self.data_folder,
+                )
+            else:
+                backend = JsonStorageBackend(self.data_folder, compact_threshold)
+        self._backend = backend
+
+        self._columnar: Optional[ColumnarAllocationStore] = (
+            ColumnarAllocationStore() if columnar else None
+        )
 
     async def get_engineers_async(self) -> List[Engineer]:
         """
@@ -40,7 +76,7 @@ class AllocationService:
         Returns:
             A list of all engineers.
         """
-        return self._engineers
+        return self._backend.get_engineers()
 
     async def get_projects_async(self) -> List[Project]:
         """
@@ -49,16 +85,24 @@ class AllocationService:
         Returns:
             A list of all projects.
         """
-        return self._projects
+        return self._backend.get_projects()
 
-    async def get_allocations_async(self) -> List[Allocation]:
+    async def get_allocations_async(
+        self, as_views: bool = False
+    ) -> Sequence[Allocation]:
         """
         Retrieve all allocations in the system.
 
+        Args:
+            as_views: If True, return lightweight read-only views from the
+                      columnar store, which must be enabled.
+
         Returns:
             A list of all allocations.
         """
-        return self._allocations
+        if as_views:
+            return self._get_columnar_store().get_rows()
+        return self._backend.get_allocations()
 
     async def get_engineer_by_id_async(self, id: str) -> Optional[Engineer]:
         """
@@ -70,10 +114,7 @@ class AllocationService:
         Returns:
             The engineer if found, otherwise None.
         """
-        for engineer in self._engineers:
-            if engineer.id == id:
-                return engineer
-        return None
+        return self._backend.get_engineer(id)
 
     async def get_project_by_id_async(self, id: str) -> Optional[Project]:
         """
@@ -85,10 +126,7 @@ class AllocationService:
         Returns:
             The project if found, otherwise None.
         """
-        for project in self._projects:
-            if project.id == id:
-                return project
-        return None
+        return self._backend.get_project(id)
 
     async def get_allocation_by_id_async(self, id: str) -> Optional[Allocation]:
         """
@@ -100,38 +138,49 @@ class AllocationService:
         Returns:
             The allocation if found, otherwise None.
         """
-        for allocation in self._allocations:
-            if allocation.id == id:
-                return allocation
-        return None
+        return self._backend.get_allocation(id)
 
     async def get_allocations_by_engineer_id_async(
-        self, engineer_id: str
-    ) -> List[Allocation]:
+        self, engineer_id: str, copy: bool = False, as_views: bool = False
+    ) -> Sequence[Allocation]:
         """
         Retrieve all allocations for a specific engineer.
 
         Args:
             engineer_id: The unique identifier of the engineer.
+            copy: If True, return a new list. By default the indexed list is
+                  returned as a read-only view and must not be modified.
+            as_views: If True, return lightweight read-only views from the
+                      columnar store, which must be enabled.
 
         Returns:
             A list of allocations for the specified engineer.
         """
-        return [a for a in self._allocations if a.engineer_id == engineer_id]
+        if as_views:
+            return self._get_columnar_store().get_rows_by_engineer_id(engineer_id)
+        allocations = self._backend.get_allocations_by_engineer_id(engineer_id)
+        return list(allocations) if copy else allocations
 
     async def get_allocations_by_project_id_async(
-        self, project_id: str
-    ) -> List[Allocation]:
+        self, project_id: str, copy: bool = False, as_views: bool = False
+    ) -> Sequence[Allocation]:
         """
         Retrieve all allocations for a specific project.
 
         Args:
             project_id: The unique identifier of the project.
+            copy: If True, return a new list. By default the indexed list is
+                  returned as a read-only view and must not be modified.
+            as_views: If True, return lightweight read-only views from the
+                      columnar store, which must be enabled.
 
         Returns:
             A list of allocations for the specified project.
         """
-        return [a for a in self._allocations if a.project_id == project_id]
+        if as_views:
+            return self._get_columnar_store().get_rows_by_project_id(project_id)
+        allocations = self._backend.get_allocations_by_project_id(project_id)
+        return list(allocations) if copy else allocations
 
     async def allocate_engineer_async(
         self,
@@ -154,6 +203,426 @@ class AllocationService:
             start_date: Optional start date in YYYY-MM-DD format. Defaults to today if not provided.
             end_date: Optional end date in YYYY-MM-DD format. Leave empty for indefinite allocation.
 
+        Returns:
+            A tuple containing (success, message, allocation).
+        """
+        success, message, new_allocation = await self._validate_new_allocation(
+            engineer_id, project_id, allocation_percentage, start_date, end_date
+        )
+        if not success:
+            return (False, message, None)
+
+        self._backend.add_allocation(new_allocation)
+        if self._columnar is not None:
+            self._columnar.add(new_allocation)
+
+        return (True, message, new_allocation)
+
+    async def allocate_engineers_batch_async(
+        self, allocations: List[dict]
+    ) -> Tuple[bool, str, List[dict]]:
+        """
+        Allocate several engineers to projects, committing all allocations or none.
+
+        Every item is validated with the same rules as allocate_engineer_async. Items are
+        checked against the stored allocations and the earlier items of the batch, so two
+        items that together over-allocate an engineer or duplicate a project are rejected.
+        Each engineer's capacity timeline is built once and shared by all of their items.
+
+        Args:
+            allocations: Items with 'engineerId', 'projectId', 'allocationPercentage' and
+                         optional 'startDate' and 'endDate' in YYYY-MM-DD format.
+
+        Returns:
+            A tuple containing (success, message, results), with one result per item
+            holding its 'index', 'valid', 'message' and, once committed, 'allocation'.
+        """
+        if not allocations:
+            return (False, "No allocations provided.", [])
+
+        capacities: Dict[str, CapacityTimeline] = {}
+        pending: List[Allocation] = []
+        results: List[dict] = []
+
+        for index, item in enumerate(allocations):
+            message = self._batch_item_error(item, ("engineerId", "projectId"))
+            if message is None and item.get("allocationPercentage") is None:
+                message = "Allocation percentage must be between 1 and 100."
+            if message is not None:
+                results.append(
+                    {"index": index, "valid": False, "message": message, "allocation": None}
+                )
+                continue
+
+            engineer_id = item["engineerId"]
+            allocation_percentage = item["allocationPercentage"]
+
+            # Shared capacity view: stored allocations plus valid items so far
+            capacity = capacities.get(engineer_id)
+            if capacity is None:
+                capacity = CapacityTimeline()
+                for allocation in self._backend.get_allocations_by_engineer_id(
+                    engineer_id
+                ):
+                    capacity.add(allocation)
+                capacities[engineer_id] = capacity
+
+            success, message, new_allocation = await self._validate_new_allocation(
+                engineer_id,
+                item.get("projectId"),
+                allocation_percentage,
+                item.get("startDate"),
+                item.get("endDate"),
+                capacity=capacity,
+                pending=pending,
+            )
+            if success:
+                capacity.add(new_allocation)
+                pending.append(new_allocation)
+            results.append(
+                {"index": index, "valid": success, "message": message, "allocation": None}
+            )
+
+        invalid_count = sum(1 for result in results if not result["valid"])
+        if invalid_count:
+            for result in results:
+                if result["valid"]:
+                    result["message"] = (
+                        "Valid, but not allocated because other allocations in the batch are invalid."
+                    )
+            return (
+                False,
+                f"{invalid_count} of {len(allocations)} allocations are invalid. "
+                f"No allocations were made.",
+                results,
+            )
+
+        self._backend.add_allocations(pending)
+        if self._columnar is not None:
+            for new_allocation in pending:
+                self._columnar.add(new_allocation)
+
+        for result, new_allocation in zip(results, pending):
+            result["allocation"] = new_allocation.to_dict()
+
+        return (True, f"Successfully made {len(pending)} allocations.", results)
+
+    async def update_allocation_async(
+        self,
+        allocation_id: str,
+        allocation_percentage: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Tuple[bool, str, Optional[Allocation]]:
+        """
+        Update an existing allocation with new percentage and/or date range.
+
+        All update parameters are optional - only provided values will be updated.
+        Validates that the allocation exists, dates are valid, and the engineer won't be over-allocated.
+
+        Args:
+            allocation_id: The unique identifier of the allocation to update.
+            allocation_percentage: Optional new allocation percentage (1-100).
+            start_date: Optional new start date in YYYY-MM-DD format.
+            end_date: Optional new end date in YYYY-MM-DD format.
+
+        Returns:
+            A tuple containing (success, message, allocation).
+        """
+        # Validation 1: Find the allocation
+        allocation = await self.get_allocation_by_id_async(allocation_id)
+        if allocation is None:
+            return (False, f"Allocation with ID '{allocation_id}' not found.", None)
+
+        success, message, values = await self._validate_allocation_update(
+            allocation, allocation_percentage, start_date, end_date
+        )
+        if not success:
+            return (False, message, None)
+
+        # Update the allocation
+        self._backend.update_allocation(allocation, *values)
+        if self._columnar is not None:
+            self._columnar.update(allocation)
+
+        return (True, message, allocation)
+
+    async def update_allocations_batch_async(
+        self, updates: List[dict]
+    ) -> Tuple[bool, str, List[dict]]:
+        """
+        Update several allocations, applying all updates or none.
+
+        Every update is validated with the same rules as update_allocation_async. Updates
+        are grouped by engineer: each engineer's allocations are loaded into one capacity
+        timeline and interval index that later updates in the batch see, so the overlap set
+        is computed once per engineer instead of once per update.
+
+        Args:
+            updates: Items with 'allocationId' and optional 'allocationPercentage',
+                     'startDate' and 'endDate' in YYYY-MM-DD format.
+
+        Returns:
+            A tuple containing (success, message, results), with one result per item
+            holding its 'index', 'valid', 'message' and, once applied, 'allocation'.
+        """
+        if not updates:
+            return (False, "No updates provided.", [])
+
+        # Per engineer: working copies of their allocations and the indexes over them
+        working: Dict[str, Tuple[Dict[str, Allocation], CapacityTimeline, IntervalIndex]] = {}
+        stored: Dict[str, Allocation] = {}
+        results: List[dict] = []
+
+        for index, item in enumerate(updates):
+            message = self._batch_item_error(item, ("allocationId",))
+            if message is None:
+                allocation_id = item["allocationId"]
+                allocation_percentage = item.get("allocationPercentage")
+                allocation = stored.get(allocation_id) or self._backend.get_allocation(
+                    allocation_id
+                )
+                if allocation is None:
+                    message = f"Allocation with ID '{allocation_id}' not found."
+            if message is not None:
+                results.append(
+                    {"index": index, "valid": False, "message": message, "allocation": None}
+                )
+                continue
+
+            engineer_view = working.get(allocation.engineer_id)
+            if engineer_view is None:
+                copies = {
+                    a.id: Allocation(
+                        id=a.id,
+                        engineer_id=a.engineer_id,
+                        project_id=a.project_id,
+                        allocation_percentage=a.allocation_percentage,
+                        start_date=a.start_date,
+                        end_date=a.end_date,
+                    )
+                    for a in self._backend.get_allocations_by_engineer_id(
+                        allocation.engineer_id
+                    )
+                }
+                capacity = CapacityTimeline()
+                intervals = IntervalIndex()
+                for working_copy in copies.values():
+                    capacity.add(working_copy)
+                    intervals.add(working_copy)
+                engineer_view = (copies, capacity, intervals)
+                working[allocation.engineer_id] = engineer_view
+
+            copies, capacity, intervals = engineer_view
+            current = copies[allocation.id]
+            success, message, values = await self._validate_allocation_update(
+                current,
+                allocation_percentage,
+                item.get("startDate"),
+                item.get("endDate"),
+                capacity=capacity,
+                intervals=intervals,
+            )
+            if success:
+                # Apply to the working copy so later updates see the new values
+                capacity.remove(current)
+                intervals.remove(current)
+                (
+                    current.allocation_percentage,
+                    current.start_date,
+                    current.end_date,
+                ) = values
+                capacity.add(current)
+                intervals.add(current)
+                stored[allocation.id] = allocation
+            results.append(
+                {"index": index, "valid": success, "message": message, "allocation": None}
+            )
+
+        invalid_count = sum(1 for result in results if not result["valid"])
+        if invalid_count:
+            for result in results:
+                if result["valid"]:
+                    result["message"] = (
+                        "Valid, but not applied because other updates in the batch are invalid."
+                    )
+            return (
+                False,
+                f"{invalid_count} of {len(updates)} updates are invalid. "
+                f"No allocations were updated.",
+                results,
+            )
+
+        changes = []
+        for allocation in stored.values():
+            current = working[allocation.engineer_id][0][allocation.id]
+            changes.append(
+                (
+                    allocation,
+                    current.allocation_percentage,
+                    current.start_date,
+                    current.end_date,
+                )
+            )
+        self._backend.update_allocations(changes)
+        if self._columnar is not None:
+            for allocation in stored.values():
+                self._columnar.update(allocation)
+
+        for result, item in zip(results, updates):
+            result["allocation"] = stored[item["allocationId"]].to_dict()
+
+        return (
+            True,
+            f"Successfully updated {len(stored)} allocations for {len(working)} engineers.",
+            results,
+        )
+
+    async def get_monthly_project_allocation_async(
+        self, start_month: str, end_month: str
+    ) -> Tuple[bool, str, Optional[Dict[str, Dict[str, float]]]]:
+        """
+        Compute the average allocation percentage per project for each month in a range.
+
+        An allocation contributes its percentage weighted by the fraction of the month
+        it is active, so 50% for a whole month adds 50 and 50% for half of it adds 25.
+
+        Args:
+            start_month: First month to include in YYYY-MM format.
+            end_month: Last month to include in YYYY-MM format.
+
+        Returns:
+            A tuple containing (success, message, totals), where totals maps
+            project IDs to a mapping of 'YYYY-MM' to the allocation percentage.
+        """
+        try:
+            parsed_start_month = datetime.strptime(start_month, "%Y-%m").date()
+        except ValueError:
+            return (False, f"Invalid start month format: '{start_month}'.", None)
+        try:
+            parsed_end_month = datetime.strptime(end_month, "%Y-%m").date()
+        except ValueError:
+            return (False, f"Invalid end month format: '{end_month}'.", None)
+
+        if parsed_end_month < parsed_start_month:
+            return (False, "End month must not be before start month.", None)
+
+        totals = self._get_analytics_store().get_monthly_project_allocation(
+            parsed_start_month, parsed_end_month
+        )
+        return (
+            True,
+            f"Monthly project allocation from {start_month} to {end_month}.",
+            totals,
+        )
+
+    async def iter_utilization_matrix_async(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = "weekly",
+        engineer_ids: Optional[List[str]] = None,
+        chunk_size: int = 500,
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Stream an engineers x time-buckets utilization matrix for a date range.
+
+        Each value is the engineer's average total allocation percentage over the bucket's days.
+        Rows are computed and yielded one chunk of engineers at a time, so the full matrix is
+        never held in memory.
+
+        Args:
+            start_date: First day of the range in YYYY-MM-DD format.
+            end_date: Last day of the range (inclusive) in YYYY-MM-DD format.
+            granularity: Bucket size, one of 'daily', 'weekly' or 'monthly'.
+            engineer_ids: Optional engineer IDs to include. Defaults to all engineers.
+            chunk_size: Number of engineers per yielded chunk.
+
+        Returns:
+            An async iterator of row chunks. Each row is a dict with 'engineerId' and
+            'utilization', a mapping of bucket label to utilization percentage.
+
+        Raises:
+            ValueError: If the dates or granularity are invalid.
+        """
+        try:
+            parsed_start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError(f"Invalid start date format: '{start_date}'.") from None
+        try:
+            parsed_end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError(f"Invalid end date format: '{end_date}'.") from None
+
+        if parsed_end_date < parsed_start_date:
+            raise ValueError("End date must not be before start date.")
+        if granularity not in UTILIZATION_GRANULARITIES:
+            raise ValueError(
+                f"Granularity must be one of: {', '.join(UTILIZATION_GRANULARITIES)}."
+            )
+
+        if engineer_ids is None:
+            engineer_ids = [e.id for e in self._backend.get_engineers()]
+
+        labels = [
+            label
+            for label, _, _ in utilization_buckets(
+                parsed_start_date, parsed_end_date, granularity
+            )
+        ]
+        for chunk in self._get_analytics_store().iter_utilization_rows(
+            engineer_ids, parsed_start_date, parsed_end_date, granularity, chunk_size
+        ):
+            yield [
+                {"engineerId": engineer_id, "utilization": dict(zip(labels, values))}
+                for engineer_id, values in chunk
+            ]
+            # Let other requests run between chunks
+            await asyncio.sleep(0)
+
+    async def load_data_async(self) -> None:
+        """
+        Load engineers, projects, and allocations data from the storage backend.
+
+        With the default JSON backend the data is read from JSON files in the data folder,
+        which will be created if it doesn't exist.
+        """
+        self._backend.load()
+
+        if self._columnar is not None:
+            self._columnar = ColumnarAllocationStore(self._backend.get_allocations())
+
+    async def close_async(self) -> None:
+        """
+        Flush pending changes to storage and close it.
+
+        Call this on shutdown so the last allocation changes are durable.
+        """
+        self._backend.close()
+
+    async def _validate_new_allocation(
+        self,
+        engineer_id: str,
+        project_id: str,
+        allocation_percentage: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        capacity: Optional[CapacityTimeline] = None,
+        pending: Sequence[Allocation] = (),
+    ) -> Tuple[bool, str, Optional[Allocation]]:
+        """
+        Validate a new allocation and build it without storing it.
+
+        Args:
+            engineer_id: The unique identifier of the engineer to allocate.
+            project_id: The unique identifier of the project.
+            allocation_percentage: The percentage of time allocated (1-100).
+            start_date: Optional start date in YYYY-MM-DD format. Defaults to today if not provided.
+            end_date: Optional end date in YYYY-MM-DD format. Leave empty for indefinite allocation.
+            capacity: Optional capacity timeline of the engineer to check against instead of
+                      the stored allocations, e.g. one that includes pending allocations.
+            pending: Optional allocations that are not stored yet but must be checked for duplicates.
+
         Returns:
             A tuple containing (success, message, allocation).
         """
@@ -191,32 +660,32 @@ class AllocationService:
             if parsed_end_date <= parsed_start_date:
                 return (False, "End date must be after start date.", None)
 
-        # Validation 5: Check for overlapping allocations and total percentage
-        existing_allocations = await self.get_allocations_by_engineer_id_async(
-            engineer_id
-        )
-        overlapping_allocations = self._get_overlapping_allocations(
-            existing_allocations, parsed_start_date, parsed_end_date
-        )
-
-        if overlapping_allocations:
-            total_allocation = (
-                sum(a.allocation_percentage for a in overlapping_allocations)
-                + allocation_percentage
+        # Validation 5: Check the peak allocation during the period
+        if capacity is None:
+            current_total = self._get_peak_allocation(
+                engineer_id, parsed_start_date, parsed_end_date
+            )
+        else:
+            current_total = capacity.peak_load(parsed_start_date, parsed_end_date)
+        total_allocation = current_total + allocation_percentage
+        if total_allocation > 100:
+            return (
+                False,
+                f"Engineer '{engineer.name}' is over-allocated. "
+                f"Current allocation during this period: {current_total}%. "
+                f"Adding {allocation_percentage}% would result in {total_allocation}% total allocation.",
+                None,
             )
-            if total_allocation > 100:
-                current_total = sum(
-                    a.allocation_percentage for a in overlapping_allocations
-                )
-                return (
-                    False,
-                    f"Engineer '{engineer.name}' is over-allocated. "
-                    f"Current allocation during this period: {current_total}%. "
-                    f"Adding {allocation_percentage}% would result in {total_allocation}% total allocation.",
-                    None,
-                )
 
         # Validation 6: Check if engineer is already allocated to the same project with overlapping dates
+        overlapping_allocations = self._get_overlapping_allocations(
+            engineer_id, parsed_start_date, parsed_end_date
+        ) + [
+            a
+            for a in pending
+            if a.engineer_id == engineer_id
+            and overlaps(parsed_start_date, parsed_end_date, a.start_date, a.end_date)
+        ]
         duplicate_allocation = next(
             (a for a in overlapping_allocations if a.project_id == project_id), None
         )
@@ -243,8 +712,6 @@ class AllocationService:
             end_date=parsed_end_date,
         )
 
-        self._allocations.append(new_allocation)
-
         if parsed_end_date is None:
             message = (
                 f"Successfully allocated {allocation_percentage}% of {engineer.name} to {project.name} "
@@ -258,33 +725,32 @@ class AllocationService:
 
         return (True, message, new_allocation)
 
-    async def update_allocation_async(
+    async def _validate_allocation_update(
         self,
-        allocation_id: str,
+        allocation: Allocation,
         allocation_percentage: Optional[int] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-    ) -> Tuple[bool, str, Optional[Allocation]]:
+        capacity: Optional[CapacityTimeline] = None,
+        intervals: Optional[IntervalIndex] = None,
+    ) -> Tuple[bool, str, Optional[Tuple[int, datetime, Optional[datetime]]]]:
         """
-        Update an existing allocation with new percentage and/or date range.
-
-        All update parameters are optional - only provided values will be updated.
-        Validates that the allocation exists, dates are valid, and the engineer won't be over-allocated.
+        Validate an update to an existing allocation without applying it.
 
         Args:
-            allocation_id: The unique identifier of the allocation to update.
+            allocation: The allocation to update.
             allocation_percentage: Optional new allocation percentage (1-100).
             start_date: Optional new start date in YYYY-MM-DD format.
             end_date: Optional new end date in YYYY-MM-DD format.
+            capacity: Optional capacity timeline of the engineer that includes the allocation,
+                      to check against instead of the stored allocations.
+            intervals: Optional interval index of the engineer's allocations to check for
+                       duplicates instead of the stored allocations.
 
         Returns:
-            A tuple containing (success, message, allocation).
+            A tuple containing (success, message, values), where values are the new
+            (allocation_percentage, start_date, end_date).
         """
-        # Validation 1: Find the allocation
-        allocation = await self.get_allocation_by_id_async(allocation_id)
-        if allocation is None:
-            return (False, f"Allocation with ID '{allocation_id}' not found.", None)
-
         # Get engineer and project details for validation and messaging
         engineer = await self.get_engineer_by_id_async(allocation.engineer_id)
         project = await self.get_project_by_id_async(allocation.project_id)
@@ -319,36 +785,42 @@ class AllocationService:
                 return (False, "Allocation percentage must be between 1 and 100.", None)
             new_allocation_percentage = allocation_percentage
 
-        # Check for overlapping allocations (excluding the current allocation being updated)
-        existing_allocations = await self.get_allocations_by_engineer_id_async(
-            allocation.engineer_id
-        )
-        existing_allocations = [
-            a for a in existing_allocations if a.id != allocation_id
-        ]
-
-        overlapping_allocations = self._get_overlapping_allocations(
-            existing_allocations, parsed_start_date, parsed_end_date
-        )
-
-        if overlapping_allocations:
-            total_allocation = (
-                sum(a.allocation_percentage for a in overlapping_allocations)
-                + new_allocation_percentage
+        # Check the peak allocation during the period (excluding the current allocation being updated)
+        if capacity is None:
+            current_total = self._get_peak_allocation(
+                allocation.engineer_id,
+                parsed_start_date,
+                parsed_end_date,
+                exclude=allocation,
+            )
+        else:
+            current_total = capacity.peak_load(
+                parsed_start_date, parsed_end_date, exclude=allocation
+            )
+        total_allocation = current_total + new_allocation_percentage
+        if total_allocation > 100:
+            return (
+                False,
+                f"Engineer '{engineer.name}' would be over-allocated. "
+                f"Current allocation during this period: {current_total}%. "
+                f"Adding {new_allocation_percentage}% would result in {total_allocation}% total allocation.",
+                None,
             )
-            if total_allocation > 100:
-                current_total = sum(
-                    a.allocation_percentage for a in overlapping_allocations
-                )
-                return (
-                    False,
-                    f"Engineer '{engineer.name}' would be over-allocated. "
-                    f"Current allocation during this period: {current_total}%. "
-                    f"Adding {new_allocation_percentage}% would result in {total_allocation}% total allocation.",
-                    None,
-                )
 
         # Check for duplicate allocation to the same project (excluding current allocation)
+        if intervals is None:
+            overlapping_allocations = self._get_overlapping_allocations(
+                allocation.engineer_id,
+                parsed_start_date,
+                parsed_end_date,
+                exclude_id=allocation.id,
+            )
+        else:
+            overlapping_allocations = [
+                a
+                for a in intervals.overlapping(parsed_start_date, parsed_end_date)
+                if a.id != allocation.id
+            ]
         duplicate_allocation = next(
             (
                 a
@@ -370,11 +842,6 @@ class AllocationService:
                 None,
             )
 
-        # Update the allocation
-        allocation.allocation_percentage = new_allocation_percentage
-        allocation.start_date = parsed_start_date
-        allocation.end_date = parsed_end_date
-
         if parsed_end_date is None:
             message = (
                 f"Successfully updated allocation. {engineer.name} is now {new_allocation_percentage}% allocated to {project.name} "
@@ -386,113 +853,113 @@ class AllocationService:
                 f"from {parsed_start_date.strftime('%Y-%m-%d')} to {parsed_end_date.strftime('%Y-%m-%d')}."
             )
 
-        return (True, message, allocation)
+        return (
+            True,
+            message,
+            (new_allocation_percentage, parsed_start_date, parsed_end_date),
+        )
 
-    async def load_data_async(self) -> None:
+    @staticmethod
+    def _batch_item_error(item: dict, id_fields: Tuple[str, ...]) -> Optional[str]:
         """
-        Load engineers, projects, and allocations data from JSON files in the data folder.
+        Check the shape and field types of a batch item before it is validated.
+
+        Args:
+            item: The batch item as received from the client.
+            id_fields: Names of the required string ID fields.
 
-        If the data folder doesn't exist, it will be created.
-        Uses case-insensitive property matching for deserialization.
+        Returns:
+            A message describing the first problem, or None if the item is well-formed.
         """
-        if not os.path.exists(self.data_folder):
-            os.makedirs(self.data_folder)
-            return
+        if not isinstance(item, dict):
+            return "Each item must be an object."
+        for field in id_fields:
+            if not isinstance(item.get(field), str):
+                return f"'{field}' must be a string."
+
+        # bool is a subclass of int but is never a valid percentage
+        allocation_percentage = item.get("allocationPercentage")
+        if allocation_percentage is not None and (
+            isinstance(allocation_percentage, bool)
+            or not isinstance(allocation_percentage, int)
+        ):
+            return "Allocation percentage must be between 1 and 100."
+
+        for field in ("startDate", "endDate"):
+            value = item.get(field)
+            if value is not None and not isinstance(value, str):
+                return f"'{field}' must be a date in YYYY-MM-DD format."
+        return None
 
-        # Load Engineers
-        engineers_path = os.path.join(self.data_folder, "engineers.json")
-        if os.path.exists(engineers_path):
-            try:
-                with open(engineers_path, "r") as f:
-                    engineers_data = json.load(f)
-                    for eng_dict in engineers_data:
-                        engineer = Engineer(**eng_dict)
-                        self._engineers.append(engineer)
-            except Exception as e:
-                print(f"Error loading engineers: {e}")
-
-        # Load Projects
-        projects_path = os.path.join(self.data_folder, "projects.json")
-        if os.path.exists(projects_path):
-            try:
-                with open(projects_path, "r") as f:
-                    projects_data = json.load(f)
-                    for proj_dict in projects_data:
-                        project = Project(**proj_dict)
-                        self._projects.append(project)
-            except Exception as e:
-                print(f"Error loading projects: {e}")
-
-        # Load Allocations
-        allocations_path = os.path.join(self.data_folder, "allocations.json")
-        if os.path.exists(allocations_path):
-            try:
-                with open(allocations_path, "r") as f:
-                    allocations_data = json.load(f)
-                    for alloc_dict in allocations_data:
-                        # Convert date strings to datetime objects
-                        start_date = datetime.strptime(
-                            alloc_dict.get("startDate"), "%Y-%m-%dT%H:%M:%S"
-                        )
-                        end_date_str = alloc_dict.get("endDate")
-                        end_date = (
-                            datetime.strptime(end_date_str, "%Y-%m-%dT%H:%M:%S")
-                            if end_date_str
-                            else None
-                        )
-
-                        allocation = Allocation(
-                            id=alloc_dict.get("id"),
-                            engineer_id=alloc_dict.get("engineerId"),
-                            project_id=alloc_dict.get("projectId"),
-                            allocation_percentage=alloc_dict.get(
-                                "allocationPercentage"
-                            ),
-                            start_date=start_date,
-                            end_date=end_date,
-                        )
-                        self._allocations.append(allocation)
-            except Exception as e:
-                print(f"Error loading allocations: {e}")
+    def _get_columnar_store(self) -> ColumnarAllocationStore:
+        """
+        Return the columnar store, failing if it was not enabled.
+
+        Returns:
+            The columnar allocation store.
+        """
+        if self._columnar is None:
+            raise RuntimeError(
+                "The columnar store is not enabled; create the service with columnar=True."
+            )
+        return self._columnar
+
+    def _get_analytics_store(self) -> ColumnarAllocationStore:
+        """
+        Return the columnar store, building it on first use if it is not maintained yet.
+
+        The store built here is kept and updated by later allocation changes,
+        so it is only built from the allocations once.
+
+        Returns:
+            A columnar store holding the current allocations.
+        """
+        if self._columnar is None:
+            self._columnar = ColumnarAllocationStore(self._backend.get_allocations())
+        return self._columnar
+
+    def _get_peak_allocation(
+        self,
+        engineer_id: str,
+        new_start: datetime,
+        new_end: Optional[datetime],
+        exclude: Optional[Allocation] = None,
+    ) -> int:
+        """
+        Helper method to find an engineer's highest total allocation at any point in the given date range.
+
+        Args:
+            engineer_id: The unique identifier of the engineer.
+            new_start: Start date of the range.
+            new_end: End date of the range (None for indefinite).
+            exclude: Optional allocation to leave out, e.g. the allocation being updated.
+
+        Returns:
+            The peak allocation percentage during the range.
+        """
+        return self._backend.get_peak_allocation(
+            engineer_id, new_start, new_end, exclude=exclude
+        )
 
     def _get_overlapping_allocations(
         self,
-        allocations: List[Allocation],
+        engineer_id: str,
         new_start: datetime,
         new_end: Optional[datetime],
+        exclude_id: Optional[str] = None,
     ) -> List[Allocation]:
         """
-        Helper method to find allocations that overlap with the given date range.
+        Helper method to find an engineer's allocations that overlap with the given date range.
 
         Args:
-            allocations: List of allocations to check.
+            engineer_id: The unique identifier of the engineer.
             new_start: Start date of the new allocation.
             new_end: End date of the new allocation (None for indefinite).
+            exclude_id: Optional allocation ID to leave out, e.g. the allocation being updated.
 
         Returns:
             List of overlapping allocations.
         """
-        overlapping = []
-
-        for alloc in allocations:
-            existing_start = alloc.start_date
-            existing_end = alloc.end_date
-
-            # Check if date ranges overlap
-            # Case 1: Both have end dates
-            if new_end is not None and existing_end is not None:
-                if new_start < existing_end and new_end > existing_start:
-                    overlapping.append(alloc)
-            # Case 2: New allocation is indefinite
-            elif new_end is None and existing_end is not None:
-                if new_start < existing_end:
-                    overlapping.append(alloc)
-            # Case 3: Existing allocation is indefinite
-            elif new_end is not None and existing_end is None:
-                if new_end > existing_start:
-                    overlapping.append(alloc)
-            # Case 4: Both are indefinite
-            else:
-                overlapping.append(alloc)
-
-        return overlapping
+        return self._backend.get_overlapping_allocations(
+            engineer_id, new_start, new_end, exclude_id=exclude_id
+        )
@@ -0,0 +1,186 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional, Tuple
+from models.allocation import Allocation
+from service.interval_index import BLOCK_SIZE, effective_end
+
+
+class CapacityTimeline:
+    """
+    Allocation load over time for a single engineer.
+
+    Each allocation adds its percentage from its start date (inclusive) to its
+    end date (exclusive), matching the overlap rules used for conflict checks.
+    The timeline is stored as sorted breakpoints holding the change in load at
+    that time, split into blocks of up to 2 * BLOCK_SIZE breakpoints. Each
+    block caches its total change and its peak running load, so a change only
+    touches one block and there is no rebuild after changes.
+
+    A peak query is linear in the number of blocks, not logarithmic: the
+    running load at the start of the range is the sum of every earlier
+    block's total, and blocks inside the range are combined one by one. That
+    is O(n / BLOCK_SIZE) cached totals plus the breakpoints of at most the
+    two blocks holding the range's ends.
+    """
+
+    def __init__(self):
+        # Breakpoint times and load changes, split into sorted blocks
+        self._time_blocks: List[List[datetime]] = []
+        self._delta_blocks: List[List[int]] = []
+        # First time of each block, for locating the block holding a time
+        self._firsts: List[datetime] = []
+        # Per block: total load change and peak running load within the block,
+        # None when the block changed since they were computed
+        self._sums: List[Optional[int]] = []
+        self._peaks: List[Optional[int]] = []
+
+    def add(self, allocation: Allocation) -> None:
+        """
+        Add an allocation's load to the timeline.
+
+        Args:
+            allocation: The allocation to add, using its current dates and percentage.
+        """
+        self._apply(allocation, allocation.allocation_percentage)
+
+    def remove(self, allocation: Allocation) -> None:
+        """
+        Remove an allocation's load from the timeline.
+
+        Must be called before the allocation's dates or percentage are changed.
+
+        Args:
+            allocation: The allocation to remove.
+        """
+        self._apply(allocation, -allocation.allocation_percentage)
+
+    def peak_load(
+        self,
+        start: datetime,
+        end: Optional[datetime],
+        exclude: Optional[Allocation] = None,
+    ) -> int:
+        """
+        Find the maximum allocation load at any point within a date range.
+
+        Args:
+            start: Start date of the range (inclusive).
+            end: End date of the range (exclusive, None for indefinite).
+            exclude: Optional allocation on this timeline whose load should be
+                     ignored, e.g. the allocation being updated.
+
+        Returns:
+            The peak load in percent, 0 if nothing is allocated in the range.
+        """
+        range_end = effective_end(end)
+        if exclude is None:
+            return self._peak(start, range_end)
+
+        # The excluded load is constant over its own range, so subtract it
+        # there and take the plain peak on either side of it.
+        own_start = exclude.start_date
+        own_end = effective_end(exclude.end_date)
+        peak = 0
+        if start < min(range_end, own_start):
+            peak = max(peak, self._peak(start, min(range_end, own_start)))
+        if max(start, own_start) < min(range_end, own_end):
+            peak = max(
+                peak,
+                self._peak(max(start, own_start), min(range_end, own_end))
+                - exclude.allocation_percentage,
+            )
+        if max(start, own_end) < range_end:
+            peak = max(peak, self._peak(max(start, own_end), range_end))
+        return peak
+
+    def _apply(self, allocation: Allocation, percentage: int) -> None:
+        """Add a percentage change over the allocation's date range."""
+        self._shift(allocation.start_date, percentage)
+        if allocation.end_date is not None:
+            self._shift(allocation.end_date, -percentage)
+
+    def _shift(self, time: datetime, delta: int) -> None:
+        """Adjust the load change recorded at a breakpoint."""
+        if not self._time_blocks:
+            self._time_blocks.append([time])
+            self._delta_blocks.append([delta])
+            self._firsts.append(time)
+            self._sums.append(None)
+            self._peaks.append(None)
+            return
+
+        block = max(bisect_right(self._firsts, time) - 1, 0)
+        times = self._time_blocks[block]
+        deltas = self._delta_blocks[block]
+        position = bisect_left(times, time)
+        if position < len(times) and times[position] == time:
+            deltas[position] += delta
+            if deltas[position] == 0:
+                del times[position]
+                del deltas[position]
+        else:
+            times.insert(position, time)
+            deltas.insert(position, delta)
+
+        self._sums[block] = None
+        self._peaks[block] = None
+        if not times:
+            del self._time_blocks[block]
+            del self._delta_blocks[block]
+            del self._firsts[block]
+            del self._sums[block]
+            del self._peaks[block]
+            return
+
+        self._firsts[block] = times[0]
+        if len(times) > 2 * BLOCK_SIZE:
+            self._time_blocks.insert(block + 1, times[BLOCK_SIZE:])
+            self._delta_blocks.insert(block + 1, deltas[BLOCK_SIZE:])
+            self._firsts.insert(block + 1, times[BLOCK_SIZE])
+            self._sums.insert(block + 1, None)
+            self._peaks.insert(block + 1, None)
+            del times[BLOCK_SIZE:]
+            del deltas[BLOCK_SIZE:]
+
+    def _block_totals(self, block: int) -> Tuple[int, int]:
+        """Return a block's total load change and peak running load, computing them if needed."""
+        total = self._sums[block]
+        if total is None:
+            total = 0
+            peak = 0
+            for delta in self._delta_blocks[block]:
+                total += delta
+                if total > peak:
+                    peak = total
+            self._sums[block] = total
+            self._peaks[block] = peak
+        return total, self._peaks[block]
+
+    def _peak(self, start: datetime, end: datetime) -> int:
+        """Peak load over [start, end), assuming start < end."""
+        # Blocks before the one holding start only contribute their total
+        first = max(bisect_right(self._firsts, start) - 1, 0)
+        load = 0
+        for block in range(first):
+            load += self._block_totals(block)[0]
+
+        # The load at start is the running load after every breakpoint <= start
+        peak = 0
+        for block in range(first, len(self._time_blocks)):
+            times = self._time_blocks[block]
+            if times[0] >= end:
+                break
+            if times[0] > start and times[-1] < end:
+                total, block_peak = self._block_totals(block)
+                peak = max(peak, load + block_peak)
+                load += total
+                continue
+            for time, delta in zip(times, self._delta_blocks[block]):
+                if time >= end:
+                    break
+                load += delta
+                if time > start:
+                    peak = max(peak, load)
+                else:
+                    peak = load
+        return max(peak, 0)
@@ -0,0 +1,434 @@
+from array import array
+from calendar import monthrange
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from models.allocation import Allocation
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, aggregates fall back to pure Python
+    np = None
+
+
+# Open-ended allocations are stored as ending after every representable day.
+OPEN_END_DAY = date.max.toordinal() + 1
+
+UTILIZATION_GRANULARITIES = ("daily", "weekly", "monthly")
+
+
+def utilization_buckets(
+    window_start: date, window_end: date, granularity: str
+) -> List[Tuple[str, int, int]]:
+    """
+    Split an inclusive date window into time buckets.
+
+    Weekly buckets follow ISO weeks (Monday to Sunday) and monthly buckets
+    follow calendar months, both clipped to the window.
+
+    Args:
+        window_start: First day of the window.
+        window_end: Last day of the window.
+        granularity: One of 'daily', 'weekly' or 'monthly'.
+
+    Returns:
+        A list of (label, start offset, end offset) tuples, with day offsets
+        relative to window_start and exclusive end offsets. Labels are the
+        bucket's first day (YYYY-MM-DD), or YYYY-MM for monthly buckets.
+    """
+    if granularity not in UTILIZATION_GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: '{granularity}'.")
+
+    first = window_start.toordinal()
+    days = window_end.toordinal() - first + 1
+    buckets = []
+    offset = 0
+    while offset < days:
+        day = window_start + timedelta(days=offset)
+        if granularity == "daily":
+            length = 1
+            label = day.strftime("%Y-%m-%d")
+        elif granularity == "weekly":
+            length = 7 - day.weekday()
+            label = day.strftime("%Y-%m-%d")
+        else:
+            length = monthrange(day.year, day.month)[1] - day.day + 1
+            label = day.strftime("%Y-%m")
+        end = min(offset + length, days)
+        buckets.append((label, offset, end))
+        offset = end
+    return buckets
+
+
+class AllocationView:
+    """
+    Read-only view of one allocation row in a ColumnarAllocationStore.
+
+    Exposes the same attributes and helpers as Allocation without holding
+    a copy of the row. Dates are day-precision.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnarAllocationStore", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._store._allocation_ids[self._row]
+
+    @property
+    def engineer_id(self) -> str:
+        return self._store._engineer_ids[self._store._engineer_codes[self._row]]
+
+    @property
+    def project_id(self) -> str:
+        return self._store._project_ids[self._store._project_codes[self._row]]
+
+    @property
+    def allocation_percentage(self) -> int:
+        return self._store._percentages[self._row]
+
+    @property
+    def start_date(self) -> datetime:
+        return datetime.fromordinal(self._store._start_days[self._row])
+
+    @property
+    def end_date(self) -> Optional[datetime]:
+        end_day = self._store._end_days[self._row]
+        return None if end_day == OPEN_END_DAY else datetime.fromordinal(end_day)
+
+    def is_active(self, on_date: datetime) -> bool:
+        """Check if the allocation is active on the given date."""
+        day = on_date.toordinal()
+        end_day = self._store._end_days[self._row]
+        if end_day == OPEN_END_DAY:
+            return self._store._start_days[self._row] <= day
+        return self._store._start_days[self._row] <= day <= end_day
+
+    def to_dict(self) -> dict:
+        """Convert allocation to dictionary."""
+        end_date = self.end_date
+        return {
+            "id": self.id,
+            "engineerId": self.engineer_id,
+            "projectId": self.project_id,
+            "allocationPercentage": self.allocation_percentage,
+            "startDate": self.start_date.strftime("%Y-%m-%d"),
+            "endDate": end_date.strftime("%Y-%m-%d") if end_date else None,
+        }
+
+
+class AllocationRows(Sequence):
+    """Lazy sequence of AllocationView objects over a set of store rows."""
+
+    def __init__(self, store: "ColumnarAllocationStore", rows: Optional[array] = None):
+        self._store = store
+        self._rows = rows
+
+    def __len__(self) -> int:
+        if self._rows is None:
+            return len(self._store._allocation_ids)
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            rows = array("i", range(len(self))[index])
+            if self._rows is not None:
+                rows = array("i", (self._rows[i] for i in rows))
+            return AllocationRows(self._store, rows)
+
+        row = index if self._rows is None else self._rows[index]
+        if self._rows is None and row < 0:
+            row += len(self)
+        if not 0 <= row < len(self._store._allocation_ids):
+            raise IndexError("allocation row out of range")
+        return AllocationView(self._store, row)
+
+
+class ColumnarAllocationStore:
+    """
+    Column-oriented copy of the allocation data for analytics.
+
+    Engineer and project ids are interned to integer codes, percentages are
+    kept in an array('b') and dates as day ordinals in array('i'), with open
+    end dates stored as OPEN_END_DAY. End days are exclusive, matching the
+    overlap rules used for conflict checks. Bulk aggregates run vectorized
+    over these columns when NumPy is available.
+    """
+
+    def __init__(self, allocations: Iterable[Allocation] = ()):
+        """
+        Initialize the store.
+
+        Args:
+            allocations: Optional allocations to load into the store.
+        """
+        self._allocation_ids: List[str] = []
+        self._rows_by_id: Dict[str, int] = {}
+
+        self._engineer_ids: List[str] = []
+        self._engineer_code_by_id: Dict[str, int] = {}
+        self._project_ids: List[str] = []
+        self._project_code_by_id: Dict[str, int] = {}
+
+        self._engineer_codes = array("i")
+        self._project_codes = array("i")
+        self._percentages = array("b")
+        self._start_days = array("i")
+        self._end_days = array("i")
+
+        self._rows_by_engineer: Dict[int, array] = {}
+        self._rows_by_project: Dict[int, array] = {}
+
+        for allocation in allocations:
+            self.add(allocation)
+
+    def __len__(self) -> int:
+        return len(self._allocation_ids)
+
+    def add(self, allocation: Allocation) -> None:
+        """
+        Append an allocation to the store.
+
+        Args:
+            allocation: The allocation to add.
+        """
+        row = len(self._allocation_ids)
+        engineer_code = self._intern(
+            allocation.engineer_id, self._engineer_code_by_id, self._engineer_ids
+        )
+        project_code = self._intern(
+            allocation.project_id, self._project_code_by_id, self._project_ids
+        )
+
+        self._allocation_ids.append(allocation.id)
+        self._rows_by_id[allocation.id] = row
+        self._engineer_codes.append(engineer_code)
+        self._project_codes.append(project_code)
+        self._percentages.append(allocation.allocation_percentage)
+        self._start_days.append(allocation.start_date.toordinal())
+        self._end_days.append(self._end_day(allocation.end_date))
+        self._rows_by_engineer.setdefault(engineer_code, array("i")).append(row)
+        self._rows_by_project.setdefault(project_code, array("i")).append(row)
+
+    def update(self, allocation: Allocation) -> None:
+        """
+        Copy an allocation's current percentage and dates into its row.
+
+        Args:
+            allocation: A previously added allocation.
+        """
+        row = self._rows_by_id[allocation.id]
+        self._percentages[row] = allocation.allocation_percentage
+        self._start_days[row] = allocation.start_date.toordinal()
+        self._end_days[row] = self._end_day(allocation.end_date)
+
+    def get_rows(self) -> AllocationRows:
+        """Return views over all allocations."""
+        return AllocationRows(self)
+
+    def get_rows_by_engineer_id(self, engineer_id: str) -> AllocationRows:
+        """Return views over an engineer's allocations."""
+        code = self._engineer_code_by_id.get(engineer_id)
+        return AllocationRows(self, self._rows_by_engineer.get(code, array("i")))
+
+    def get_rows_by_project_id(self, project_id: str) -> AllocationRows:
+        """Return views over a project's allocations."""
+        code = self._project_code_by_id.get(project_id)
+        return AllocationRows(self, self._rows_by_project.get(code, array("i")))
+
+    def get_monthly_project_allocation(
+        self, start_month: date, end_month: date
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compute the average allocation percentage per project for each month.
+
+        An allocation contributes its percentage weighted by the fraction of
+        the month it is active, so a 50% allocation covering a whole month
+        adds 50 and one covering half of it adds 25.
+
+        Args:
+            start_month: Any date in the first month to include.
+            end_month: Any date in the last month to include.
+
+        Returns:
+            A mapping of project id to a mapping of 'YYYY-MM' to the total,
+            leaving out months where the project has no allocation.
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        for label, month_start, month_end in self._months(start_month, end_month):
+            days = month_end - month_start
+            for code, total in self._project_totals(month_start, month_end):
+                if total:
+                    result.setdefault(self._project_ids[code], {})[label] = round(
+                        total / days, 2
+                    )
+        return result
+
+    def iter_utilization_rows(
+        self,
+        engineer_ids: List[str],
+        window_start: date,
+        window_end: date,
+        granularity: str,
+        chunk_size: int = 500,
+    ) -> Iterator[List[Tuple[str, List[float]]]]:
+        """
+        Compute per-engineer utilization for each time bucket, in chunks of engineers.
+
+        Each allocation is added to a per-day difference array between its
+        start and exclusive end day, and a cumulative sum turns that into the
+        daily load. A bucket's value is the average daily load over its days.
+        Only one chunk of engineers is materialized at a time, so the work is
+        O(allocations + cells) and memory is bounded by the chunk size. With
+        NumPy the columns are copied before the first chunk, so allocations
+        may be added while the iterator is suspended; later chunks do not
+        reflect them.
+
+        Args:
+            engineer_ids: Engineers to include, in output order.
+            window_start: First day of the window.
+            window_end: Last day of the window (inclusive).
+            granularity: One of 'daily', 'weekly' or 'monthly'.
+            chunk_size: Number of engineers per yielded chunk.
+
+        Returns:
+            An iterator of chunks, each a list of (engineer id, bucket values)
+            in the order of utilization_buckets().
+        """
+        buckets = utilization_buckets(window_start, window_end, granularity)
+        first = window_start.toordinal()
+        days = window_end.toordinal() - first + 1
+
+        if np is None:
+            yield from self._iter_utilization_rows_python(
+                engineer_ids, first, days, buckets, chunk_size
+            )
+            return
+
+        # Map each allocation to its engineer's output position, -1 if not requested
+        position_by_code = np.full(len(self._engineer_ids), -1, dtype=np.int64)
+        for position, engineer_id in enumerate(engineer_ids):
+            code = self._engineer_code_by_id.get(engineer_id)
+            if code is not None:
+                position_by_code[code] = position
+
+        # Copy the columns rather than viewing them: a view would keep the
+        # arrays locked against appends while this generator is suspended
+        positions = position_by_code[np.array(self._engineer_codes, dtype=np.intc)]
+        starts = np.clip(np.array(self._start_days, dtype=np.intc) - first, 0, days)
+        ends = np.clip(np.array(self._end_days, dtype=np.intc) - first, 0, days)
+        percentages = np.array(self._percentages, dtype=np.int32)
+
+        keep = (positions >= 0) & (starts < ends)
+        order = np.argsort(positions[keep], kind="stable")
+        positions = positions[keep][order]
+        starts = starts[keep][order]
+        ends = ends[keep][order]
+        percentages = percentages[keep][order]
+
+        bucket_starts = np.array([start for _, start, _ in buckets], dtype=np.intp)
+        bucket_lengths = np.array([end - start for _, start, end in buckets])
+
+        for chunk_start in range(0, len(engineer_ids), chunk_size):
+            chunk_ids = engineer_ids[chunk_start : chunk_start + chunk_size]
+            lo, hi = np.searchsorted(
+                positions, [chunk_start, chunk_start + len(chunk_ids)]
+            )
+            rows = positions[lo:hi] - chunk_start
+
+            diff = np.zeros((len(chunk_ids), days + 1), dtype=np.int32)
+            np.add.at(diff, (rows, starts[lo:hi]), percentages[lo:hi])
+            np.add.at(diff, (rows, ends[lo:hi]), -percentages[lo:hi])
+            load = np.cumsum(diff[:, :days], axis=1)
+
+            values = np.round(
+                np.add.reduceat(load, bucket_starts, axis=1) / bucket_lengths, 2
+            )
+            yield list(zip(chunk_ids, values.tolist()))
+
+    def _iter_utilization_rows_python(
+        self,
+        engineer_ids: List[str],
+        first: int,
+        days: int,
+        buckets: List[Tuple[str, int, int]],
+        chunk_size: int,
+    ) -> Iterator[List[Tuple[str, List[float]]]]:
+        """Pure Python fallback for iter_utilization_rows."""
+        for chunk_start in range(0, len(engineer_ids), chunk_size):
+            chunk = []
+            for engineer_id in engineer_ids[chunk_start : chunk_start + chunk_size]:
+                diff = [0] * (days + 1)
+                code = self._engineer_code_by_id.get(engineer_id)
+                for row in self._rows_by_engineer.get(code, ()):
+                    start = min(max(self._start_days[row] - first, 0), days)
+                    end = min(max(self._end_days[row] - first, 0), days)
+                    if start < end:
+                        diff[start] += self._percentages[row]
+                        diff[end] -= self._percentages[row]
+
+                values = []
+                load = 0
+                for _, bucket_start, bucket_end in buckets:
+                    total = 0
+                    for day in range(bucket_start, bucket_end):
+                        load += diff[day]
+                        total += load
+                    values.append(round(total / (bucket_end - bucket_start), 2))
+                chunk.append((engineer_id, values))
+            yield chunk
+
+    def _project_totals(
+        self, window_start: int, window_end: int
+    ) -> Iterable[Tuple[int, float]]:
+        """Sum percentage-days per project code within [window_start, window_end)."""
+        if np is not None:
+            starts = np.frombuffer(self._start_days, dtype=np.intc)
+            ends = np.frombuffer(self._end_days, dtype=np.intc)
+            percentages = np.frombuffer(self._percentages, dtype=np.int8)
+            projects = np.frombuffer(self._project_codes, dtype=np.intc)
+
+            days = np.minimum(ends, window_end) - np.maximum(starts, window_start)
+            weights = np.clip(days, 0, None).astype(np.int64) * percentages
+            totals = np.bincount(
+                projects, weights=weights, minlength=len(self._project_ids)
+            )
+            return enumerate(totals.tolist())
+
+        totals = [0] * len(self._project_ids)
+        for project, percentage, start, end in zip(
+            self._project_codes, self._percentages, self._start_days, self._end_days
+        ):
+            days = min(end, window_end) - max(start, window_start)
+            if days > 0:
+                totals[project] += days * percentage
+        return enumerate(totals)
+
+    @staticmethod
+    def _months(
+        month_start: date, month_end: date
+    ) -> Iterable[Tuple[str, int, int]]:
+        """Yield (label, first day ordinal, next month's first day ordinal) per month."""
+        year, month = month_start.year, month_start.month
+        while (year, month) <= (month_end.year, month_end.month):
+            first = date(year, month, 1).toordinal()
+            yield f"{year:04d}-{month:02d}", first, first + monthrange(year, month)[1]
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    @staticmethod
+    def _end_day(end_date: Optional[datetime]) -> int:
+        """Return the exclusive end day ordinal, OPEN_END_DAY for indefinite."""
+        return OPEN_END_DAY if end_date is None else end_date.toordinal()
+
+    @staticmethod
+    def _intern(value: str, codes: Dict[str, int], values: List[str]) -> int:
+        """Return the integer code for a value, assigning a new one if needed."""
+        code = codes.get(value)
+        if code is None:
+            code = len(values)
+            codes[value] = code
+            values.append(value)
+        return code
@@ -0,0 +1,160 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional
+from models.allocation import Allocation
+
+
+# Open-ended allocations (end_date=None) are indexed as ending at +infinity.
+OPEN_END = datetime.max
+
+# Target number of entries per block in the blocked sorted lists below
+BLOCK_SIZE = 64
+
+
+def effective_end(end_date: Optional[datetime]) -> datetime:
+    """Return the end date used for comparisons, treating None as +infinity."""
+    return OPEN_END if end_date is None else end_date
+
+
+def overlaps(
+    start: datetime,
+    end: Optional[datetime],
+    other_start: datetime,
+    other_end: Optional[datetime],
+) -> bool:
+    """Check if two date ranges overlap, treating a None end as +infinity."""
+    return start < effective_end(other_end) and other_start < effective_end(end)
+
+
+class IntervalIndex:
+    """
+    Index of allocation date ranges for a single engineer.
+
+    Allocations are kept sorted by start date in blocks of up to
+    2 * BLOCK_SIZE entries, and each block caches the latest end date in it.
+    An insert or removal bisects to one block and only touches that block,
+    so the index never needs a rebuild after changes.
+
+    Queries are not logarithmic. An overlap query checks the cached end date
+    of every block that starts before the range ends, O(n / BLOCK_SIZE)
+    checks, and scans the entries of each block it cannot skip. Block end
+    dates are not sorted, so there is nothing to bisect on.
+    """
+
+    def __init__(self):
+        # Start dates and allocations, split into blocks sorted by start date
+        self._start_blocks: List[List[datetime]] = []
+        self._allocation_blocks: List[List[Allocation]] = []
+        # First start date of each block, for locating the block holding a date
+        self._firsts: List[datetime] = []
+        # Latest end date per block, None when the block changed since it was computed
+        self._max_ends: List[Optional[datetime]] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, allocation: Allocation) -> None:
+        """
+        Insert an allocation into the index.
+
+        Args:
+            allocation: The allocation to index by its current dates.
+        """
+        self._count += 1
+        start = allocation.start_date
+        if not self._start_blocks:
+            self._start_blocks.append([start])
+            self._allocation_blocks.append([allocation])
+            self._firsts.append(start)
+            self._max_ends.append(None)
+            return
+
+        block = max(bisect_right(self._firsts, start) - 1, 0)
+        starts = self._start_blocks[block]
+        allocations = self._allocation_blocks[block]
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        allocations.insert(position, allocation)
+        self._firsts[block] = starts[0]
+        self._max_ends[block] = None
+
+        if len(starts) > 2 * BLOCK_SIZE:
+            self._start_blocks.insert(block + 1, starts[BLOCK_SIZE:])
+            self._allocation_blocks.insert(block + 1, allocations[BLOCK_SIZE:])
+            self._firsts.insert(block + 1, starts[BLOCK_SIZE])
+            self._max_ends.insert(block + 1, None)
+            del starts[BLOCK_SIZE:]
+            del allocations[BLOCK_SIZE:]
+
+    def remove(self, allocation: Allocation) -> None:
+        """
+        Remove an allocation from the index.
+
+        Must be called before the allocation's start date is changed, since
+        the start date is used to locate it.
+
+        Args:
+            allocation: The allocation to remove.
+        """
+        start = allocation.start_date
+        # Equal start dates may spill over into neighbouring blocks
+        first = max(bisect_left(self._firsts, start) - 1, 0)
+        last = bisect_right(self._firsts, start)
+        for block in range(first, last):
+            starts = self._start_blocks[block]
+            allocations = self._allocation_blocks[block]
+            for i in range(bisect_left(starts, start), bisect_right(starts, start)):
+                if allocations[i] is allocation:
+                    del starts[i]
+                    del allocations[i]
+                    self._count -= 1
+                    if starts:
+                        self._firsts[block] = starts[0]
+                        self._max_ends[block] = None
+                    else:
+                        del self._start_blocks[block]
+                        del self._allocation_blocks[block]
+                        del self._firsts[block]
+                        del self._max_ends[block]
+                    return
+
+    def overlapping(
+        self, start: datetime, end: Optional[datetime]
+    ) -> List[Allocation]:
+        """
+        Find indexed allocations whose date range overlaps the given range.
+
+        Costs one check per block starting before the range ends, plus a scan
+        of the blocks whose latest end date reaches into the range.
+
+        Args:
+            start: Start date of the range.
+            end: End date of the range (None for indefinite).
+
+        Returns:
+            Overlapping allocations ordered by start date.
+        """
+        # Only allocations starting before the range ends can overlap it
+        range_end = effective_end(end)
+        overlapping: List[Allocation] = []
+        for block in range(bisect_left(self._firsts, range_end)):
+            if self._block_max_end(block) <= start:
+                continue
+            starts = self._start_blocks[block]
+            allocations = self._allocation_blocks[block]
+            for i in range(bisect_left(starts, range_end)):
+                if effective_end(allocations[i].end_date) > start:
+                    overlapping.append(allocations[i])
+        return overlapping
+
+    def _block_max_end(self, block: int) -> datetime:
+        """Return the latest end date in a block, computing it if needed."""
+        max_end = self._max_ends[block]
+        if max_end is None:
+            max_end = max(
+                effective_end(allocation.end_date)
+                for allocation in self._allocation_blocks[block]
+            )
+            self._max_ends[block] = max_end
+        return max_end
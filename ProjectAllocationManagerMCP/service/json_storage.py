@@ -0,0 +1,329 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from models.allocation import Allocation
+from models.engineer import Engineer
+from models.project import Project
+from service.allocation_log import AllocationLog
+from service.capacity_timeline import CapacityTimeline
+from service.interval_index import IntervalIndex
+from service.storage_backend import StorageBackend
+
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def allocation_from_record(alloc_dict: dict) -> Allocation:
+    """
+    Build an allocation from its stored JSON representation.
+
+    Args:
+        alloc_dict: The allocation record as stored in allocations.json.
+
+    Returns:
+        The deserialized allocation.
+    """
+    # Convert date strings to datetime objects
+    start_date = datetime.strptime(alloc_dict.get("startDate"), DATE_FORMAT)
+    end_date_str = alloc_dict.get("endDate")
+    end_date = datetime.strptime(end_date_str, DATE_FORMAT) if end_date_str else None
+
+    return Allocation(
+        id=alloc_dict.get("id"),
+        engineer_id=alloc_dict.get("engineerId"),
+        project_id=alloc_dict.get("projectId"),
+        allocation_percentage=alloc_dict.get("allocationPercentage"),
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+def allocation_to_record(allocation: Allocation) -> dict:
+    """
+    Convert an allocation to its stored JSON representation.
+
+    Args:
+        allocation: The allocation to serialize.
+
+    Returns:
+        The allocation record in the allocations.json format.
+    """
+    return {
+        "id": allocation.id,
+        "engineerId": allocation.engineer_id,
+        "projectId": allocation.project_id,
+        "allocationPercentage": allocation.allocation_percentage,
+        "startDate": allocation.start_date.strftime(DATE_FORMAT),
+        "endDate": (
+            allocation.end_date.strftime(DATE_FORMAT) if allocation.end_date else None
+        ),
+    }
+
+
+class JsonStorageBackend(StorageBackend):
+    """
+    In-memory storage loaded from the JSON files in the data folder.
+
+    Allocation changes are appended to a write-ahead log that is replayed on
+    load and periodically compacted back into allocations.json.
+    """
+
+    def __init__(self, data_folder: str, compact_threshold: int = 1000):
+        """
+        Initialize the backend.
+
+        Args:
+            data_folder: Path to the folder holding the JSON files.
+            compact_threshold: Number of logged allocation changes after which the
+                        log is compacted into allocations.json.
+        """
+        self.data_folder = data_folder
+        self.compact_threshold = compact_threshold
+
+        # Allocation changes are appended here and replayed on load
+        self._log = AllocationLog(os.path.join(self.data_folder, "allocations.wal"))
+
+        self._engineers: List[Engineer] = []
+        self._projects: List[Project] = []
+        self._allocations: List[Allocation] = []
+
+        # id -> object indexes kept in sync with the lists above
+        self._engineers_by_id: Dict[str, Engineer] = {}
+        self._projects_by_id: Dict[str, Project] = {}
+        self._allocations_by_id: Dict[str, Allocation] = {}
+
+        # Secondary indexes: engineer/project id -> allocations
+        self._allocations_by_engineer_id: Dict[str, List[Allocation]] = {}
+        self._allocations_by_project_id: Dict[str, List[Allocation]] = {}
+
+        # Per-engineer date range indexes used for overlap detection
+        self._intervals_by_engineer_id: Dict[str, IntervalIndex] = {}
+
+        # Per-engineer load timelines used for capacity checks
+        self._timelines_by_engineer_id: Dict[str, CapacityTimeline] = {}
+
+    def load(self) -> None:
+        """
+        Load engineers, projects, and allocations data from JSON files in the data folder.
+
+        If the data folder doesn't exist, it will be created.
+        """
+        if not os.path.exists(self.data_folder):
+            os.makedirs(self.data_folder)
+            return
+
+        # Load Engineers
+        engineers_path = os.path.join(self.data_folder, "engineers.json")
+        if os.path.exists(engineers_path):
+            try:
+                with open(engineers_path, "r") as f:
+                    engineers_data = json.load(f)
+                    for eng_dict in engineers_data:
+                        engineer = Engineer(**eng_dict)
+                        self._engineers.append(engineer)
+                        self._engineers_by_id[engineer.id] = engineer
+            except Exception as e:
+                print(f"Error loading engineers: {e}")
+
+        # Load Projects
+        projects_path = os.path.join(self.data_folder, "projects.json")
+        if os.path.exists(projects_path):
+            try:
+                with open(projects_path, "r") as f:
+                    projects_data = json.load(f)
+                    for proj_dict in projects_data:
+                        project = Project(**proj_dict)
+                        self._projects.append(project)
+                        self._projects_by_id[project.id] = project
+            except Exception as e:
+                print(f"Error loading projects: {e}")
+
+        # Load Allocations
+        allocations_path = os.path.join(self.data_folder, "allocations.json")
+        if os.path.exists(allocations_path):
+            try:
+                with open(allocations_path, "r") as f:
+                    allocations_data = json.load(f)
+                    for alloc_dict in allocations_data:
+                        self._index_allocation(allocation_from_record(alloc_dict))
+            except Exception as e:
+                print(f"Error loading allocations: {e}")
+
+        # Replay allocation changes made since the last snapshot
+        try:
+            for alloc_dict in self._log.replay():
+                allocation = allocation_from_record(alloc_dict)
+                existing = self._allocations_by_id.get(allocation.id)
+                if existing is None:
+                    self._index_allocation(allocation)
+                else:
+                    self._reindex_allocation(
+                        existing,
+                        allocation.allocation_percentage,
+                        allocation.start_date,
+                        allocation.end_date,
+                    )
+        except Exception as e:
+            print(f"Error replaying allocation log: {e}")
+
+        if self._log.record_count >= self.compact_threshold:
+            self._compact_allocations()
+
+    def close(self) -> None:
+        """Fsync and close the allocation log."""
+        self._log.close()
+
+    def get_engineers(self) -> List[Engineer]:
+        return self._engineers
+
+    def get_projects(self) -> List[Project]:
+        return self._projects
+
+    def get_allocations(self) -> List[Allocation]:
+        return self._allocations
+
+    def get_engineer(self, id: str) -> Optional[Engineer]:
+        return self._engineers_by_id.get(id)
+
+    def get_project(self, id: str) -> Optional[Project]:
+        return self._projects_by_id.get(id)
+
+    def get_allocation(self, id: str) -> Optional[Allocation]:
+        return self._allocations_by_id.get(id)
+
+    def get_allocations_by_engineer_id(self, engineer_id: str) -> List[Allocation]:
+        return self._allocations_by_engineer_id.get(engineer_id, [])
+
+    def get_allocations_by_project_id(self, project_id: str) -> List[Allocation]:
+        return self._allocations_by_project_id.get(project_id, [])
+
+    def get_overlapping_allocations(
+        self,
+        engineer_id: str,
+        start: datetime,
+        end: Optional[datetime],
+        exclude_id: Optional[str] = None,
+    ) -> List[Allocation]:
+        intervals = self._intervals_by_engineer_id.get(engineer_id)
+        if intervals is None:
+            return []
+
+        return [a for a in intervals.overlapping(start, end) if a.id != exclude_id]
+
+    def get_peak_allocation(
+        self,
+        engineer_id: str,
+        start: datetime,
+        end: Optional[datetime],
+        exclude: Optional[Allocation] = None,
+    ) -> int:
+        timeline = self._timelines_by_engineer_id.get(engineer_id)
+        if timeline is None:
+            return 0
+
+        return timeline.peak_load(start, end, exclude=exclude)
+
+    def add_allocation(self, allocation: Allocation) -> None:
+        self._index_allocation(allocation)
+        self._log_allocation(allocation)
+
+    def add_allocations(self, allocations: List[Allocation]) -> None:
+        for allocation in allocations:
+            self._index_allocation(allocation)
+        self._log_allocations(allocations)
+
+    def update_allocation(
+        self,
+        allocation: Allocation,
+        allocation_percentage: int,
+        start_date: datetime,
+        end_date: Optional[datetime],
+    ) -> None:
+        self._reindex_allocation(allocation, allocation_percentage, start_date, end_date)
+        self._log_allocation(allocation)
+
+    def update_allocations(
+        self,
+        updates: List[Tuple[Allocation, int, datetime, Optional[datetime]]],
+    ) -> None:
+        for allocation, allocation_percentage, start_date, end_date in updates:
+            self._reindex_allocation(allocation, allocation_percentage, start_date, end_date)
+        self._log_allocations([allocation for allocation, _, _, _ in updates])
+
+    def _log_allocation(self, allocation: Allocation) -> None:
+        """
+        Append an allocation's new state to the log, compacting it when it grows too large.
+
+        Args:
+            allocation: The allocation that was created or updated.
+        """
+        self._log.append(allocation_to_record(allocation))
+        if self._log.record_count >= self.compact_threshold:
+            self._compact_allocations()
+
+    def _log_allocations(self, allocations: List[Allocation]) -> None:
+        """
+        Append several allocations' new state to the log as one all-or-nothing entry.
+
+        Args:
+            allocations: The allocations that were created or updated together.
+        """
+        self._log.append_batch([allocation_to_record(a) for a in allocations])
+        if self._log.record_count >= self.compact_threshold:
+            self._compact_allocations()
+
+    def _compact_allocations(self) -> None:
+        """Write all allocations to allocations.json and truncate the log."""
+        self._log.write_snapshot(
+            os.path.join(self.data_folder, "allocations.json"),
+            [allocation_to_record(a) for a in self._allocations],
+        )
+
+    def _index_allocation(self, allocation: Allocation) -> None:
+        """
+        Add an allocation to the allocation list and keep the indexes in sync.
+
+        Args:
+            allocation: The allocation to add.
+        """
+        self._allocations.append(allocation)
+        self._allocations_by_id[allocation.id] = allocation
+        self._allocations_by_engineer_id.setdefault(
+            allocation.engineer_id, []
+        ).append(allocation)
+        self._allocations_by_project_id.setdefault(
+            allocation.project_id, []
+        ).append(allocation)
+        self._intervals_by_engineer_id.setdefault(
+            allocation.engineer_id, IntervalIndex()
+        ).add(allocation)
+        self._timelines_by_engineer_id.setdefault(
+            allocation.engineer_id, CapacityTimeline()
+        ).add(allocation)
+
+    def _reindex_allocation(
+        self,
+        allocation: Allocation,
+        allocation_percentage: int,
+        start_date: datetime,
+        end_date: Optional[datetime],
+    ) -> None:
+        """
+        Change an allocation's percentage and dates, re-indexing it under the new values.
+
+        Args:
+            allocation: The allocation to change.
+            allocation_percentage: The new allocation percentage.
+            start_date: The new start date.
+            end_date: The new end date (None for indefinite).
+        """
+        intervals = self._intervals_by_engineer_id[allocation.engineer_id]
+        timeline = self._timelines_by_engineer_id[allocation.engineer_id]
+        intervals.remove(allocation)
+        timeline.remove(allocation)
+        allocation.allocation_percentage = allocation_percentage
+        allocation.start_date = start_date
+        allocation.end_date = end_date
+        intervals.add(allocation)
+        timeline.add(allocation)
@@ -0,0 +1,273 @@
+import json
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from models.allocation import Allocation
+from models.engineer import Engineer
+from models.project import Project
+from service.capacity_timeline import CapacityTimeline
+from service.json_storage import DATE_FORMAT, JsonStorageBackend
+from service.storage_backend import StorageBackend
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS engineers (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS allocations (
+    id TEXT PRIMARY KEY,
+    engineer_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    allocation_percentage INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_allocations_engineer_start
+    ON allocations (engineer_id, start_date);
+CREATE INDEX IF NOT EXISTS idx_allocations_project
+    ON allocations (project_id);
+"""
+
+ALLOCATION_COLUMNS = (
+    "id, engineer_id, project_id, allocation_percentage, start_date, end_date"
+)
+
+
+class SqliteStorageBackend(StorageBackend):
+    """
+    Storage backed by an SQLite database in WAL mode.
+
+    Only the rows a request needs are read: lookups use primary keys and
+    overlap and capacity checks use the (engineer_id, start_date) index.
+    An empty database is populated from the JSON data folder on first load.
+    """
+
+    def __init__(self, database_path: str, import_folder: Optional[str] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            database_path: Path to the SQLite database file.
+            import_folder: Optional data folder to import JSON files from when
+                        the database is empty.
+        """
+        self.database_path = database_path
+        self.import_folder = import_folder
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def load(self) -> None:
+        """Open the database, create the schema and import JSON data if it is empty."""
+        connection = sqlite3.connect(self.database_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        self._connection = connection
+
+        is_empty = connection.execute("SELECT 1 FROM engineers LIMIT 1").fetchone() is None
+        if is_empty and self.import_folder is not None:
+            self.import_json(self.import_folder)
+
+    def import_json(self, data_folder: str) -> None:
+        """
+        Import engineers, projects and allocations using the JSON loader.
+
+        Args:
+            data_folder: Path to the folder holding the JSON files.
+        """
+        source = JsonStorageBackend(data_folder)
+        source.load()
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO engineers (id, data) VALUES (?, ?)",
+                ((e.id, json.dumps(e.to_dict())) for e in source.get_engineers()),
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO projects (id, data) VALUES (?, ?)",
+                ((p.id, json.dumps(p.to_dict())) for p in source.get_projects()),
+            )
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO allocations ({ALLOCATION_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._allocation_to_row(a) for a in source.get_allocations()),
+            )
+
+    def get_engineers(self) -> List[Engineer]:
+        rows = self._connection.execute("SELECT data FROM engineers ORDER BY rowid")
+        return [Engineer(**json.loads(data)) for (data,) in rows]
+
+    def get_projects(self) -> List[Project]:
+        rows = self._connection.execute("SELECT data FROM projects ORDER BY rowid")
+        return [Project(**json.loads(data)) for (data,) in rows]
+
+    def get_allocations(self) -> List[Allocation]:
+        return self._query_allocations("ORDER BY rowid")
+
+    def get_engineer(self, id: str) -> Optional[Engineer]:
+        row = self._connection.execute(
+            "SELECT data FROM engineers WHERE id = ?", (id,)
+        ).fetchone()
+        return Engineer(**json.loads(row[0])) if row else None
+
+    def get_project(self, id: str) -> Optional[Project]:
+        row = self._connection.execute(
+            "SELECT data FROM projects WHERE id = ?", (id,)
+        ).fetchone()
+        return Project(**json.loads(row[0])) if row else None
+
+    def get_allocation(self, id: str) -> Optional[Allocation]:
+        allocations = self._query_allocations("WHERE id = ?", (id,))
+        return allocations[0] if allocations else None
+
+    def get_allocations_by_engineer_id(self, engineer_id: str) -> List[Allocation]:
+        return self._query_allocations(
+            "WHERE engineer_id = ? ORDER BY rowid", (engineer_id,)
+        )
+
+    def get_allocations_by_project_id(self, project_id: str) -> List[Allocation]:
+        return self._query_allocations(
+            "WHERE project_id = ? ORDER BY rowid", (project_id,)
+        )
+
+    def get_overlapping_allocations(
+        self,
+        engineer_id: str,
+        start: datetime,
+        end: Optional[datetime],
+        exclude_id: Optional[str] = None,
+    ) -> List[Allocation]:
+        clause = "WHERE engineer_id = ? AND (end_date IS NULL OR end_date > ?)"
+        params: list = [engineer_id, start.strftime(DATE_FORMAT)]
+        if end is not None:
+            clause += " AND start_date < ?"
+            params.append(end.strftime(DATE_FORMAT))
+        if exclude_id is not None:
+            clause += " AND id != ?"
+            params.append(exclude_id)
+
+        return self._query_allocations(clause + " ORDER BY start_date", params)
+
+    def get_peak_allocation(
+        self,
+        engineer_id: str,
+        start: datetime,
+        end: Optional[datetime],
+        exclude: Optional[Allocation] = None,
+    ) -> int:
+        # Sweep only the allocations that overlap the range
+        timeline = CapacityTimeline()
+        exclude_id = exclude.id if exclude is not None else None
+        for allocation in self.get_overlapping_allocations(
+            engineer_id, start, end, exclude_id=exclude_id
+        ):
+            timeline.add(allocation)
+
+        return timeline.peak_load(start, end)
+
+    def add_allocation(self, allocation: Allocation) -> None:
+        with self._connection:
+            self._connection.execute(
+                f"INSERT INTO allocations ({ALLOCATION_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._allocation_to_row(allocation),
+            )
+
+    def add_allocations(self, allocations: List[Allocation]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO allocations ({ALLOCATION_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._allocation_to_row(a) for a in allocations),
+            )
+
+    def update_allocation(
+        self,
+        allocation: Allocation,
+        allocation_percentage: int,
+        start_date: datetime,
+        end_date: Optional[datetime],
+    ) -> None:
+        allocation.allocation_percentage = allocation_percentage
+        allocation.start_date = start_date
+        allocation.end_date = end_date
+
+        with self._connection:
+            self._connection.execute(
+                "UPDATE allocations SET allocation_percentage = ?, start_date = ?, "
+                "end_date = ? WHERE id = ?",
+                (
+                    allocation_percentage,
+                    start_date.strftime(DATE_FORMAT),
+                    end_date.strftime(DATE_FORMAT) if end_date else None,
+                    allocation.id,
+                ),
+            )
+
+    def update_allocations(
+        self,
+        updates: List[Tuple[Allocation, int, datetime, Optional[datetime]]],
+    ) -> None:
+        for allocation, allocation_percentage, start_date, end_date in updates:
+            allocation.allocation_percentage = allocation_percentage
+            allocation.start_date = start_date
+            allocation.end_date = end_date
+
+        with self._connection:
+            self._connection.executemany(
+                "UPDATE allocations SET allocation_percentage = ?, start_date = ?, "
+                "end_date = ? WHERE id = ?",
+                (
+                    (
+                        allocation.allocation_percentage,
+                        allocation.start_date.strftime(DATE_FORMAT),
+                        allocation.end_date.strftime(DATE_FORMAT)
+                        if allocation.end_date
+                        else None,
+                        allocation.id,
+                    )
+                    for allocation, _, _, _ in updates
+                ),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _query_allocations(
+        self, clause: str, params: Iterable = ()
+    ) -> List[Allocation]:
+        """Run an allocation query with the given WHERE/ORDER BY clause."""
+        rows = self._connection.execute(
+            f"SELECT {ALLOCATION_COLUMNS} FROM allocations {clause}", tuple(params)
+        )
+        return [self._allocation_from_row(row) for row in rows]
+
+    def _allocation_from_row(self, row: tuple) -> Allocation:
+        """Build an allocation from an allocations table row."""
+        id, engineer_id, project_id, percentage, start_date, end_date = row
+        return Allocation(
+            id=id,
+            engineer_id=engineer_id,
+            project_id=project_id,
+            allocation_percentage=percentage,
+            start_date=datetime.strptime(start_date, DATE_FORMAT),
+            end_date=datetime.strptime(end_date, DATE_FORMAT) if end_date else None,
+        )
+
+    def _allocation_to_row(self, allocation: Allocation) -> tuple:
+        """Convert an allocation to an allocations table row."""
+        return (
+            allocation.id,
+            allocation.engineer_id,
+            allocation.project_id,
+            allocation.allocation_percentage,
+            allocation.start_date.strftime(DATE_FORMAT),
+            allocation.end_date.strftime(DATE_FORMAT) if allocation.end_date else None,
+        )
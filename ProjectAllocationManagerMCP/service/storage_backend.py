@@ -0,0 +1,147 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+from models.allocation import Allocation
+from models.engineer import Engineer
+from models.project import Project
+
+
+class StorageBackend(ABC):
+    """
+    Storage used by AllocationService for engineers, projects and allocations.
+
+    Backends own persistence and the indexes needed to answer lookups,
+    overlap queries and capacity checks. Validation and messaging stay in
+    AllocationService, so every backend enforces the same rules.
+    """
+
+    @abstractmethod
+    def load(self) -> None:
+        """Open the storage and load or import its data."""
+
+    def close(self) -> None:
+        """Flush pending writes and release the storage."""
+
+    @abstractmethod
+    def get_engineers(self) -> List[Engineer]:
+        """Return all engineers."""
+
+    @abstractmethod
+    def get_projects(self) -> List[Project]:
+        """Return all projects."""
+
+    @abstractmethod
+    def get_allocations(self) -> List[Allocation]:
+        """Return all allocations."""
+
+    @abstractmethod
+    def get_engineer(self, id: str) -> Optional[Engineer]:
+        """Return the engineer with the given id, or None."""
+
+    @abstractmethod
+    def get_project(self, id: str) -> Optional[Project]:
+        """Return the project with the given id, or None."""
+
+    @abstractmethod
+    def get_allocation(self, id: str) -> Optional[Allocation]:
+        """Return the allocation with the given id, or None."""
+
+    @abstractmethod
+    def get_allocations_by_engineer_id(self, engineer_id: str) -> List[Allocation]:
+        """
+        Return an engineer's allocations.
+
+        The returned list may be shared with the backend and must not be modified.
+        """
+
+    @abstractmethod
+    def get_allocations_by_project_id(self, project_id: str) -> List[Allocation]:
+        """
+        Return a project's allocations.
+
+        The returned list may be shared with the backend and must not be modified.
+        """
+
+    @abstractmethod
+    def get_overlapping_allocations(
+        self,
+        engineer_id: str,
+        start: datetime,
+        end: Optional[datetime],
+        exclude_id: Optional[str] = None,
+    ) -> List[Allocation]:
+        """
+        Return an engineer's allocations that overlap the given date range.
+
+        Args:
+            engineer_id: The unique identifier of the engineer.
+            start: Start date of the range.
+            end: End date of the range (None for indefinite).
+            exclude_id: Optional allocation ID to leave out.
+        """
+
+    @abstractmethod
+    def get_peak_allocation(
+        self,
+        engineer_id: str,
+        start: datetime,
+        end: Optional[datetime],
+        exclude: Optional[Allocation] = None,
+    ) -> int:
+        """
+        Return an engineer's highest total allocation at any point in the given date range.
+
+        Args:
+            engineer_id: The unique identifier of the engineer.
+            start: Start date of the range.
+            end: End date of the range (None for indefinite).
+            exclude: Optional stored allocation whose load should be ignored.
+        """
+
+    @abstractmethod
+    def add_allocation(self, allocation: Allocation) -> None:
+        """Persist a new allocation."""
+
+    def add_allocations(self, allocations: List[Allocation]) -> None:
+        """
+        Persist several new allocations together.
+
+        Backends that support transactions override this to store all of
+        them or none of them.
+        """
+        for allocation in allocations:
+            self.add_allocation(allocation)
+
+    @abstractmethod
+    def update_allocation(
+        self,
+        allocation: Allocation,
+        allocation_percentage: int,
+        start_date: datetime,
+        end_date: Optional[datetime],
+    ) -> None:
+        """
+        Persist new values for an allocation and apply them to the given object.
+
+        Args:
+            allocation: The stored allocation to change.
+            allocation_percentage: The new allocation percentage.
+            start_date: The new start date.
+            end_date: The new end date (None for indefinite).
+        """
+
+    def update_allocations(
+        self,
+        updates: List[Tuple[Allocation, int, datetime, Optional[datetime]]],
+    ) -> None:
+        """
+        Persist new values for several allocations together.
+
+        Backends that support transactions override this to apply all of
+        the updates or none of them.
+
+        Args:
+            updates: (allocation, allocation_percentage, start_date, end_date) tuples.
+        """
+        for allocation, allocation_percentage, start_date, end_date in updates:
+            self.update_allocation(allocation, allocation_percentage, start_date, end_date)
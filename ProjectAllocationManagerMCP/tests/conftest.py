@@ -0,0 +1,57 @@
+import json
+import pytest
+from service.allocation_service import AllocationService
+from service.json_storage import JsonStorageBackend
+from service.sqlite_storage import SqliteStorageBackend
+from service.storage_backend import StorageBackend
+
+
+ENGINEERS = [
+    {"id": "eng-001", "name": "Alice Johnson", "role": "Senior Software Engineer"},
+    {"id": "eng-002", "name": "Bob Smith", "role": "Full Stack Developer"},
+]
+PROJECTS = [
+    {"id": "proj-001", "name": "Customer Portal", "status": "Active"},
+    {"id": "proj-002", "name": "Data Platform", "status": "Active"},
+]
+
+
+@pytest.fixture
+def data_folder(tmp_path):
+    """A data folder with two engineers, two projects and no allocations."""
+    for name, records in (
+        ("engineers", ENGINEERS),
+        ("projects", PROJECTS),
+        ("allocations", []),
+    ):
+        (tmp_path / f"{name}.json").write_text(json.dumps(records))
+    return tmp_path
+
+
+def make_backend(name: str, data_folder) -> StorageBackend:
+    """A storage backend over the data folder; SQLite imports the JSON files on first load."""
+    if name == "sqlite":
+        return SqliteStorageBackend(
+            str(data_folder / "allocations.db"), import_folder=str(data_folder)
+        )
+    return JsonStorageBackend(str(data_folder))
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request):
+    """The storage backend name; tests using it run once per backend."""
+    return request.param
+
+
+@pytest.fixture
+def load_service(data_folder, backend):
+    """Load a fresh AllocationService over the data folder with the current backend."""
+
+    async def load(columnar: bool = False) -> AllocationService:
+        service = AllocationService(
+            backend=make_backend(backend, data_folder), columnar=columnar
+        )
+        await service.load_data_async()
+        return service
+
+    return load
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import time
+from service.allocation_log import AllocationLog
+from service.allocation_service import AllocationService
+from service.json_storage import JsonStorageBackend
+
+
+def record(id: str) -> dict:
+    return {
+        "id": id,
+        "engineerId": "eng-001",
+        "projectId": "proj-001",
+        "allocationPercentage": 50,
+        "startDate": "2025-01-01T00:00:00",
+        "endDate": None,
+    }
+
+
+def test_replay_returns_appended_records(tmp_path):
+    log = AllocationLog(str(tmp_path / "allocations.wal"))
+    log.append(record("a"))
+    log.append(record("b"))
+    log.close()
+
+    assert [r["id"] for r in AllocationLog(log.path).replay()] == ["a", "b"]
+
+
+def test_torn_tail_is_truncated_before_the_next_append(tmp_path):
+    path = str(tmp_path / "allocations.wal")
+    log = AllocationLog(path)
+    log.append(record("a"))
+    log.close()
+    with open(path, "a") as f:
+        f.write('{"id":"torn","engineerId":"eng')
+
+    log = AllocationLog(path)
+    assert [r["id"] for r in log.replay()] == ["a"]
+    log.append(record("b"))
+    log.close()
+
+    assert [r["id"] for r in AllocationLog(path).replay()] == ["a", "b"]
+    with open(path) as f:
+        assert "torn" not in f.read()
+
+
+def test_record_missing_only_its_newline_is_kept(tmp_path):
+    path = str(tmp_path / "allocations.wal")
+    with open(path, "w") as f:
+        f.write(json.dumps(record("a")))
+
+    log = AllocationLog(path)
+    assert [r["id"] for r in log.replay()] == ["a"]
+    log.append(record("b"))
+    log.close()
+
+    assert [r["id"] for r in AllocationLog(path).replay()] == ["a", "b"]
+
+
+def test_append_after_unreplayed_torn_tail_starts_a_new_line(tmp_path):
+    path = str(tmp_path / "allocations.wal")
+    with open(path, "w") as f:
+        f.write('{"id":"torn"')
+
+    log = AllocationLog(path)
+    log.append(record("a"))
+    log.close()
+
+    assert [r["id"] for r in AllocationLog(path).replay()] == ["a"]
+
+
+def test_pending_records_are_fsynced_by_the_timer(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    log = AllocationLog(
+        str(tmp_path / "allocations.wal"), fsync_batch_size=100, fsync_interval=0.05
+    )
+    log.append(record("a"))
+    assert synced == []
+
+    deadline = time.monotonic() + 2
+    while not synced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(synced) == 1
+    log.close()
+
+
+def test_close_fsyncs_pending_records(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    log = AllocationLog(
+        str(tmp_path / "allocations.wal"), fsync_batch_size=100, fsync_interval=60
+    )
+    log.append(record("a"))
+    log.close()
+
+    assert len(synced) == 1
+
+
+def test_allocation_after_torn_tail_survives_restart(data_folder):
+    async def scenario():
+        service = AllocationService(backend=JsonStorageBackend(str(data_folder)))
+        await service.load_data_async()
+        success, _, first = await service.allocate_engineer_async(
+            "eng-001", "proj-001", 50, "2025-01-01", "2025-02-01"
+        )
+        assert success
+        await service.close_async()
+
+        with open(data_folder / "allocations.wal", "a") as f:
+            f.write('{"id":"alloc-torn","engin')
+
+        service = AllocationService(backend=JsonStorageBackend(str(data_folder)))
+        await service.load_data_async()
+        success, _, second = await service.allocate_engineer_async(
+            "eng-002", "proj-002", 50, "2025-01-01", "2025-02-01"
+        )
+        assert success
+        await service.close_async()
+
+        service = AllocationService(backend=JsonStorageBackend(str(data_folder)))
+        await service.load_data_async()
+        ids = {a.id for a in await service.get_allocations_async()}
+        assert ids == {first.id, second.id}
+
+    asyncio.run(scenario())
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import pytest
+
+
+def item(engineer_id="eng-001", project_id="proj-001", percentage=50, **dates):
+    return {
+        "engineerId": engineer_id,
+        "projectId": project_id,
+        "allocationPercentage": percentage,
+        "startDate": dates.get("startDate", "2025-01-01"),
+        "endDate": dates.get("endDate", "2025-03-01"),
+    }
+
+
+# The allocation log belongs to the JSON backend
+@pytest.mark.parametrize("backend", ["json"])
+def test_batch_is_logged_as_one_entry_and_survives_restart(data_folder, load_service):
+    async def scenario():
+        service = await load_service()
+        success, _, results = await service.allocate_engineers_batch_async(
+            [item(), item("eng-002", "proj-002")]
+        )
+        assert success
+        await service.close_async()
+
+        with open(data_folder / "allocations.wal") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 1
+        assert len(json.loads(lines[0])["batch"]) == 2
+
+        service = await load_service()
+        stored = {a.id for a in await service.get_allocations_async()}
+        await service.close_async()
+        return stored, {result["allocation"]["id"] for result in results}
+
+    stored, created = asyncio.run(scenario())
+    assert stored == created
+
+
+# The allocation log belongs to the JSON backend
+@pytest.mark.parametrize("backend", ["json"])
+def test_torn_batch_entry_is_not_partially_replayed(data_folder, load_service):
+    async def scenario():
+        service = await load_service()
+        success, _, _ = await service.allocate_engineers_batch_async(
+            [item(), item("eng-002", "proj-002")]
+        )
+        assert success
+        await service.close_async()
+
+        # Crash halfway through writing the batch line
+        path = data_folder / "allocations.wal"
+        line = path.read_text()
+        path.write_text(line[: len(line) // 2])
+
+        service = await load_service()
+        allocations = await service.get_allocations_async()
+        await service.close_async()
+        return allocations
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_items_that_together_over_allocate_are_rejected(load_service):
+    async def scenario():
+        service = await load_service()
+        result = await service.allocate_engineers_batch_async(
+            [item(percentage=60), item(project_id="proj-002", percentage=60)]
+        )
+        allocations = await service.get_allocations_async()
+        return result, allocations
+
+    (success, _, results), allocations = asyncio.run(scenario())
+    assert not success
+    assert [result["valid"] for result in results] == [True, False]
+    assert "over-allocated" in results[1]["message"]
+    assert allocations == []
+
+
+@pytest.mark.parametrize(
+    "bad_item",
+    [
+        "eng-001",
+        None,
+        item(percentage=True),
+        item(percentage="50"),
+        item(percentage=None),
+        item(startDate=20250101),
+        item(endDate=["2025-03-01"]),
+        {**item(), "engineerId": 1},
+        {**item(), "projectId": None},
+    ],
+)
+def test_malformed_items_get_per_item_errors(load_service, bad_item):
+    async def scenario():
+        service = await load_service()
+        result = await service.allocate_engineers_batch_async(
+            [item("eng-002", "proj-002"), bad_item]
+        )
+        allocations = await service.get_allocations_async()
+        return result, allocations
+
+    (success, message, results), allocations = asyncio.run(scenario())
+    assert not success
+    assert "1 of 2 allocations are invalid" in message
+    assert results[0]["valid"] and not results[1]["valid"]
+    assert allocations == []
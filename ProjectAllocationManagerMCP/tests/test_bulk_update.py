@@ -0,0 +1,130 @@
+import asyncio
+import json
+import pytest
+
+
+async def allocate(service, engineer_id, project_id, percentage, start, end):
+    success, message, allocation = await service.allocate_engineer_async(
+        engineer_id, project_id, percentage, start, end
+    )
+    assert success, message
+    return allocation
+
+
+# The allocation log belongs to the JSON backend
+@pytest.mark.parametrize("backend", ["json"])
+def test_updates_are_logged_as_one_entry_and_survive_restart(data_folder, load_service):
+    async def scenario():
+        service = await load_service()
+        first = await allocate(service, "eng-001", "proj-001", 50, "2025-01-01", "2025-02-01")
+        second = await allocate(service, "eng-002", "proj-002", 50, "2025-01-01", "2025-02-01")
+        before = (data_folder / "allocations.wal").read_text().splitlines()
+
+        success, message, _ = await service.update_allocations_batch_async(
+            [
+                {"allocationId": first.id, "endDate": "2025-03-01"},
+                {"allocationId": second.id, "allocationPercentage": 80},
+            ]
+        )
+        assert success, message
+        await service.close_async()
+
+        lines = (data_folder / "allocations.wal").read_text().splitlines()
+        assert len(lines) == len(before) + 1
+        assert len(json.loads(lines[-1])["batch"]) == 2
+
+        service = await load_service()
+        first = await service.get_allocation_by_id_async(first.id)
+        second = await service.get_allocation_by_id_async(second.id)
+        await service.close_async()
+        return first.to_dict()["endDate"], second.allocation_percentage
+
+    assert asyncio.run(scenario()) == ("2025-03-01", 80)
+
+
+# The allocation log belongs to the JSON backend
+@pytest.mark.parametrize("backend", ["json"])
+def test_torn_update_entry_is_not_partially_replayed(data_folder, load_service):
+    async def scenario():
+        service = await load_service()
+        first = await allocate(service, "eng-001", "proj-001", 50, "2025-01-01", "2025-02-01")
+        second = await allocate(service, "eng-002", "proj-002", 50, "2025-01-01", "2025-02-01")
+        success, _, _ = await service.update_allocations_batch_async(
+            [
+                {"allocationId": first.id, "allocationPercentage": 20},
+                {"allocationId": second.id, "allocationPercentage": 30},
+            ]
+        )
+        assert success
+        await service.close_async()
+
+        # Crash halfway through writing the update line
+        path = data_folder / "allocations.wal"
+        text = path.read_text()
+        last_line_start = text.rstrip("\n").rfind("\n") + 1
+        path.write_text(text[: last_line_start + (len(text) - last_line_start) // 2])
+
+        service = await load_service()
+        percentages = sorted(
+            a.allocation_percentage for a in await service.get_allocations_async()
+        )
+        await service.close_async()
+        return percentages
+
+    assert asyncio.run(scenario()) == [50, 50]
+
+
+def test_later_updates_see_earlier_ones(load_service):
+    async def scenario():
+        service = await load_service()
+        first = await allocate(service, "eng-001", "proj-001", 50, "2025-01-01", "2025-02-01")
+        second = await allocate(service, "eng-001", "proj-002", 50, "2025-02-01", "2025-03-01")
+        # Moving the first allocation into the second's range only fits
+        # because the second one is lowered first
+        result = await service.update_allocations_batch_async(
+            [
+                {"allocationId": second.id, "allocationPercentage": 40},
+                {"allocationId": first.id, "startDate": "2025-02-01", "endDate": "2025-03-01"},
+                {"allocationId": first.id, "allocationPercentage": 70},
+            ]
+        )
+        await service.close_async()
+        return result
+
+    success, _, results = asyncio.run(scenario())
+    assert not success
+    assert [result["valid"] for result in results] == [True, True, False]
+    assert "over-allocated" in results[2]["message"]
+
+
+@pytest.mark.parametrize(
+    "bad_update",
+    [
+        "alloc-1",
+        {"allocationId": 7},
+        {"allocationId": "missing"},
+        {"allocationId": "FIRST", "startDate": 20250101},
+        {"allocationId": "FIRST", "endDate": {"date": "2025-03-01"}},
+        {"allocationId": "FIRST", "allocationPercentage": True},
+        {"allocationId": "FIRST", "allocationPercentage": 50.5},
+    ],
+)
+def test_malformed_updates_get_per_item_errors(load_service, bad_update):
+    async def scenario():
+        service = await load_service()
+        first = await allocate(service, "eng-001", "proj-001", 50, "2025-01-01", "2025-02-01")
+        if isinstance(bad_update, dict) and bad_update.get("allocationId") == "FIRST":
+            update = {**bad_update, "allocationId": first.id}
+        else:
+            update = bad_update
+        result = await service.update_allocations_batch_async(
+            [{"allocationId": first.id, "allocationPercentage": 60}, update]
+        )
+        stored = await service.get_allocation_by_id_async(first.id)
+        await service.close_async()
+        return result, stored.allocation_percentage
+
+    (success, _, results), percentage = asyncio.run(scenario())
+    assert not success
+    assert results[0]["valid"] and not results[1]["valid"]
+    assert percentage == 50
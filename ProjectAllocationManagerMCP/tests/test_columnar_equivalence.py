@@ -0,0 +1,138 @@
+import asyncio
+import json
+import random
+import shutil
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import pytest
+import service.columnar_store
+from service.allocation_service import AllocationService
+from service.json_storage import JsonStorageBackend
+
+FIXTURES = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture
+def fixture_folder(tmp_path):
+    """A copy of the repository's data files plus generated allocations."""
+    for name in ("engineers", "projects", "allocations"):
+        shutil.copy(FIXTURES / f"{name}.json", tmp_path / f"{name}.json")
+
+    engineers = [e["id"] for e in json.loads((tmp_path / "engineers.json").read_text())]
+    projects = [p["id"] for p in json.loads((tmp_path / "projects.json").read_text())]
+    allocations = json.loads((tmp_path / "allocations.json").read_text())
+    rng = random.Random(0)
+    for i in range(300):
+        start = date(2024, 6, 1) + timedelta(days=rng.randrange(600))
+        end = start + timedelta(days=rng.randrange(1, 200))
+        allocations.append(
+            {
+                "id": f"generated-{i:03d}",
+                "engineerId": rng.choice(engineers),
+                "projectId": rng.choice(projects),
+                "allocationPercentage": rng.choice([10, 20, 25, 50, 75, 100]),
+                "startDate": f"{start.isoformat()}T00:00:00",
+                # Some allocations are open-ended
+                "endDate": None if i % 10 == 0 else f"{end.isoformat()}T00:00:00",
+            }
+        )
+    (tmp_path / "allocations.json").write_text(json.dumps(allocations))
+    return tmp_path
+
+
+@pytest.fixture(params=["numpy", "python"])
+def aggregate_path(request, monkeypatch):
+    """Run the columnar aggregates with NumPy and with the pure Python fallback."""
+    if request.param == "python":
+        monkeypatch.setattr(service.columnar_store, "np", None)
+    return request.param
+
+
+def row_based_monthly_totals(allocations, start_month: date, end_month: date) -> dict:
+    """The monthly project aggregate computed day by day from Allocation objects."""
+    totals: dict = {}
+    year, month = start_month.year, start_month.month
+    while (year, month) <= (end_month.year, end_month.month):
+        days = monthrange(year, month)[1]
+        label = f"{year:04d}-{month:02d}"
+        month_totals: dict = {}
+        for day in range(1, days + 1):
+            on_date = datetime(year, month, day)
+            for a in allocations:
+                # End dates are exclusive, as in the overlap and capacity checks
+                if a.start_date <= on_date and (a.end_date is None or on_date < a.end_date):
+                    month_totals[a.project_id] = (
+                        month_totals.get(a.project_id, 0) + a.allocation_percentage
+                    )
+        for project, total in month_totals.items():
+            totals.setdefault(project, {})[label] = round(total / days, 2)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return totals
+
+
+async def load(folder, columnar: bool) -> AllocationService:
+    service = AllocationService(backend=JsonStorageBackend(str(folder)), columnar=columnar)
+    await service.load_data_async()
+    return service
+
+
+def test_monthly_aggregate_matches_row_based_totals(fixture_folder, aggregate_path):
+    async def scenario():
+        service = await load(fixture_folder, columnar=True)
+        success, message, totals = await service.get_monthly_project_allocation_async(
+            "2024-05", "2026-06"
+        )
+        assert success, message
+        allocations = await service.get_allocations_async()
+        await service.close_async()
+        return totals, allocations
+
+    totals, allocations = asyncio.run(scenario())
+    assert len(allocations) == 306
+    assert totals == row_based_monthly_totals(
+        allocations, date(2024, 5, 1), date(2026, 6, 1)
+    )
+
+
+def test_allocation_views_match_allocations(fixture_folder):
+    async def scenario():
+        rows = await load(fixture_folder, columnar=False)
+        columnar = await load(fixture_folder, columnar=True)
+        pairs = [
+            (
+                await rows.get_allocations_async(),
+                await columnar.get_allocations_async(as_views=True),
+            )
+        ]
+        for engineer in await rows.get_engineers_async():
+            pairs.append(
+                (
+                    await rows.get_allocations_by_engineer_id_async(engineer.id),
+                    await columnar.get_allocations_by_engineer_id_async(
+                        engineer.id, as_views=True
+                    ),
+                )
+            )
+        for project in await rows.get_projects_async():
+            pairs.append(
+                (
+                    await rows.get_allocations_by_project_id_async(project.id),
+                    await columnar.get_allocations_by_project_id_async(
+                        project.id, as_views=True
+                    ),
+                )
+            )
+        await rows.close_async()
+        await columnar.close_async()
+        return pairs
+
+    days = [datetime(2024, 6, 1) + timedelta(days=d) for d in range(0, 900, 7)]
+    for allocations, views in asyncio.run(scenario()):
+        assert [v.to_dict() for v in views] == [a.to_dict() for a in allocations]
+        for allocation, view in zip(allocations, views):
+            assert view.start_date == allocation.start_date
+            assert view.end_date == allocation.end_date
+            assert [view.is_active(d) for d in days] == [
+                allocation.is_active(d) for d in days
+            ]
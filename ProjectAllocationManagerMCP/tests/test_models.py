@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+import pytest
+from models.engineer import Engineer
+from models.project import Project
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.mark.parametrize(
+    ("model", "record"),
+    [
+        (Engineer, {"id": "eng-001", "name": "Alice", "role": "SRE", "skills": ["Go"]}),
+        (Engineer, {"id": "eng-002", "name": "Bob"}),
+        (Engineer, {"id": "eng-003", "name": "Carol", "role": "SRE", "team": "Infra"}),
+        (Project, {"id": "proj-001", "name": "Portal", "status": "Active", "description": ""}),
+        (Project, {"id": "proj-002", "name": "Data", "status": None, "owner": "eng-001"}),
+    ],
+)
+def test_records_round_trip(model, record):
+    instance = model(**record)
+    assert instance.to_dict() == record
+    for key, value in record.items():
+        assert getattr(instance, key) == value
+
+
+def test_extra_is_only_created_for_unknown_fields():
+    assert Engineer(id="eng-001", name="Alice", role="SRE", skills=[]).extra is None
+    assert Engineer(id="eng-001", name="Alice", team="Infra").extra == {"team": "Infra"}
+    assert Project(id="proj-001", name="Portal", status="Active").extra is None
+
+
+def test_missing_fields_raise_attribute_error():
+    engineer = Engineer(id="eng-001", name="Alice")
+    with pytest.raises(AttributeError):
+        engineer.role
+    with pytest.raises(AttributeError):
+        engineer.team
+    assert not hasattr(Project(id="proj-001", name="Portal"), "status")
+
+
+def test_data_files_round_trip():
+    engineers = json.loads((DATA / "engineers.json").read_text())
+    projects = json.loads((DATA / "projects.json").read_text())
+    assert [Engineer(**e).to_dict() for e in engineers] == engineers
+    assert [Project(**p).to_dict() for p in projects] == projects
@@ -0,0 +1,189 @@
+import asyncio
+import json
+from datetime import datetime
+from conftest import make_backend
+
+
+ALLOCATIONS = [
+    {
+        "id": "alloc-001",
+        "engineerId": "eng-001",
+        "projectId": "proj-001",
+        "allocationPercentage": 50,
+        "startDate": "2025-01-01T00:00:00",
+        "endDate": "2025-06-30T00:00:00",
+    },
+    {
+        "id": "alloc-002",
+        "engineerId": "eng-001",
+        "projectId": "proj-002",
+        "allocationPercentage": 30,
+        "startDate": "2025-03-01T00:00:00",
+        "endDate": None,
+    },
+    {
+        "id": "alloc-003",
+        "engineerId": "eng-002",
+        "projectId": "proj-001",
+        "allocationPercentage": 100,
+        "startDate": "2025-01-01T00:00:00",
+        "endDate": "2025-12-31T00:00:00",
+    },
+]
+
+
+def snapshot(backend) -> dict:
+    """Everything a backend returns, as plain dicts."""
+    return {
+        "engineers": [e.to_dict() for e in backend.get_engineers()],
+        "projects": [p.to_dict() for p in backend.get_projects()],
+        "allocations": [a.to_dict() for a in backend.get_allocations()],
+        "byEngineer": [
+            a.id for a in backend.get_allocations_by_engineer_id("eng-001")
+        ],
+        "byProject": [a.id for a in backend.get_allocations_by_project_id("proj-001")],
+    }
+
+
+def test_sqlite_import_matches_json_backend(data_folder):
+    (data_folder / "allocations.json").write_text(json.dumps(ALLOCATIONS))
+    json_backend = make_backend("json", data_folder)
+    sqlite_backend = make_backend("sqlite", data_folder)
+    json_backend.load()
+    sqlite_backend.load()
+
+    assert snapshot(sqlite_backend) == snapshot(json_backend)
+    assert len(sqlite_backend.get_allocations()) == 3
+    json_backend.close()
+    sqlite_backend.close()
+
+
+def test_sqlite_imports_only_into_an_empty_database(data_folder):
+    (data_folder / "allocations.json").write_text(json.dumps(ALLOCATIONS))
+    backend = make_backend("sqlite", data_folder)
+    backend.load()
+    backend.close()
+
+    # Later changes to the JSON files are not imported again
+    (data_folder / "allocations.json").write_text("[]")
+    backend = make_backend("sqlite", data_folder)
+    backend.load()
+    assert [a.id for a in backend.get_allocations()] == [
+        "alloc-001",
+        "alloc-002",
+        "alloc-003",
+    ]
+    backend.close()
+
+
+def test_peak_allocation(data_folder, backend):
+    (data_folder / "allocations.json").write_text(json.dumps(ALLOCATIONS))
+    storage = make_backend(backend, data_folder)
+    storage.load()
+
+    def peak(start, end, exclude=None):
+        return storage.get_peak_allocation(
+            "eng-001",
+            datetime.fromisoformat(start),
+            datetime.fromisoformat(end) if end else None,
+            exclude=storage.get_allocation(exclude) if exclude else None,
+        )
+
+    assert peak("2025-01-01", "2025-02-01") == 50
+    assert peak("2025-01-01", "2025-12-31") == 80
+    assert peak("2025-08-01", None) == 30
+    assert peak("2025-01-01", "2025-12-31", exclude="alloc-001") == 30
+    assert peak("2024-01-01", "2024-12-31") == 0
+    storage.close()
+
+
+def test_changes_survive_restart(load_service):
+    async def scenario():
+        service = await load_service()
+        success, message, first = await service.allocate_engineer_async(
+            "eng-001", "proj-001", 50, "2025-01-01", "2025-02-01"
+        )
+        assert success, message
+        success, message, results = await service.allocate_engineers_batch_async(
+            [
+                {
+                    "engineerId": "eng-002",
+                    "projectId": "proj-002",
+                    "allocationPercentage": 40,
+                    "startDate": "2025-01-01",
+                    "endDate": "2025-03-01",
+                },
+                {
+                    "engineerId": "eng-002",
+                    "projectId": "proj-001",
+                    "allocationPercentage": 60,
+                    "startDate": "2025-01-01",
+                    "endDate": None,
+                },
+            ]
+        )
+        assert success, message
+        success, message, _ = await service.update_allocations_batch_async(
+            [
+                {"allocationId": first.id, "endDate": "2025-04-01"},
+                {"allocationId": results[0]["allocation"]["id"], "allocationPercentage": 20},
+            ]
+        )
+        assert success, message
+        before = [a.to_dict() for a in await service.get_allocations_async()]
+        await service.close_async()
+
+        service = await load_service()
+        after = [a.to_dict() for a in await service.get_allocations_async()]
+        await service.close_async()
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    assert after == before
+    assert [a["allocationPercentage"] for a in after] == [50, 20, 60]
+    assert after[0]["endDate"] == "2025-04-01"
+
+
+def test_rejected_batches_store_nothing(load_service):
+    async def scenario():
+        service = await load_service()
+        success, message, allocation = await service.allocate_engineer_async(
+            "eng-001", "proj-001", 50, "2025-01-01", "2025-02-01"
+        )
+        assert success, message
+        batch = await service.allocate_engineers_batch_async(
+            [
+                {
+                    "engineerId": "eng-002",
+                    "projectId": "proj-002",
+                    "allocationPercentage": 40,
+                    "startDate": "2025-01-01",
+                    "endDate": "2025-03-01",
+                },
+                {
+                    "engineerId": "eng-001",
+                    "projectId": "proj-002",
+                    "allocationPercentage": 60,
+                    "startDate": "2025-01-15",
+                    "endDate": "2025-03-01",
+                },
+            ]
+        )
+        update = await service.update_allocations_batch_async(
+            [
+                {"allocationId": allocation.id, "allocationPercentage": 10},
+                {"allocationId": allocation.id, "allocationPercentage": 120},
+            ]
+        )
+        await service.close_async()
+
+        service = await load_service()
+        stored = [a.to_dict() for a in await service.get_allocations_async()]
+        await service.close_async()
+        return batch[0], update[0], stored
+
+    batch_success, update_success, stored = asyncio.run(scenario())
+    assert not batch_success
+    assert not update_success
+    assert len(stored) == 1
+    assert stored[0]["allocationPercentage"] == 50
@@ -0,0 +1,115 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+from models.allocation import Allocation
+from service.capacity_timeline import CapacityTimeline
+from service.interval_index import IntervalIndex, effective_end, overlaps
+
+EPOCH = datetime(2025, 1, 1)
+
+
+def random_allocation(rng: random.Random, id: int) -> Allocation:
+    start = EPOCH + timedelta(days=rng.randrange(400))
+    end = None if rng.random() < 0.1 else start + timedelta(days=rng.randint(1, 60))
+    return Allocation(
+        id=f"alloc-{id}",
+        engineer_id="eng-001",
+        project_id=f"proj-{rng.randrange(5)}",
+        allocation_percentage=rng.choice((10, 25, 50)),
+        start_date=start,
+        end_date=end,
+    )
+
+
+def brute_peak(allocations, start, end, exclude=None) -> int:
+    range_end = effective_end(end)
+    # The load can only rise at start or at an allocation start inside the range
+    points = [start] + [
+        a.start_date for a in allocations if start < a.start_date < range_end
+    ]
+    return max(
+        sum(
+            a.allocation_percentage
+            for a in allocations
+            if a is not exclude
+            and a.start_date <= point < effective_end(a.end_date)
+        )
+        for point in points
+    )
+
+
+def random_range(rng: random.Random):
+    start = EPOCH + timedelta(days=rng.randrange(-20, 450))
+    end = None if rng.random() < 0.1 else start + timedelta(days=rng.randint(1, 90))
+    return start, end
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_indexes_match_brute_force_through_changes(seed):
+    rng = random.Random(seed)
+    timeline = CapacityTimeline()
+    intervals = IntervalIndex()
+    allocations = []
+
+    # Enough operations to split and empty blocks many times over
+    for step in range(1500):
+        action = rng.random()
+        if action < 0.5 or not allocations:
+            allocation = random_allocation(rng, step)
+            allocations.append(allocation)
+            timeline.add(allocation)
+            intervals.add(allocation)
+        elif action < 0.7:
+            allocation = allocations.pop(rng.randrange(len(allocations)))
+            timeline.remove(allocation)
+            intervals.remove(allocation)
+        else:
+            # Update in place, the way storage backends re-index allocations
+            allocation = rng.choice(allocations)
+            timeline.remove(allocation)
+            intervals.remove(allocation)
+            changed = random_allocation(rng, step)
+            allocation.start_date = changed.start_date
+            allocation.end_date = changed.end_date
+            allocation.allocation_percentage = changed.allocation_percentage
+            timeline.add(allocation)
+            intervals.add(allocation)
+
+        if step % 10 == 0:
+            start, end = random_range(rng)
+            assert timeline.peak_load(start, end) == brute_peak(allocations, start, end)
+            if allocations:
+                exclude = rng.choice(allocations)
+                assert timeline.peak_load(start, end, exclude=exclude) == brute_peak(
+                    allocations, start, end, exclude
+                )
+
+            expected = sorted(
+                (a for a in allocations if overlaps(start, end, a.start_date, a.end_date)),
+                key=lambda a: a.id,
+            )
+            found = intervals.overlapping(start, end)
+            assert sorted(found, key=lambda a: a.id) == expected
+            assert [a.start_date for a in found] == sorted(a.start_date for a in found)
+            assert len(intervals) == len(allocations)
+
+
+def test_many_allocations_with_the_same_start_can_be_removed():
+    timeline = CapacityTimeline()
+    intervals = IntervalIndex()
+    allocations = [
+        Allocation(f"alloc-{i}", "eng-001", "proj-001", 1, EPOCH, EPOCH + timedelta(days=i + 1))
+        for i in range(500)
+    ]
+    for allocation in allocations:
+        timeline.add(allocation)
+        intervals.add(allocation)
+    assert timeline.peak_load(EPOCH, None) == 500
+
+    for allocation in allocations[::2]:
+        timeline.remove(allocation)
+        intervals.remove(allocation)
+
+    assert timeline.peak_load(EPOCH, None) == 250
+    assert len(intervals) == 250
+    assert set(intervals.overlapping(EPOCH, None)) == set(allocations[1::2])
@@ -0,0 +1,130 @@
+import asyncio
+import importlib
+import sys
+import pytest
+
+
+async def matrix(service, start, end, granularity="weekly", engineer_ids=None):
+    rows = []
+    async for chunk in service.iter_utilization_matrix_async(
+        start, end, granularity, engineer_ids=engineer_ids
+    ):
+        rows.extend(chunk)
+    return rows
+
+
+def test_weekly_utilization_averages_days_in_bucket(load_service):
+    async def scenario():
+        service = await load_service(columnar=True)
+        # Monday 2025-01-06 to Thursday 2025-01-09 (end exclusive)
+        await service.allocate_engineer_async(
+            "eng-001", "proj-001", 70, "2025-01-06", "2025-01-09"
+        )
+        rows = await matrix(service, "2025-01-06", "2025-01-19")
+        return {row["engineerId"]: row["utilization"] for row in rows}
+
+    utilization = asyncio.run(scenario())
+    assert utilization["eng-001"] == {"2025-01-06": 30.0, "2025-01-13": 0.0}
+    assert utilization["eng-002"] == {"2025-01-06": 0.0, "2025-01-13": 0.0}
+
+
+def test_analytics_store_is_built_once_and_kept_current(load_service):
+    async def scenario():
+        service = await load_service()
+        first = await matrix(service, "2025-01-01", "2025-01-01", "daily", ["eng-001"])
+        store = service._get_analytics_store()
+        await service.allocate_engineer_async(
+            "eng-001", "proj-001", 40, "2025-01-01", "2025-01-02"
+        )
+        second = await matrix(service, "2025-01-01", "2025-01-01", "daily", ["eng-001"])
+        assert service._get_analytics_store() is store
+        await service.close_async()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first[0]["utilization"] == {"2025-01-01": 0.0}
+    assert second[0]["utilization"] == {"2025-01-01": 40.0}
+
+
+@pytest.fixture
+def mcp_tools(data_folder, monkeypatch):
+    """The MCP tool module, loaded against the test data folder."""
+    # The tool module loads the data folder under the working directory
+    (data_folder / "data").mkdir()
+    for path in data_folder.glob("*.json"):
+        path.rename(data_folder / "data" / path.name)
+    monkeypatch.chdir(data_folder)
+    sys.modules.pop("project_mcp.mcp_tools", None)
+    module = importlib.import_module("project_mcp.mcp_tools")
+    yield module
+    asyncio.run(module.allocation_service.close_async())
+    sys.modules.pop("project_mcp.mcp_tools", None)
+
+
+def test_utilization_matrix_tool_pages_through_engineers(mcp_tools):
+    async def scenario():
+        pages = []
+        offset = 0
+        while offset is not None:
+            page = await mcp_tools.get_utilization_matrix(
+                "2025-01-01", "2025-01-07", offset=offset, limit=1
+            )
+            pages.append([row["engineerId"] for row in page["rows"]])
+            offset = page["nextOffset"]
+        return pages
+
+    assert asyncio.run(scenario()) == [["eng-001"], ["eng-002"]]
+
+
+@pytest.mark.parametrize(("offset", "limit"), [(0, 0), (0, -5), (-1, 10)])
+def test_utilization_matrix_tool_rejects_bad_pages(mcp_tools, offset, limit):
+    result = asyncio.run(
+        mcp_tools.get_utilization_matrix(
+            "2025-01-01", "2025-01-07", offset=offset, limit=limit
+        )
+    )
+    assert result["success"] is False
+    assert "nextOffset" not in result
+
+
+def test_allocating_during_matrix_iteration(load_service):
+    async def scenario():
+        service = await load_service(columnar=True)
+        await service.allocate_engineer_async(
+            "eng-002", "proj-002", 20, "2025-01-01", "2025-01-02"
+        )
+        chunks = service.iter_utilization_matrix_async(
+            "2025-01-01", "2025-01-01", "daily", chunk_size=1
+        )
+        first = await chunks.__anext__()
+        # The iterator is suspended between chunks while another request allocates
+        success, message, _ = await service.allocate_engineer_async(
+            "eng-001", "proj-001", 40, "2025-01-01", "2025-01-02"
+        )
+        assert success, message
+        rest = [row async for chunk in chunks for row in chunk]
+        after = await matrix(service, "2025-01-01", "2025-01-01", "daily")
+        store = service._get_analytics_store()
+        await service.close_async()
+        return first + rest, after, len(store)
+
+    during, after, stored = asyncio.run(scenario())
+    assert [row["utilization"] for row in during] == [
+        {"2025-01-01": 0.0},
+        {"2025-01-01": 20.0},
+    ]
+    assert [row["utilization"] for row in after] == [
+        {"2025-01-01": 40.0},
+        {"2025-01-01": 20.0},
+    ]
+    assert stored == 2
+
+
+def test_utilization_matrix_tool_builds_analytics_store_lazily(mcp_tools):
+    service = mcp_tools.allocation_service
+    assert service._columnar is None
+    asyncio.run(mcp_tools.get_utilization_matrix("2025-01-01", "2025-01-07"))
+    store = service._columnar
+    assert store is not None
+    asyncio.run(mcp_tools.get_utilization_matrix("2025-01-01", "2025-01-07"))
+    assert service._columnar is store
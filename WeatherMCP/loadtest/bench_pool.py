@@ -0,0 +1,102 @@
+"""
+Benchmark NWS request latency with and without the shared connection pool.
+
+Fetches the same forecast from the local replay server through the pooled
+NwsClient and through a new httpx.AsyncClient per request, the way
+make_nws_request worked before the pool. The replay server is plain HTTP
+on localhost, so the numbers only include the TCP handshake saved per
+request; against api.weather.gov the TLS handshake widens the gap.
+Run it from the WeatherMCP directory:
+
+    python -m loadtest.bench_pool --requests 500 --concurrency 1 10
+"""
+
+import argparse
+import asyncio
+import time
+import httpx
+from loadtest.fake_nws import FakeNwsServer, ReplayConfig
+from loadtest.run import percentile
+from nws.client import NwsClient
+from nws.rate_limit import TokenBucket
+
+
+USER_AGENT = "weather-app/1.0"
+
+
+async def unpooled_get(url: str) -> None:
+    """One request on a fresh client, as before the shared pool."""
+    headers = {"User-Agent": USER_AGENT, "Accept": "application/geo+json"}
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url, headers=headers, timeout=30.0)
+        response.raise_for_status()
+
+
+async def measure(
+    get, url: str, requests: int, concurrency: int
+) -> list[float]:
+    """Latency in seconds of each request, made by concurrent workers."""
+    latencies: list[float] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await get(url)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(latencies)
+
+
+async def run(requests: int, concurrency_levels: list[int], latency: float) -> None:
+    server = FakeNwsServer(config=ReplayConfig(latency=latency, jitter=0))
+    server.start()
+    url = f"{server.base_url}/gridpoints/OKX/4240,5228/forecast"
+    # No rate limiting, so only connection handling differs
+    client = NwsClient(USER_AGENT, rate_limiter=TokenBucket(rate=0))
+
+    async def pooled_get(url: str) -> None:
+        response = await client.get(url)
+        response.raise_for_status()
+
+    try:
+        # Warm up both paths so imports and the first connection are not timed
+        await pooled_get(url)
+        await unpooled_get(url)
+
+        print(f"{'client':<10}{'workers':>8}{'req/s':>9}{'mean ms':>9}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}")
+        for concurrency in concurrency_levels:
+            for name, get in (("unpooled", unpooled_get), ("pooled", pooled_get)):
+                started = time.perf_counter()
+                latencies = await measure(get, url, requests, concurrency)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{name:<10}{concurrency:>8}{requests / elapsed:>9.0f}"
+                    f"{sum(latencies) / len(latencies) * 1000:>9.2f}"
+                    f"{percentile(latencies, 0.50) * 1000:>8.2f}"
+                    f"{percentile(latencies, 0.95) * 1000:>8.2f}"
+                    f"{percentile(latencies, 0.99) * 1000:>8.2f}"
+                )
+    finally:
+        await client.aclose()
+        server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500, help="requests per run")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 10], help="concurrent workers per run"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0, help="replay server latency in ms"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.latency / 1000))
+
+
+if __name__ == "__main__":
+    main()
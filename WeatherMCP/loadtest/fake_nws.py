@@ -0,0 +1,330 @@
+"""
+Local stand-in for the NWS API that replays recorded responses.
+
+Serves /points, /gridpoints/.../forecast and /alerts/active from the JSON
+fixtures next to this file, with configurable latency, error rate and
+caching headers, so weather.py can be load tested without touching
+api.weather.gov. Run it directly to serve in the foreground:
+
+    python -m loadtest.fake_nws --port 8081 --latency 80 --error-rate 0.01
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Size of a replayed forecast grid cell in degrees, about 2.5 km like the real grid
+CELL_DEGREES = 0.025
+
+POINTS_PATH = re.compile(r"^/points/(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)$")
+FORECAST_PATH = re.compile(r"^/gridpoints/([A-Z]{3})/(\d+),(\d+)/forecast$")
+ALERTS_PATH = re.compile(r"^/alerts/active/area/([A-Z]{2})$")
+
+
+def load_fixture(name: str) -> dict[str, Any]:
+    """Load a recorded response from the fixtures directory."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ReplayConfig:
+    """Latency, failure and caching behaviour of the fake server."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: float | None = None,
+        max_age: int = 60,
+        alert_count: int | None = None,
+    ):
+        """
+        Initialize the configuration.
+
+        Args:
+            latency: Mean seconds added before each response.
+            jitter: Maximum seconds added or removed from the latency at random.
+            error_rate: Fraction of requests answered with error_status.
+            error_status: HTTP status of injected errors.
+            retry_after: Retry-After seconds sent with injected errors, if any.
+            max_age: Cache-Control max-age of successful responses.
+            alert_count: Repeat the recorded alerts up to this many features.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.max_age = max_age
+        self.alert_count = alert_count
+
+
+class FakeNwsServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server replaying NWS fixtures.
+
+    Points responses map each coordinate to a grid cell of CELL_DEGREES,
+    and forecasts carry that cell's polygon, so weather.py resolves and
+    caches grid points the same way it does against the real API.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, port: int = 0, config: ReplayConfig | None = None):
+        """
+        Bind the server.
+
+        Args:
+            port: Port to listen on, 0 for any free port.
+            config: Latency, failure and caching behaviour.
+        """
+        super().__init__(("127.0.0.1", port), ReplayHandler)
+        self.config = config or ReplayConfig()
+        self.points = load_fixture("points")
+        self.forecast = load_fixture("forecast")
+        self.alerts = load_fixture("alerts")
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.counts: dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        """The URL to use as NWS_API_BASE."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def handle_error(self, request, client_address) -> None:
+        """Ignore clients that hang up mid-response, e.g. after a timeout."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def count(self, name: str) -> None:
+        """Increment a request counter."""
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def stats(self) -> dict[str, int]:
+        """Return the request counters."""
+        with self._lock:
+            return dict(self.counts)
+
+    def points_body(self, latitude: float, longitude: float) -> dict[str, Any]:
+        """Build the /points response for a coordinate."""
+        grid_x, grid_y = cell_for(latitude, longitude)
+        body = copy.deepcopy(self.points)
+        properties = body["properties"]
+        grid_url = f"{self.base_url}/gridpoints/{properties['gridId']}/{grid_x},{grid_y}"
+        body["id"] = properties["@id"] = f"{self.base_url}/points/{latitude},{longitude}"
+        body["geometry"]["coordinates"] = [longitude, latitude]
+        properties.update(
+            {
+                "gridX": grid_x,
+                "gridY": grid_y,
+                "forecast": f"{grid_url}/forecast",
+                "forecastHourly": f"{grid_url}/forecast/hourly",
+                "forecastGridData": grid_url,
+                "observationStations": f"{grid_url}/stations",
+            }
+        )
+        return body
+
+    def forecast_body(self, grid_x: int, grid_y: int) -> dict[str, Any]:
+        """Build the forecast response for a grid cell."""
+        west = grid_x * CELL_DEGREES - 180
+        south = grid_y * CELL_DEGREES - 90
+        east, north = west + CELL_DEGREES, south + CELL_DEGREES
+        body = dict(self.forecast)
+        body["geometry"] = {
+            "type": "Polygon",
+            "coordinates": [
+                [[west, south], [east, south], [east, north], [west, north], [west, south]]
+            ],
+        }
+        return body
+
+    def alerts_body(self, state: str) -> dict[str, Any]:
+        """Build the active alerts response for a state."""
+        body = dict(self.alerts)
+        features = body["features"]
+        if self.config.alert_count is not None and features:
+            repeats = math.ceil(self.config.alert_count / len(features))
+            features = (features * repeats)[: self.config.alert_count]
+        body["features"] = features
+        body["title"] = f"Current watches, warnings, and advisories for {state}"
+        return body
+
+
+def cell_for(latitude: float, longitude: float) -> tuple[int, int]:
+    """Return the replayed grid cell containing a coordinate."""
+    return (
+        math.floor((longitude + 180) / CELL_DEGREES),
+        math.floor((latitude + 90) / CELL_DEGREES),
+    )
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Answers one request against the fixtures of a FakeNwsServer."""
+
+    server: FakeNwsServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle's
+    # algorithm and delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Route a GET request."""
+        path = self.path.split("?", 1)[0]
+        if path == "/_stats":
+            self.send_json(200, self.server.stats(), cache=False)
+            return
+
+        config = self.server.config
+        delay = config.latency + random.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if match := POINTS_PATH.match(path):
+            name = "points"
+            build = partial(
+                self.server.points_body, float(match.group(1)), float(match.group(2))
+            )
+        elif match := FORECAST_PATH.match(path):
+            name = "forecast"
+            build = partial(
+                self.server.forecast_body, int(match.group(2)), int(match.group(3))
+            )
+        elif match := ALERTS_PATH.match(path):
+            name = "alerts"
+            build = partial(self.server.alerts_body, match.group(1))
+        else:
+            self.server.count("notFound")
+            self.send_json(404, {"title": "Not Found", "status": 404}, cache=False)
+            return
+
+        self.server.count(name)
+        if random.random() < config.error_rate:
+            self.server.count("errors")
+            headers = {}
+            if config.retry_after is not None:
+                headers["Retry-After"] = str(config.retry_after)
+            body = {"title": "Service Unavailable", "status": config.error_status}
+            self.send_json(config.error_status, body, cache=False, headers=headers)
+            return
+
+        self.send_json(200, build())
+
+    def send_json(
+        self,
+        status: int,
+        data: Any,
+        cache: bool = True,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Send a JSON body, answering 304 when the client's ETag still matches."""
+        body = json.dumps(data).encode()
+        response_headers = dict(headers or {})
+        if cache:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            response_headers["ETag"] = etag
+            response_headers["Cache-Control"] = f"public, max-age={self.server.config.max_age}"
+            if self.headers.get("If-None-Match") == etag:
+                self.server.count("notModified")
+                self.send_response(304)
+                for key, value in response_headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/geo+json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in response_headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence the per-request access log."""
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay recorded NWS API responses locally.")
+    add_replay_arguments(parser)
+    parser.add_argument("--port", type=int, default=8081, help="port to listen on")
+    return parser.parse_args(argv)
+
+
+def add_replay_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the ReplayConfig options to a command line parser."""
+    parser.add_argument("--latency", type=float, default=50, help="mean response latency in ms")
+    parser.add_argument("--jitter", type=float, default=20, help="random latency spread in ms")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of requests that fail"
+    )
+    parser.add_argument("--error-status", type=int, default=503, help="status of injected errors")
+    parser.add_argument(
+        "--retry-after", type=float, default=None, help="Retry-After seconds on injected errors"
+    )
+    parser.add_argument("--max-age", type=int, default=60, help="Cache-Control max-age in seconds")
+    parser.add_argument(
+        "--alerts", type=int, default=None, help="repeat the recorded alerts to this many features"
+    )
+
+
+def replay_config(args: argparse.Namespace) -> ReplayConfig:
+    """Build a ReplayConfig from parsed add_replay_arguments() options."""
+    return ReplayConfig(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        max_age=args.max_age,
+        alert_count=args.alerts,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    server = FakeNwsServer(args.port, replay_config(args))
+    print(f"Replaying NWS fixtures at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
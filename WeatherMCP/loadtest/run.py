@@ -0,0 +1,260 @@
+"""
+Load generator for the weather MCP server.
+
+Starts weather.py over stdio against a local replay of the NWS API (or any
+URL given with --nws-url), drives get_forecast and get_alerts from
+concurrent workers, and reports throughput and p50/p95/p99 latency per
+tool. Run it from the WeatherMCP directory:
+
+    python -m loadtest.run --requests 2000 --concurrency 20 --latency 80
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from loadtest.fake_nws import FakeNwsServer, add_replay_arguments, replay_config
+
+
+SERVER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "weather.py"
+)
+
+# Tool results starting with this mean the call could not be answered
+FAILURE_PREFIX = "Unable to fetch"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], failures: int, elapsed: float) -> dict[str, Any]:
+    """Summarize the latencies, in seconds, of one group of calls."""
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "failed": failures,
+        "throughput": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "p50Ms": percentile(ordered, 0.50) * 1000,
+        "p95Ms": percentile(ordered, 0.95) * 1000,
+        "p99Ms": percentile(ordered, 0.99) * 1000,
+        "maxMs": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+
+class Workload:
+    """Picks the next tool call, mixing forecasts near major cities with state alerts."""
+
+    def __init__(
+        self,
+        cities: list[dict[str, Any]],
+        states: list[dict[str, str]],
+        alerts_ratio: float,
+        spread_km: float,
+        seed: int | None = None,
+    ):
+        """
+        Initialize the workload.
+
+        Args:
+            cities: Cities from the server's majorcities-coords resource.
+            states: States from the server's state-codes resource.
+            alerts_ratio: Fraction of calls that are get_alerts.
+            spread_km: Forecast coordinates are scattered this far around a city.
+            seed: Random seed, for repeatable runs.
+        """
+        self.cities = cities
+        self.states = states
+        self.alerts_ratio = alerts_ratio
+        self.spread_km = spread_km
+        self.random = random.Random(seed)
+
+    def next_call(self) -> tuple[str, dict[str, Any]]:
+        """Return the name and arguments of the next tool call."""
+        if self.states and self.random.random() < self.alerts_ratio:
+            return "get_alerts", {"state": self.random.choice(self.states)["code"]}
+
+        city = self.random.choice(self.cities)
+        # 1 degree of latitude is about 111 km; round like a client would
+        offset = self.spread_km / 111
+        latitude = city["latitude"] + self.random.uniform(-offset, offset)
+        longitude = city["longitude"] + self.random.uniform(-offset, offset) / max(
+            math.cos(math.radians(city["latitude"])), 0.1
+        )
+        return "get_forecast", {
+            "latitude": round(latitude, 4),
+            "longitude": round(longitude, 4),
+        }
+
+
+async def read_resource(session: ClientSession, uri: str) -> dict[str, Any]:
+    """Read a JSON resource from the server."""
+    result = await session.read_resource(uri)
+    return json.loads(result.contents[0].text)
+
+
+async def call_tool(session: ClientSession, name: str, arguments: dict[str, Any]) -> bool:
+    """Call a tool, returning whether it produced a usable answer."""
+    result = await session.call_tool(name, arguments)
+    if result.isError:
+        return False
+    text = result.content[0].text if result.content else ""
+    return not text.startswith(FAILURE_PREFIX)
+
+
+async def drive(session: ClientSession, args: argparse.Namespace) -> dict[str, Any]:
+    """Run the configured load against an initialized session."""
+    cities = (await read_resource(session, "weather://majorcities-coords"))["cities"]
+    states = (await read_resource(session, "weather://state-codes"))["states"]
+    workload = Workload(cities, states, args.alerts_ratio, args.spread_km, args.seed)
+
+    for _ in range(args.warmup):
+        await call_tool(session, *workload.next_call())
+
+    latencies: dict[str, list[float]] = {}
+    failures: dict[str, int] = {}
+    remaining = args.requests
+    deadline = time.monotonic() + args.duration if args.duration else None
+
+    async def worker() -> None:
+        nonlocal remaining
+        while True:
+            if deadline is not None:
+                if time.monotonic() >= deadline:
+                    return
+            elif remaining <= 0:
+                return
+            remaining -= 1
+
+            name, arguments = workload.next_call()
+            started = time.perf_counter()
+            try:
+                ok = await call_tool(session, name, arguments)
+            except Exception:
+                ok = False
+            latencies.setdefault(name, []).append(time.perf_counter() - started)
+            if not ok:
+                failures[name] = failures.get(name, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    every = [latency for group in latencies.values() for latency in group]
+    return {
+        "elapsed": elapsed,
+        "concurrency": args.concurrency,
+        "overall": summarize(every, sum(failures.values()), elapsed),
+        "tools": {
+            name: summarize(group, failures.get(name, 0), elapsed)
+            for name, group in sorted(latencies.items())
+        },
+        "metrics": await read_resource(session, "weather://metrics"),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Start the replay server and weather.py, then run the load."""
+    replay = None
+    nws_url = args.nws_url
+    if nws_url is None:
+        replay = FakeNwsServer(config=replay_config(args))
+        replay.start()
+        nws_url = replay.base_url
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ)
+            env["NWS_API_BASE"] = nws_url
+            # Start every run with cold grid points instead of the user's cache
+            env["NWS_GRID_CACHE_PATH"] = os.path.join(directory, "gridpoints.db")
+            parameters = StdioServerParameters(
+                command=sys.executable,
+                args=[SERVER_SCRIPT],
+                env=env,
+                cwd=os.path.dirname(SERVER_SCRIPT),
+            )
+            async with stdio_client(parameters) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    report = await drive(session, args)
+    finally:
+        if replay is not None:
+            replay.stop()
+
+    report["nwsUrl"] = nws_url
+    if replay is not None:
+        report["upstream"] = replay.stats()
+    return report
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Print a human-readable summary of a run."""
+    overall = report["overall"]
+    print(
+        f"{overall['count']} calls in {report['elapsed']:.2f}s with "
+        f"{report['concurrency']} workers: {overall['throughput']:.1f} calls/s, "
+        f"{overall['failed']} failed"
+    )
+    print(
+        f"{'tool':<14}{'calls':>8}{'failed':>8}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    )
+    rows = list(report["tools"].items()) + [("all", overall)]
+    for name, summary in rows:
+        print(
+            f"{name:<14}{summary['count']:>8}{summary['failed']:>8}"
+            f"{summary['p50Ms']:>10.1f}{summary['p95Ms']:>10.1f}"
+            f"{summary['p99Ms']:>10.1f}{summary['maxMs']:>10.1f}"
+        )
+    if "upstream" in report:
+        upstream = ", ".join(f"{name}={count}" for name, count in sorted(report["upstream"].items()))
+        print(f"Upstream NWS requests: {upstream}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the weather MCP server over stdio.")
+    parser.add_argument("--requests", type=int, default=500, help="total tool calls to make")
+    parser.add_argument(
+        "--duration", type=float, default=None, help="run for this many seconds instead"
+    )
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent workers")
+    parser.add_argument("--warmup", type=int, default=0, help="untimed calls made first")
+    parser.add_argument(
+        "--alerts-ratio", type=float, default=0.2, help="fraction of calls that are get_alerts"
+    )
+    parser.add_argument(
+        "--spread-km", type=float, default=5, help="scatter forecast coordinates around cities"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="random seed for the workload")
+    parser.add_argument(
+        "--nws-url", default=None, help="use this NWS API instead of the local replay server"
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    add_replay_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
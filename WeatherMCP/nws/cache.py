@@ -0,0 +1,334 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any
+import httpx
+from nws.shared_cache import SharedCache, SharedEntry
+
+
+# Cache size and the freshness used when a response carries no caching headers
+CACHE_MAX_ENTRIES = int(os.environ.get("NWS_CACHE_MAX_ENTRIES", "512"))
+CACHE_DEFAULT_TTL = float(os.environ.get("NWS_CACHE_DEFAULT_TTL", "60"))
+
+# Stale-while-revalidate: serve expired entries up to MAX_STALENESS seconds
+# past expiry while they are refreshed in the background
+STALE_WHILE_REVALIDATE = os.environ.get("NWS_STALE_WHILE_REVALIDATE", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+MAX_STALENESS = float(os.environ.get("NWS_MAX_STALENESS", "600"))
+
+
+def _parse_cache_control(value: str) -> dict[str, str | None]:
+    """Split a Cache-Control header into lower-cased directives."""
+    directives: dict[str, str | None] = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def freshness_lifetime(response: httpx.Response, default_ttl: float) -> float | None:
+    """
+    Work out how long a response may be served from cache.
+
+    Cache-Control max-age (less the Age header) takes precedence over Expires.
+    Responses without either header fall back to default_ttl.
+
+    Args:
+        response: The NWS response.
+        default_ttl: Seconds to use when the response has no caching headers.
+
+    Returns:
+        Seconds the response stays fresh, or None if it must not be stored.
+    """
+    directives = _parse_cache_control(response.headers.get("Cache-Control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            age = float(response.headers.get("Age", "0"))
+        except ValueError:
+            age = 0.0
+        try:
+            return max(float(max_age) - age, 0.0)
+        except ValueError:
+            return 0.0
+
+    expires = response.headers.get("Expires")
+    if expires is not None:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+            date = response.headers.get("Date")
+            now = parsedate_to_datetime(date) if date else None
+        except (TypeError, ValueError):
+            return 0.0
+        if now is None or now.tzinfo is None or expires_at.tzinfo is None:
+            return max(expires_at.timestamp() - time.time(), 0.0)
+        return max((expires_at - now).total_seconds(), 0.0)
+
+    return default_ttl
+
+
+class CacheEntry:
+    """A cached NWS response body, when it stops being fresh and its validators."""
+
+    __slots__ = ("data", "stored_at", "expires_at", "etag", "last_modified")
+
+    def __init__(
+        self,
+        data: Any,
+        stored_at: float,
+        expires_at: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ):
+        self.data = data
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self, now: float) -> bool:
+        """Check whether the entry can still be served without asking NWS."""
+        return now < self.expires_at
+
+    def age(self, now: float) -> float:
+        """Seconds since the entry was fetched or last revalidated."""
+        return now - self.stored_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers that let NWS answer 304 Not Modified for this entry."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    In-process cache of parsed NWS responses keyed by URL.
+
+    Entries expire according to the response's Cache-Control/Expires
+    headers and the least recently used entry is evicted once max_entries
+    is reached. Expired entries are kept until evicted so their ETag and
+    Last-Modified validators can be used for conditional requests. Hit and
+    miss counters are kept for the metrics resource.
+
+    With a SharedCache, entries are also written to disk, and load() copies
+    a fresher entry from disk before a request so a fetch by one process
+    serves the others. All disk access runs in a worker thread, so SQLite's
+    busy timeout and (de)compression never block the event loop, and get(),
+    get_stale() and get_entry() only read the in-process entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        default_ttl: float = CACHE_DEFAULT_TTL,
+        shared: SharedCache | None = None,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.shared = shared
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+        self.stale_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def load(self, url: str) -> None:
+        """
+        Copy a URL's entry from the shared cache if it is fresher than the local one.
+
+        Does nothing without a shared cache or when the local entry is still
+        fresh. Call it once per request, before get(), get_stale() or
+        get_entry(), since each call may read the database.
+
+        Args:
+            url: The requested NWS URL.
+        """
+        entry = self._entries.get(url)
+        if self.shared is None or (entry is not None and entry.is_fresh(time.monotonic())):
+            return
+
+        shared_entry = await asyncio.to_thread(self.shared.get, url)
+        if shared_entry is None:
+            return
+        loaded = self._from_shared(shared_entry)
+        # Another request may have stored a newer copy while the database was read
+        entry = self._entries.get(url)
+        if entry is None or loaded.expires_at > entry.expires_at:
+            self._put(url, loaded)
+
+    def get(self, url: str) -> Any | None:
+        """
+        Return the cached body for a URL if it is still fresh.
+
+        Args:
+            url: The requested NWS URL.
+
+        Returns:
+            The parsed response body, or None on a miss.
+        """
+        entry = self._entries.get(url)
+        if entry is None or not entry.is_fresh(time.monotonic()):
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(url)
+        self.hits += 1
+        return entry.data
+
+    def get_entry(self, url: str) -> CacheEntry | None:
+        """
+        Return the entry for a URL whether or not it is still fresh.
+
+        Args:
+            url: The requested NWS URL.
+
+        Returns:
+            The cache entry, or None if the URL is not cached.
+        """
+        return self._entries.get(url)
+
+    def get_stale(self, url: str, max_staleness: float) -> CacheEntry | None:
+        """
+        Return an expired entry that may still be served while it is refreshed.
+
+        Args:
+            url: The requested NWS URL.
+            max_staleness: Seconds past expiry an entry may still be served.
+
+        Returns:
+            The cache entry, or None if it is missing or too stale.
+        """
+        entry = self._entries.get(url)
+        if entry is None or time.monotonic() - entry.expires_at > max_staleness:
+            return None
+
+        self._entries.move_to_end(url)
+        self.stale_hits += 1
+        return entry
+
+    async def store(self, url: str, response: httpx.Response, data: Any) -> None:
+        """
+        Cache a parsed response body if its headers allow it.
+
+        Args:
+            url: The requested NWS URL.
+            response: The response the body was parsed from.
+            data: The parsed response body.
+        """
+        lifetime = freshness_lifetime(response, self.default_ttl)
+        if lifetime is None or self.max_entries <= 0:
+            self._entries.pop(url, None)
+            return
+
+        now = time.monotonic()
+        entry = CacheEntry(
+            data,
+            now,
+            now + lifetime,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        self._put(url, entry)
+        await self._write_shared(url, entry)
+
+    async def revalidate(self, url: str, entry: CacheEntry, response: httpx.Response) -> Any:
+        """
+        Refresh an entry after NWS answered a conditional request with 304.
+
+        The cached body is kept and its freshness is recomputed from the
+        304 response headers, so nothing is downloaded or parsed again.
+
+        Args:
+            url: The requested NWS URL.
+            entry: The entry the conditional request was built from.
+            response: The 304 Not Modified response.
+
+        Returns:
+            The cached response body.
+        """
+        lifetime = freshness_lifetime(response, self.default_ttl)
+        now = time.monotonic()
+        entry.stored_at = now
+        entry.expires_at = now + (lifetime or 0.0)
+        entry.etag = response.headers.get("ETag", entry.etag)
+        entry.last_modified = response.headers.get("Last-Modified", entry.last_modified)
+        self.revalidations += 1
+
+        if lifetime is None:
+            self._entries.pop(url, None)
+        else:
+            self._put(url, entry)
+            await self._write_shared(url, entry)
+        return entry.data
+
+    def _from_shared(self, shared_entry: SharedEntry) -> CacheEntry:
+        """Convert a shared entry's wall-clock timestamps to the monotonic clock."""
+        offset = time.monotonic() - time.time()
+        return CacheEntry(
+            shared_entry.data,
+            shared_entry.stored_at + offset,
+            shared_entry.expires_at + offset,
+            shared_entry.etag,
+            shared_entry.last_modified,
+        )
+
+    async def _write_shared(self, url: str, entry: CacheEntry) -> None:
+        """Copy an entry to the shared cache, if there is one."""
+        if self.shared is None:
+            return
+        offset = time.time() - time.monotonic()
+        await asyncio.to_thread(
+            self.shared.set,
+            url,
+            entry.data,
+            entry.stored_at + offset,
+            entry.expires_at + offset,
+            entry.etag,
+            entry.last_modified,
+        )
+
+    def _put(self, url: str, entry: CacheEntry) -> None:
+        """Insert an entry as most recently used and evict beyond max_entries."""
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache counters."""
+        stats = {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+            "staleHits": self.stale_hits,
+        }
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
@@ -0,0 +1,107 @@
+import os
+import time
+
+
+# Consecutive failures that open the breaker, and how long it stays open
+FAILURE_THRESHOLD = int(os.environ.get("NWS_BREAKER_FAILURE_THRESHOLD", "5"))
+RECOVERY_TIMEOUT = float(os.environ.get("NWS_BREAKER_RECOVERY_TIMEOUT", "30"))
+HALF_OPEN_MAX_CALLS = int(os.environ.get("NWS_BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling NWS while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to the NWS API.
+
+    The breaker opens after failure_threshold consecutive failures, and
+    calls then fail fast instead of waiting on a struggling upstream. After
+    recovery_timeout it turns half-open and lets up to half_open_max_calls
+    probe calls through. A successful probe closes it again and a failed
+    probe reopens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        recovery_timeout: float = RECOVERY_TIMEOUT,
+        half_open_max_calls: int = HALF_OPEN_MAX_CALLS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(half_open_max_calls, 1)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """The current state, moving from open to half-open once the timeout passes."""
+        recovered = time.monotonic() - self._opened_at >= self.recovery_timeout
+        if self._state == OPEN and recovered:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go to NWS, reserving a probe slot when half-open.
+
+        Every allowed call must be followed by record_success(),
+        record_failure() or release().
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a call that NWS answered, closing the breaker."""
+        self._state = CLOSED
+        self._failures = 0
+        self._probes = 0
+
+    def record_failure(self) -> None:
+        """Record a failed or timed-out call, opening the breaker if needed."""
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self.opens += 1
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self._probes = 0
+
+    def release(self) -> None:
+        """
+        Give back the probe slot of an allowed call that ended without an outcome.
+
+        Use this when the call was cancelled or failed for a reason that says
+        nothing about NWS, so a later call can still probe.
+        """
+        if self._state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def stats(self) -> dict[str, str | int | float]:
+        """Return the breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutiveFailures": self._failures,
+            "failureThreshold": self.failure_threshold,
+            "recoveryTimeout": self.recovery_timeout,
+            "opens": self.opens,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,314 @@
+import asyncio
+import importlib.util
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import httpx
+from nws.circuit_breaker import CircuitBreaker, CircuitOpenError
+from nws.rate_limit import (
+    MAX_RETRIES,
+    MAX_RETRY_AFTER,
+    RETRYABLE_STATUS_CODES,
+    RetryBudget,
+    TokenBucket,
+    backoff_delay,
+    retry_after_seconds,
+)
+
+
+# Connection pool limits, overridable through the environment
+MAX_CONNECTIONS = int(os.environ.get("NWS_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("NWS_MAX_KEEPALIVE_CONNECTIONS", "10"))
+KEEPALIVE_EXPIRY = float(os.environ.get("NWS_KEEPALIVE_EXPIRY", "30"))
+REQUEST_TIMEOUT = float(os.environ.get("NWS_REQUEST_TIMEOUT", "30"))
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class NotFoundError(Exception):
+    """Raised when NWS answers 404 for a URL the caller expected to exist."""
+
+
+class ServiceBusyError(Exception):
+    """Raised when NWS asks to wait longer than the client's max_retry_after."""
+
+    def __init__(self, url: str, retry_after: float):
+        super().__init__(f"NWS is busy, retry after {retry_after:.0f} seconds ({url})")
+        self.retry_after = retry_after
+
+
+class NwsClient:
+    """
+    Long-lived, connection-pooled HTTP client for the NWS API.
+
+    The underlying httpx.AsyncClient is created on first use and reused for
+    every request, so keep-alive connections (and HTTP/2 when available)
+    avoid a new TCP and TLS handshake per tool call. Call aclose() on
+    shutdown to release the pool.
+
+    Every attempt takes a token from a shared rate limiter. Transport errors
+    and throttling or server errors are retried with jittered exponential
+    backoff while the retry budget allows, waiting at least as long as any
+    Retry-After header asks. A Retry-After longer than max_retry_after fails
+    the call straight away with ServiceBusyError rather than holding it and
+    every other caller back. Timeouts are not retried, since the attempt
+    already waited the full timeout.
+
+    With a circuit breaker, every attempt (not just every call) is recorded
+    on it, and an attempt is only made while the breaker lets it through, so
+    a failing upstream opens the breaker within a few attempts and stops the
+    remaining retries.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        timeout: float = REQUEST_TIMEOUT,
+        http2: bool = HTTP2_AVAILABLE,
+        rate_limiter: TokenBucket | None = None,
+        retry_budget: RetryBudget | None = None,
+        max_retries: int = MAX_RETRIES,
+        max_retry_after: float = MAX_RETRY_AFTER,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.user_agent = user_agent
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self.rate_limiter = rate_limiter if rate_limiter is not None else TokenBucket()
+        self.retry_budget = retry_budget if retry_budget is not None else RetryBudget()
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self.breaker = breaker
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared httpx client, created on first access."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={
+                    "User-Agent": self.user_agent,
+                    "Accept": "application/geo+json",
+                },
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+        return self._client
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        """
+        Send a GET request over the pooled connection, retrying transient failures.
+
+        Args:
+            url: The URL to fetch.
+            headers: Optional extra request headers.
+
+        Returns:
+            The last response received. Retryable status codes are returned
+            once retries are exhausted or the circuit breaker opens.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the first attempt.
+            ServiceBusyError: If NWS asks to wait longer than max_retry_after.
+            httpx.TransportError: If the last attempt failed without a response.
+        """
+        self._allow_first_attempt()
+        self.retry_budget.deposit()
+        attempt = 0
+        # Whether the breaker let an attempt through that isn't recorded yet
+        pending = True
+        try:
+            while True:
+                await self.rate_limiter.acquire()
+                try:
+                    response = await self.client.get(url, headers=headers)
+                except httpx.TransportError as e:
+                    self._record(error=e)
+                    pending = False
+                    delay = self._retry_delay(url, attempt, error=e)
+                    if delay is None:
+                        raise
+                else:
+                    self._record(response=response)
+                    pending = False
+                    delay = self._retry_delay(url, attempt, response=response)
+                    if delay is None:
+                        return response
+
+                pending = True
+                attempt += 1
+                await asyncio.sleep(delay)
+        finally:
+            if pending:
+                self._release()
+
+    @asynccontextmanager
+    async def stream(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a GET request and yield the response before its body is read.
+
+        Rate limiting and retries apply until the response headers arrive.
+        Once the response is yielded the caller reads the body itself, and a
+        failure while reading it is not retried.
+
+        Args:
+            url: The URL to fetch.
+            headers: Optional extra request headers.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the first attempt.
+            ServiceBusyError: If NWS asks to wait longer than max_retry_after.
+            httpx.TransportError: If the last attempt failed without a response.
+        """
+        self._allow_first_attempt()
+        self.retry_budget.deposit()
+        attempt = 0
+        # Whether the breaker let an attempt through that isn't recorded yet
+        pending = True
+        try:
+            while True:
+                await self.rate_limiter.acquire()
+                request = self.client.build_request("GET", url, headers=headers)
+                try:
+                    response = await self.client.send(request, stream=True)
+                except httpx.TransportError as e:
+                    self._record(error=e)
+                    pending = False
+                    delay = self._retry_delay(url, attempt, error=e)
+                    if delay is None:
+                        raise
+                else:
+                    self._record(response=response)
+                    pending = False
+                    try:
+                        delay = self._retry_delay(url, attempt, response=response)
+                    except ServiceBusyError:
+                        await response.aclose()
+                        raise
+                    if delay is None:
+                        break
+                    await response.aclose()
+
+                pending = True
+                attempt += 1
+                await asyncio.sleep(delay)
+        finally:
+            if pending:
+                self._release()
+
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Return the rate limiter and retry budget counters."""
+        return {
+            "rateLimiter": self.rate_limiter.stats(),
+            "retryBudget": self.retry_budget.stats(),
+        }
+
+    def _allow_first_attempt(self) -> None:
+        """Raise CircuitOpenError unless the circuit breaker lets a call through."""
+        if self.breaker is not None and not self.breaker.allow_request():
+            raise CircuitOpenError(f"NWS circuit breaker is {self.breaker.state}")
+
+    def _allow_retry(self, url: str) -> bool:
+        """Check whether the circuit breaker lets a retry through."""
+        if self.breaker is None or self.breaker.allow_request():
+            return True
+        logging.warning(f"NWS circuit breaker is {self.breaker.state}, not retrying {url}")
+        return False
+
+    def _release(self) -> None:
+        """Give back a probe slot for an attempt that never got an outcome."""
+        if self.breaker is not None:
+            self.breaker.release()
+
+    def _record(
+        self, response: httpx.Response | None = None, error: Exception | None = None
+    ) -> None:
+        """
+        Record an attempt on the circuit breaker.
+
+        Transport errors, throttling and server errors count against NWS;
+        any other response, including client errors, counts as a success.
+        """
+        if self.breaker is None:
+            return
+        if error is not None or response.status_code == 429 or response.is_server_error:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _retry_delay(
+        self,
+        url: str,
+        attempt: int,
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """
+        Decide whether to retry a failed attempt and how long to wait first.
+
+        Args:
+            url: The requested URL, for logging.
+            attempt: The 0-based attempt that just finished.
+            response: The response received, if any.
+            error: The transport error raised, if there was no response.
+
+        Returns:
+            Seconds to wait before the next attempt, or None to stop. The
+            breaker has let the next attempt through only when this returns
+            a delay.
+
+        Raises:
+            ServiceBusyError: If the response asks to wait longer than
+                max_retry_after.
+        """
+        if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        if isinstance(error, httpx.TimeoutException):
+            # The attempt already waited the full timeout; retrying multiplies it
+            logging.warning(f"NWS request to {url} timed out ({error!r})")
+            return None
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None and retry_after > self.max_retry_after:
+            logging.warning(f"NWS asked to retry {url} after {retry_after:.0f} seconds")
+            raise ServiceBusyError(url, retry_after)
+        if attempt >= self.max_retries or not self._allow_retry(url):
+            return None
+        if not self.retry_budget.withdraw():
+            self._release()
+            return None
+
+        if error is not None:
+            logging.warning(f"NWS request to {url} failed ({error!r}), retrying")
+            return backoff_delay(attempt)
+
+        logging.warning(f"NWS request to {url} returned {response.status_code}, retrying")
+        delay = backoff_delay(attempt)
+        if retry_after is not None:
+            # Throttling applies to everyone, so hold back all callers
+            self.rate_limiter.pause(retry_after)
+            delay = max(delay, retry_after)
+        return delay
+
+    async def aclose(self) -> None:
+        """Close the client and its connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
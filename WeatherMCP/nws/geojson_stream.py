@@ -0,0 +1,178 @@
+import json
+import re
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+# Characters that change the scanner's state outside and inside strings
+STRUCTURAL = re.compile(r'["{}\[\]]')
+STRING_SPECIAL = re.compile(r'["\\]')
+ARRAY_SEPARATOR = re.compile(r"[\s,]*")
+DECODER = json.JSONDecoder()
+
+# Marks the top-level "features" array on the container stack
+FEATURES = "features"
+
+
+class FeatureStreamParser:
+    """
+    Incremental parser for the features of a GeoJSON FeatureCollection.
+
+    Text is fed in chunks as it arrives. The parser only tracks nesting and
+    string boundaries until it reaches the top-level "features" array, then
+    decodes each feature as soon as all of its text has arrived. Only the
+    feature currently being read is buffered, so memory stays bounded by the
+    largest single feature rather than the whole payload.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._string_start = 0
+        self._element_start = -1
+        self._wait_for = 0
+        self._last_string: str | None = None
+        self.found_features = False
+        self.done = False
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        """
+        Add the next chunk of the response body.
+
+        Args:
+            text: The next piece of JSON text.
+
+        Returns:
+            The features completed by this chunk, in document order.
+
+        Raises:
+            ValueError: If the JSON is malformed.
+        """
+        # Drop everything already scanned except an unfinished string or feature
+        keep = self._pos
+        if self._in_string:
+            keep = min(keep, self._string_start)
+        if self._element_start >= 0:
+            keep = min(keep, self._element_start)
+            self._element_start -= keep
+        self._buffer = self._buffer[keep:] + text
+        self._pos -= keep
+        self._string_start -= keep
+
+        return self._scan()
+
+    def close(self) -> list[dict[str, Any]]:
+        """
+        Finish parsing once the whole body has been fed.
+
+        Returns:
+            Any features still waiting to be decoded.
+
+        Raises:
+            ValueError: If the body has no features array or ends inside it.
+        """
+        self._wait_for = 0
+        features = self._scan()
+        if not self.found_features:
+            raise ValueError("Response has no features array")
+        if not self.done:
+            raise ValueError("Response ended inside the features array")
+        return features
+
+    def _scan(self) -> list[dict[str, Any]]:
+        """Advance through the buffer, collecting completed features."""
+        features = []
+        buffer = self._buffer
+        length = len(buffer)
+
+        while self._pos < length:
+            if self._stack[-1:] == [FEATURES]:
+                self._pos = ARRAY_SEPARATOR.match(buffer, self._pos).end()
+                if self._pos >= length:
+                    break
+                if buffer[self._pos] == "]":
+                    self._stack.pop()
+                    self._pos += 1
+                    self.done = True
+                    continue
+
+                # Decode the next feature, or wait for the rest of its text.
+                # A feature that spans many chunks is retried only after the
+                # buffered text doubles, keeping large features linear.
+                pending = length - self._pos
+                if pending < self._wait_for:
+                    self._element_start = self._pos
+                    break
+                try:
+                    feature, self._pos = DECODER.raw_decode(buffer, self._pos)
+                except json.JSONDecodeError:
+                    self._element_start = self._pos
+                    self._wait_for = 2 * pending
+                    break
+                self._element_start = -1
+                self._wait_for = 0
+                if isinstance(feature, dict):
+                    features.append(feature)
+                continue
+
+            if self._in_string:
+                match = STRING_SPECIAL.search(buffer, self._pos)
+                if match is None:
+                    self._pos = length
+                    break
+                if match.group() == "\\":
+                    # Skip the escaped character, waiting for it if needed
+                    if match.end() >= length:
+                        self._pos = match.start()
+                        break
+                    self._pos = match.end() + 1
+                    continue
+
+                self._in_string = False
+                self._pos = match.end()
+                if self._stack == ["{"]:
+                    self._last_string = buffer[self._string_start + 1 : match.start()]
+                continue
+
+            match = STRUCTURAL.search(buffer, self._pos)
+            if match is None:
+                self._pos = length
+                break
+
+            char = match.group()
+            self._pos = match.end()
+            if char == '"':
+                self._in_string = True
+                self._string_start = match.start()
+            elif char == "[" and self._stack == ["{"] and self._last_string == FEATURES:
+                self._stack.append(FEATURES)
+                self.found_features = True
+            elif char in "{[":
+                self._stack.append(char)
+            else:
+                if not self._stack:
+                    raise ValueError("Unbalanced brackets in GeoJSON response")
+                self._stack.pop()
+
+        return features
+
+
+async def iter_features(chunks: AsyncIterator[str]) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yield the features of a streamed FeatureCollection as they are parsed.
+
+    Args:
+        chunks: The response body as text chunks, e.g. response.aiter_text().
+
+    Raises:
+        ValueError: If the body is malformed or has no features array.
+    """
+    parser = FeatureStreamParser()
+    async for chunk in chunks:
+        for feature in parser.feed(chunk):
+            yield feature
+
+    for feature in parser.close():
+        yield feature
@@ -0,0 +1,350 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from nws.spatial_index import SpatialIndex, point_in_ring
+
+
+# Where resolved grid points are kept between restarts, and for how long.
+# Every server process of the user shares the default file.
+GRID_CACHE_PATH = os.environ.get(
+    "NWS_GRID_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "weathermcp", "gridpoints.db"),
+)
+GRID_CACHE_MAX_AGE = float(os.environ.get("NWS_GRID_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+
+# NWS itself only resolves /points to four decimal places
+COORDINATE_PRECISION = 4
+
+# Coordinates are snapped to a resolved grid cell they fall inside. Cells are
+# 2.5 km squares, so only resolved points this close can share a cell.
+CELL_SEARCH_RADIUS_KM = 4.0
+# Optionally also snap to the nearest resolved point when no cell shape is known
+SNAP_RADIUS_KM = float(os.environ.get("NWS_SNAP_RADIUS_KM", "0"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS grid_points (
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    grid_id TEXT NOT NULL,
+    grid_x INTEGER NOT NULL,
+    grid_y INTEGER NOT NULL,
+    forecast_url TEXT NOT NULL,
+    resolved_at REAL NOT NULL,
+    PRIMARY KEY (latitude, longitude)
+);
+CREATE TABLE IF NOT EXISTS grid_cells (
+    forecast_url TEXT PRIMARY KEY,
+    ring TEXT NOT NULL
+);
+"""
+
+
+class GridPoint:
+    """The NWS forecast grid cell a coordinate resolves to."""
+
+    __slots__ = ("grid_id", "grid_x", "grid_y", "forecast_url")
+
+    def __init__(self, grid_id: str, grid_x: int, grid_y: int, forecast_url: str):
+        self.grid_id = grid_id
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.forecast_url = forecast_url
+
+
+class GridPointCache:
+    """
+    Persistent mapping from rounded coordinates to NWS grid points.
+
+    Resolving /points/{lat},{lon} is the first of the two requests a
+    forecast needs and its answer almost never changes, so it is kept in a
+    small SQLite file that survives restarts. Entries older than max_age
+    are resolved again.
+
+    Resolved points are also kept in a spatial index together with the
+    outline of their forecast grid cell, taken from the forecast response.
+    A new coordinate that falls inside a known cell reuses that cell's grid
+    point, so nearby coordinates share one cache key and one request.
+
+    Every process using the same file shares its grid points. The file is
+    in WAL mode and writers wait on a busy timeout, so all database access
+    runs through asyncio.to_thread() and a lock serializes it across worker
+    threads. The spatial index and counters are only touched on the event
+    loop.
+    """
+
+    def __init__(
+        self,
+        database_path: str = GRID_CACHE_PATH,
+        max_age: float = GRID_CACHE_MAX_AGE,
+        snap_radius_km: float = SNAP_RADIUS_KM,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            database_path: Path to the SQLite file, or ":memory:".
+            max_age: Seconds a resolved grid point stays valid.
+            snap_radius_km: Distance within which a coordinate is snapped to
+                        the nearest resolved point when no cell contains it
+                        (0 to only snap inside known cells).
+        """
+        self.database_path = database_path
+        self.max_age = max_age
+        self.snap_radius_km = snap_radius_km
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._index = SpatialIndex()
+        self._cells: dict[str, list[list[float]]] = {}
+        self.hits = 0
+        self.snaps = 0
+        self.misses = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The database connection, opened on first use. Blocks; hold the lock."""
+        if self._connection is None:
+            directory = os.path.dirname(self.database_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self.database_path, timeout=5.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    async def get(self, latitude: float, longitude: float) -> GridPoint | None:
+        """
+        Look up the grid point for a coordinate.
+
+        Args:
+            latitude: Latitude of the location.
+            longitude: Longitude of the location.
+
+        Returns:
+            The cached grid point, or None if it is unknown or too old.
+        """
+        await self._load_index()
+        key = self._key(latitude, longitude)
+        # Read the row itself too, since another process may have resolved it
+        row = await asyncio.to_thread(self._read_point, key)
+
+        if row is not None and time.time() - row[4] <= self.max_age:
+            grid_point = GridPoint(row[0], row[1], row[2], row[3])
+            self._index.add(key, *key, (grid_point, row[4]))
+            self.hits += 1
+            return grid_point
+
+        match = self._snap(*key)
+        if match is not None:
+            self.snaps += 1
+            return match[1]
+
+        self.misses += 1
+        return None
+
+    async def store(
+        self, latitude: float, longitude: float, properties: dict[str, Any]
+    ) -> GridPoint | None:
+        """
+        Remember the grid point from a /points response.
+
+        Args:
+            latitude: Latitude of the location.
+            longitude: Longitude of the location.
+            properties: The "properties" object of the /points response.
+
+        Returns:
+            The stored grid point, or None if the response lacked grid fields.
+        """
+        try:
+            grid_point = GridPoint(
+                properties["gridId"],
+                int(properties["gridX"]),
+                int(properties["gridY"]),
+                properties["forecast"],
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        await self._load_index()
+        key = self._key(latitude, longitude)
+        resolved_at = time.time()
+        self._index.add(key, *key, (grid_point, resolved_at))
+        await asyncio.to_thread(
+            self._write,
+            "INSERT OR REPLACE INTO grid_points "
+            "(latitude, longitude, grid_id, grid_x, grid_y, forecast_url, resolved_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    *key,
+                    grid_point.grid_id,
+                    grid_point.grid_x,
+                    grid_point.grid_y,
+                    grid_point.forecast_url,
+                    resolved_at,
+                )
+            ],
+        )
+        return grid_point
+
+    async def store_cell(self, forecast_url: str, geometry: dict[str, Any] | None) -> None:
+        """
+        Remember the outline of a forecast grid cell.
+
+        Args:
+            forecast_url: The forecast URL of the grid cell.
+            geometry: The GeoJSON geometry of the forecast response.
+        """
+        if forecast_url in self._cells or not geometry:
+            return
+        if geometry.get("type") != "Polygon" or not geometry.get("coordinates"):
+            return
+
+        await self._load_index()
+        ring = geometry["coordinates"][0]
+        self._cells[forecast_url] = ring
+        await asyncio.to_thread(
+            self._write,
+            "INSERT OR REPLACE INTO grid_cells (forecast_url, ring) VALUES (?, ?)",
+            [(forecast_url, json.dumps(ring))],
+        )
+
+    async def invalidate(self, latitude: float, longitude: float) -> None:
+        """Forget the grid point a coordinate resolves to so it is resolved again."""
+        await self._load_index()
+        keys = [self._key(latitude, longitude)]
+        match = self._snap(*keys[0])
+        if match is not None and match[0] != keys[0]:
+            keys.append(match[0])
+
+        for key in keys:
+            self._index.remove(key, *key)
+        await asyncio.to_thread(
+            self._write,
+            "DELETE FROM grid_points WHERE latitude = ? AND longitude = ?",
+            keys,
+        )
+
+    def stats(self) -> dict[str, int]:
+        """Return the lookup counters."""
+        return {
+            "points": len(self._index),
+            "cells": len(self._cells),
+            "hits": self.hits,
+            "snaps": self.snaps,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    async def _load_index(self) -> None:
+        """
+        Index the grid points and cells already stored in the database, once.
+
+        Every public method awaits this first, so nothing changes the index
+        before the stored rows are in it.
+        """
+        if self._loaded:
+            return
+        points, cells = await asyncio.to_thread(self._read_all)
+        if self._loaded:
+            return
+        self._loaded = True
+
+        for latitude, longitude, grid_id, grid_x, grid_y, forecast_url, resolved_at in points:
+            grid_point = GridPoint(grid_id, grid_x, grid_y, forecast_url)
+            key = (latitude, longitude)
+            self._index.add(key, latitude, longitude, (grid_point, resolved_at))
+        for forecast_url, ring in cells:
+            self._cells[forecast_url] = json.loads(ring)
+
+    def _read_all(self) -> tuple[list[tuple], list[tuple]]:
+        """Read the unexpired grid points and every cell. Blocks."""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            try:
+                points = self.connection.execute(
+                    "SELECT latitude, longitude, grid_id, grid_x, grid_y, forecast_url, "
+                    "resolved_at FROM grid_points WHERE resolved_at >= ?",
+                    (cutoff,),
+                ).fetchall()
+                cells = self.connection.execute(
+                    "SELECT forecast_url, ring FROM grid_cells"
+                ).fetchall()
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Error reading grid point cache: {e}")
+                return [], []
+        return points, cells
+
+    def _read_point(self, key: tuple[float, float]) -> tuple | None:
+        """Read the stored row for a rounded coordinate. Blocks."""
+        with self._lock:
+            try:
+                return self.connection.execute(
+                    "SELECT grid_id, grid_x, grid_y, forecast_url, resolved_at "
+                    "FROM grid_points WHERE latitude = ? AND longitude = ?",
+                    key,
+                ).fetchone()
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Error reading grid point cache: {e}")
+                return None
+
+    def _write(self, statement: str, rows: list[tuple]) -> None:
+        """Run a write statement for each row in one transaction. Blocks."""
+        with self._lock:
+            try:
+                with self.connection:
+                    self.connection.executemany(statement, rows)
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Error writing grid point cache: {e}")
+
+    def _snap(
+        self, latitude: float, longitude: float
+    ) -> tuple[tuple[float, float], GridPoint] | None:
+        """
+        Find an already resolved grid point to reuse for a coordinate.
+
+        Returns:
+            The key of the resolved point and its grid point, or None.
+        """
+        cutoff = time.time() - self.max_age
+        radius = max(CELL_SEARCH_RADIUS_KM, self.snap_radius_km)
+        nearby = [
+            (distance, key, grid_point)
+            for distance, key, (grid_point, resolved_at) in self._index.within(
+                latitude, longitude, radius
+            )
+            if resolved_at >= cutoff
+        ]
+
+        # Prefer a known grid cell that contains the coordinate
+        for _, key, grid_point in nearby:
+            ring = self._cells.get(grid_point.forecast_url)
+            if ring is not None and point_in_ring(latitude, longitude, ring):
+                return key, grid_point
+
+        if nearby and nearby[0][0] <= self.snap_radius_km:
+            return nearby[0][1], nearby[0][2]
+        return None
+
+    def _key(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Round a coordinate to the precision NWS resolves points at."""
+        return (
+            round(latitude, COORDINATE_PRECISION),
+            round(longitude, COORDINATE_PRECISION),
+        )
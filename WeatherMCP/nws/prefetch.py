@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+# Background refresh of popular forecasts and alerts, off by default
+PREFETCH_ENABLED = os.environ.get("NWS_PREFETCH", "").lower() in ("1", "true", "yes")
+PREFETCH_INTERVAL = float(os.environ.get("NWS_PREFETCH_INTERVAL", "300"))
+# Random delay added to each job, as a fraction of the gap between jobs
+PREFETCH_JITTER = float(os.environ.get("NWS_PREFETCH_JITTER", "0.5"))
+
+
+class Prefetcher:
+    """
+    Runs refresh jobs in the background on a fixed interval.
+
+    Jobs run one at a time, spread evenly over each interval with random
+    jitter, so the prefetcher adds at most one request at a time on top of
+    tool traffic and its requests still go through the shared rate limiter.
+    A failing job is logged and retried on the next cycle.
+    """
+
+    def __init__(
+        self,
+        jobs: list[Callable[[], Awaitable[Any]]],
+        interval: float = PREFETCH_INTERVAL,
+        jitter: float = PREFETCH_JITTER,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            jobs: Coroutine functions to run once per interval.
+            interval: Seconds between runs of the same job.
+            jitter: Random delay per job, as a fraction of the gap between jobs.
+        """
+        self.jobs = jobs
+        self.interval = interval
+        self.jitter = jitter
+        self._task: asyncio.Task | None = None
+        self.cycles = 0
+        self.runs = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        """Start running jobs in a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self) -> None:
+        """Run every job once per interval until cancelled."""
+        while True:
+            started = time.monotonic()
+            gap = self.interval / max(len(self.jobs), 1)
+            for index, job in enumerate(self.jobs):
+                due = started + index * gap + random.uniform(0, self.jitter * gap)
+                await asyncio.sleep(max(due - time.monotonic(), 0))
+                try:
+                    await job()
+                    self.runs += 1
+                except Exception as e:
+                    self.failures += 1
+                    logging.warning(f"Prefetch job failed: {e!r}")
+
+            self.cycles += 1
+            await asyncio.sleep(max(started + self.interval - time.monotonic(), 0))
+
+    def stats(self) -> dict[str, Any]:
+        """Return the prefetcher settings and counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "jobs": len(self.jobs),
+            "cycles": self.cycles,
+            "runs": self.runs,
+            "failures": self.failures,
+        }
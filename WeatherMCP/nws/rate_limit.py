@@ -0,0 +1,161 @@
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+import httpx
+
+
+# Request rate allowed towards api.weather.gov, shared by every tool call
+RATE_LIMIT = float(os.environ.get("NWS_RATE_LIMIT", "10"))
+RATE_LIMIT_BURST = float(os.environ.get("NWS_RATE_LIMIT_BURST", "20"))
+
+# Retries: attempts per request, backoff bounds and the share of traffic
+# that may be retries
+MAX_RETRIES = int(os.environ.get("NWS_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.environ.get("NWS_BACKOFF_BASE", "0.5"))
+BACKOFF_CAP = float(os.environ.get("NWS_BACKOFF_CAP", "10"))
+# Longest Retry-After honored; NWS asking for more fails the call instead
+MAX_RETRY_AFTER = float(os.environ.get("NWS_MAX_RETRY_AFTER", "30"))
+RETRY_BUDGET_RATIO = float(os.environ.get("NWS_RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MIN_PER_SECOND = float(os.environ.get("NWS_RETRY_BUDGET_MIN_PER_SECOND", "1"))
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio callers.
+
+    Tokens refill at rate per second up to burst. acquire() waits until a
+    token is available; callers are served in arrival order. pause() holds
+    every caller back, which is how a Retry-After from NWS is honored.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: float = RATE_LIMIT_BURST):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self.waits = 0
+
+    async def acquire(self) -> None:
+        """Wait for a token and take it."""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                self.waits += 1
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for the given number of seconds."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict[str, float]:
+        """Return the limiter settings and counters."""
+        self._refill(time.monotonic())
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "waits": self.waits,
+        }
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RetryBudget:
+    """
+    Limits retries to a share of overall traffic.
+
+    Every request deposits ratio tokens and every retry withdraws one, with
+    a floor of min_per_second retries. When NWS is failing broadly this
+    stops retries from multiplying the load.
+    """
+
+    def __init__(
+        self,
+        ratio: float = RETRY_BUDGET_RATIO,
+        min_per_second: float = RETRY_BUDGET_MIN_PER_SECOND,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = max(min_per_second * 10, 1.0)
+        self._balance = self.capacity
+        self._updated = time.monotonic()
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        """Record a request, earning ratio retry tokens."""
+        self._refill()
+        self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a retry token, returning False when the budget is spent."""
+        self._refill()
+        if self._balance < 1:
+            self.exhausted += 1
+            return False
+        self._balance -= 1
+        self.retries += 1
+        return True
+
+    def stats(self) -> dict[str, float]:
+        """Return the budget balance and counters."""
+        self._refill()
+        return {
+            "balance": round(self._balance, 2),
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
+
+    def _refill(self) -> None:
+        """Add the floor of retry tokens earned since the last update."""
+        now = time.monotonic()
+        self._balance = min(
+            self.capacity, self._balance + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """
+    Read a Retry-After header as a number of seconds.
+
+    Args:
+        response: The throttled or failed response.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed.
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any
+
+
+# Optional cache file shared by every weather.py process on the host
+SHARED_CACHE_PATH = os.environ.get("NWS_SHARED_CACHE_PATH", "")
+# Expired entries are kept this long for conditional requests, then purged
+SHARED_CACHE_RETENTION = float(os.environ.get("NWS_SHARED_CACHE_RETENTION", "3600"))
+# Purge expired entries after this many writes
+PURGE_INTERVAL = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_responses_expires_at ON responses (expires_at);
+"""
+
+
+class SharedEntry:
+    """A response read from the shared cache, with wall-clock timestamps."""
+
+    __slots__ = ("data", "stored_at", "expires_at", "etag", "last_modified")
+
+    def __init__(
+        self,
+        data: Any,
+        stored_at: float,
+        expires_at: float,
+        etag: str | None,
+        last_modified: str | None,
+    ):
+        self.data = data
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class SharedCache:
+    """
+    On-disk cache of NWS responses shared by processes on one host.
+
+    Entries live in an SQLite database in WAL mode, so readers in other
+    processes are never blocked and writers wait on a busy timeout instead
+    of failing. Bodies are stored as zlib-compressed JSON and entries are
+    purged once they are retention seconds past expiry.
+
+    The methods block, so async code should call them through
+    asyncio.to_thread(). A lock serializes them across worker threads.
+    """
+
+    def __init__(
+        self,
+        database_path: str = SHARED_CACHE_PATH,
+        retention: float = SHARED_CACHE_RETENTION,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            database_path: Path to the SQLite file.
+            retention: Seconds past expiry an entry is kept for revalidation.
+        """
+        self.database_path = database_path
+        self.retention = retention
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.reads = 0
+        self.hits = 0
+        self.purged = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The database connection, opened on first use."""
+        if self._connection is None:
+            directory = os.path.dirname(self.database_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self.database_path, timeout=5.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def get(self, url: str) -> SharedEntry | None:
+        """
+        Read the entry for a URL, fresh or not.
+
+        Args:
+            url: The requested NWS URL.
+
+        Returns:
+            The entry, or None if it is missing or past retention.
+        """
+        with self._lock:
+            self.reads += 1
+            try:
+                row = self.connection.execute(
+                    "SELECT body, stored_at, expires_at, etag, last_modified "
+                    "FROM responses WHERE url = ? AND expires_at > ?",
+                    (url, time.time() - self.retention),
+                ).fetchone()
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Error reading shared weather cache: {e}")
+                return None
+        if row is None:
+            return None
+
+        try:
+            data = json.loads(zlib.decompress(row[0]))
+        except (zlib.error, ValueError) as e:
+            logging.warning(f"Error reading shared weather cache: {e}")
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return SharedEntry(data, row[1], row[2], row[3], row[4])
+
+    def set(
+        self,
+        url: str,
+        data: Any,
+        stored_at: float,
+        expires_at: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Write the entry for a URL.
+
+        Args:
+            url: The requested NWS URL.
+            data: The parsed response body.
+            stored_at: Wall-clock time the response was fetched.
+            expires_at: Wall-clock time the response stops being fresh.
+            etag: The response's ETag, if any.
+            last_modified: The response's Last-Modified, if any.
+        """
+        body = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+        with self._lock:
+            try:
+                with self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO responses "
+                        "(url, body, stored_at, expires_at, etag, last_modified) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (url, body, stored_at, expires_at, etag, last_modified),
+                    )
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Error writing shared weather cache: {e}")
+                return
+
+            self._writes += 1
+            purge = self._writes % PURGE_INTERVAL == 0
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> None:
+        """Delete entries that are more than retention seconds past expiry."""
+        with self._lock:
+            try:
+                with self.connection:
+                    cursor = self.connection.execute(
+                        "DELETE FROM responses WHERE expires_at <= ?",
+                        (time.time() - self.retention,),
+                    )
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Error purging shared weather cache: {e}")
+                return
+            self.purged += cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> dict[str, int]:
+        """Return the shared cache counters."""
+        return {
+            "reads": self.reads,
+            "hits": self.hits,
+            "writes": self._writes,
+            "purged": self.purged,
+        }
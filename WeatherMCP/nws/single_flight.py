@@ -0,0 +1,56 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the call; callers that arrive while
+    it is running await the same task and share its result or exception.
+    A caller that is cancelled does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn for a key, or join the call already running for it.
+
+        Args:
+            key: Identifies calls that can share a result, such as a URL.
+            fn: Starts the call when no call for the key is running.
+
+        Returns:
+            The result of the shared call.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        """Return the coalescing counters."""
+        return {
+            "inFlight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished call so the next caller starts a new one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1,119 @@
+import math
+from collections.abc import Hashable
+from typing import Any
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def point_in_ring(
+    latitude: float, longitude: float, ring: list[list[float]]
+) -> bool:
+    """Check whether a coordinate lies inside a GeoJSON linear ring of [lon, lat] pairs."""
+    inside = False
+    previous_lon, previous_lat = ring[-1][0], ring[-1][1]
+    for point in ring:
+        point_lon, point_lat = point[0], point[1]
+        if (point_lat > latitude) != (previous_lat > latitude):
+            crossing = point_lon + (latitude - point_lat) * (previous_lon - point_lon) / (
+                previous_lat - point_lat
+            )
+            if longitude < crossing:
+                inside = not inside
+        previous_lon, previous_lat = point_lon, point_lat
+    return inside
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Approximate distance between two nearby coordinates (equirectangular)."""
+    x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return EARTH_RADIUS_KM * math.hypot(x, y)
+
+
+class SpatialIndex:
+    """
+    Bucketed index of coordinates for radius lookups.
+
+    Points are grouped into square buckets of bucket_degrees on a side, so a
+    lookup only scans the few buckets that can hold a point within the
+    search radius instead of every indexed point.
+    """
+
+    def __init__(self, bucket_degrees: float = 0.01):
+        self.bucket_degrees = bucket_degrees
+        self._buckets: dict[tuple[int, int], dict[Hashable, tuple]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def add(self, key: Hashable, latitude: float, longitude: float, value: Any) -> None:
+        """
+        Index a value at a coordinate, replacing any value with the same key.
+
+        Args:
+            key: Identifies the point; must be unique per coordinate.
+            latitude: Latitude of the point.
+            longitude: Longitude of the point.
+            value: The value to return from within().
+        """
+        self._buckets.setdefault(self._bucket(latitude, longitude), {})[key] = (
+            latitude,
+            longitude,
+            value,
+        )
+
+    def remove(self, key: Hashable, latitude: float, longitude: float) -> None:
+        """Remove the point with the given key and coordinate, if indexed."""
+        bucket_key = self._bucket(latitude, longitude)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def within(
+        self, latitude: float, longitude: float, max_distance_km: float
+    ) -> list[tuple[float, Hashable, Any]]:
+        """
+        Find the indexed points within a radius of a coordinate.
+
+        Args:
+            latitude: Latitude to search around.
+            longitude: Longitude to search around.
+            max_distance_km: Search radius in kilometres.
+
+        Returns:
+            (distance_km, key, value) tuples, nearest first.
+        """
+        if max_distance_km <= 0 or not self._buckets:
+            return []
+
+        lat_span = max_distance_km / KM_PER_DEGREE
+        # Longitude degrees shrink towards the poles, so widen the search there
+        widest_latitude = min(abs(latitude) + lat_span, 89.9)
+        lon_span = lat_span / math.cos(math.radians(widest_latitude))
+        low = self._bucket(latitude - lat_span, longitude - lon_span)
+        high = self._bucket(latitude + lat_span, longitude + lon_span)
+
+        matches = []
+        for row in range(low[0], high[0] + 1):
+            for column in range(low[1], high[1] + 1):
+                bucket = self._buckets.get((row, column))
+                if bucket is None:
+                    continue
+                for key, (point_lat, point_lon, value) in bucket.items():
+                    distance = distance_km(latitude, longitude, point_lat, point_lon)
+                    if distance <= max_distance_km:
+                        matches.append((distance, key, value))
+
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def _bucket(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Return the bucket a coordinate falls in."""
+        return (
+            math.floor(latitude / self.bucket_degrees),
+            math.floor(longitude / self.bucket_degrees),
+        )
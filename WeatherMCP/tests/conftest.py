@@ -0,0 +1,78 @@
+import os
+import tempfile
+import pytest
+
+# Read when the nws modules are imported: keep the persistent grid cache
+# out of the user's cache directory and make retries quick
+os.environ.setdefault(
+    "NWS_GRID_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "grid_points.db")
+)
+os.environ.setdefault("NWS_BACKOFF_BASE", "0.01")
+
+import weather
+from loadtest.fake_nws import FakeNwsServer, ReplayConfig
+from nws.cache import ResponseCache
+from nws.circuit_breaker import CircuitBreaker
+from nws.client import NwsClient
+from nws.grid_cache import GridPointCache
+from nws.rate_limit import TokenBucket
+from nws.single_flight import SingleFlight
+
+
+class RecordingContext:
+    """Stands in for the MCP Context passed to tools, recording log messages and progress."""
+
+    def __init__(self):
+        self.messages: list[str] = []
+        self.progress: list[tuple[float, float | None]] = []
+
+    async def info(self, message: str) -> None:
+        self.messages.append(message)
+
+    async def report_progress(self, progress: float, total: float | None = None) -> None:
+        self.progress.append((progress, total))
+
+
+@pytest.fixture
+def fake_nws():
+    """Start a local NWS replay server with the given ReplayConfig settings."""
+    servers = []
+
+    def start(**config) -> FakeNwsServer:
+        config.setdefault("latency", 0)
+        config.setdefault("jitter", 0)
+        server = FakeNwsServer(config=ReplayConfig(**config))
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def weather_api(fake_nws, monkeypatch):
+    """
+    Point weather.py at a new replay server, with empty caches and a new client.
+
+    The client must be closed with weather.nws_client.aclose() inside the
+    event loop that used it.
+    """
+
+    def start(**config) -> FakeNwsServer:
+        server = fake_nws(**config)
+        breaker = CircuitBreaker()
+        client = NwsClient(
+            weather.USER_AGENT, rate_limiter=TokenBucket(rate=0), breaker=breaker
+        )
+        monkeypatch.setattr(weather, "NWS_API_BASE", server.base_url)
+        monkeypatch.setattr(weather, "circuit_breaker", breaker)
+        monkeypatch.setattr(weather, "nws_client", client)
+        monkeypatch.setattr(weather, "response_cache", ResponseCache())
+        monkeypatch.setattr(weather, "grid_cache", GridPointCache(":memory:"))
+        monkeypatch.setattr(weather, "in_flight", SingleFlight())
+        monkeypatch.setattr(weather, "background_refreshes", set())
+        return server
+
+    return start
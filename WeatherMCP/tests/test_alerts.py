@@ -0,0 +1,102 @@
+import asyncio
+import time
+import weather
+from conftest import RecordingContext
+
+
+def alerts_url(state: str) -> str:
+    return f"{weather.NWS_API_BASE}/alerts/active/area/{state}"
+
+
+def test_fetching_call_returns_and_streams_alerts(weather_api):
+    server = weather_api(alert_count=5)
+    first, second = RecordingContext(), RecordingContext()
+
+    async def run():
+        try:
+            return (
+                await weather.get_alerts("NY", first),
+                await weather.get_alerts("NY", second),
+            )
+        finally:
+            await weather.nws_client.aclose()
+
+    fetched, cached = asyncio.run(run())
+    # The result holds the alerts whether or not they were also streamed
+    assert fetched.count("Event:") == 5
+    assert "Event: Coastal Flood Advisory" in fetched
+    assert len(first.messages) == 5
+    assert all(message in fetched for message in first.messages)
+    # A cached answer has nothing to stream
+    assert second.messages == []
+    assert cached == fetched
+    assert server.stats()["alerts"] == 1
+
+
+def test_background_refresh_does_not_stream(weather_api, monkeypatch):
+    server = weather_api(alert_count=3)
+    monkeypatch.setattr(weather, "STALE_WHILE_REVALIDATE", True)
+    first, second = RecordingContext(), RecordingContext()
+
+    async def run():
+        try:
+            await weather.get_alerts("NY", first)
+            # Expire the entry and drop its validators so the refresh downloads it again
+            entry = weather.response_cache.get_entry(alerts_url("NY"))
+            entry.expires_at = time.monotonic() - 1
+            entry.etag = entry.last_modified = None
+
+            result = await weather.get_alerts("NY", second)
+            await asyncio.gather(*weather.background_refreshes)
+            return result
+        finally:
+            await weather.nws_client.aclose()
+
+    result = asyncio.run(run())
+    assert result.startswith("(Cached data from")
+    assert result.count("Event:") == 3
+    assert server.stats()["alerts"] == 2
+    assert len(first.messages) == 3
+    assert second.messages == []
+
+
+def test_joined_calls_get_the_full_result(weather_api):
+    server = weather_api(alert_count=4, latency=0.2)
+    contexts = [RecordingContext() for _ in range(3)]
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(weather.get_alerts("NY", context) for context in contexts)
+            )
+        finally:
+            await weather.nws_client.aclose()
+
+    results = asyncio.run(run())
+    assert server.stats()["alerts"] == 1
+    # Only the call that started the download streams it
+    assert sorted(len(context.messages) for context in contexts) == [0, 0, 4]
+    assert len(set(results)) == 1
+    assert results[0].count("Event:") == 4
+
+
+def test_large_collections_are_not_kept(weather_api, monkeypatch):
+    server = weather_api(alert_count=10)
+    monkeypatch.setattr(weather, "ALERT_KEEP_LIMIT", 3)
+    streamed = []
+
+    async def on_alert(alert: dict) -> None:
+        streamed.append(alert)
+
+    async def run():
+        try:
+            return await weather.fetch_nws_alerts(alerts_url("NY"), on_alert)
+        finally:
+            await weather.nws_client.aclose()
+
+    data = asyncio.run(run())
+    assert len(streamed) == 10
+    assert len(data["features"]) == 3
+    assert data["omitted"] == 7
+    assert weather.response_cache.get_entry(alerts_url("NY")) is None
+    assert server.stats()["alerts"] == 1
@@ -0,0 +1,180 @@
+import asyncio
+import time
+import httpx
+import pytest
+from nws.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from nws.client import NwsClient
+from nws.rate_limit import RetryBudget, TokenBucket
+
+
+def make_client(breaker: CircuitBreaker, **kwargs) -> NwsClient:
+    """A client without rate limiting and with room for every retry."""
+    return NwsClient(
+        "weather-test/1.0",
+        rate_limiter=TokenBucket(rate=0),
+        retry_budget=RetryBudget(min_per_second=100),
+        breaker=breaker,
+        **kwargs,
+    )
+
+
+def forecast_url(server) -> str:
+    return f"{server.base_url}/gridpoints/OKX/4240,5228/forecast"
+
+
+def test_breaker_opens_after_threshold_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    # Only one probe at a time
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.stats()["opens"] == 2
+
+
+def test_every_attempt_is_recorded(fake_nws):
+    server = fake_nws(error_rate=1.0)
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    client = make_client(breaker, max_retries=10)
+
+    async def run():
+        try:
+            response = await client.get(forecast_url(server))
+            # The breaker opens on the third failed attempt and stops the retries
+            assert response.status_code == 503
+            assert breaker.state == OPEN
+            with pytest.raises(CircuitOpenError):
+                await client.get(forecast_url(server))
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert server.stats()["errors"] == 3
+
+
+def test_streamed_attempts_are_recorded(fake_nws):
+    server = fake_nws(error_rate=1.0)
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    client = make_client(breaker, max_retries=10)
+
+    async def run():
+        try:
+            async with client.stream(f"{server.base_url}/alerts/active/area/NY") as response:
+                assert response.status_code == 503
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert server.stats()["errors"] == 2
+    assert breaker.state == OPEN
+
+
+def test_success_resets_failures(fake_nws):
+    server = fake_nws()
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    client = make_client(breaker)
+
+    async def run():
+        try:
+            response = await client.get(forecast_url(server))
+            assert response.status_code == 200
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert breaker.stats()["consecutiveFailures"] == 0
+
+
+def test_timeouts_are_not_retried(fake_nws):
+    server = fake_nws(latency=0.5)
+    breaker = CircuitBreaker(failure_threshold=5)
+    client = make_client(breaker, timeout=0.1, max_retries=3)
+
+    async def run():
+        try:
+            with pytest.raises(httpx.TimeoutException):
+                await client.get(forecast_url(server))
+        finally:
+            await client.aclose()
+
+    started = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - started < 0.4
+    assert breaker.stats()["consecutiveFailures"] == 1
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+def test_cancelled_probe_releases_its_slot(fake_nws):
+    server = fake_nws(latency=0.5)
+    breaker = half_open_breaker()
+    client = make_client(breaker)
+
+    async def run():
+        try:
+            probe = asyncio.create_task(client.get(forecast_url(server)))
+            await asyncio.sleep(0.05)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_unexpected_probe_error_releases_its_slot(fake_nws, monkeypatch):
+    server = fake_nws()
+    breaker = half_open_breaker()
+    client = make_client(breaker)
+
+    async def broken_get(*args, **kwargs):
+        raise RuntimeError("not a transport error")
+
+    async def run():
+        try:
+            monkeypatch.setattr(client.client, "get", broken_get)
+            with pytest.raises(RuntimeError):
+                await client.get(forecast_url(server))
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_release_outside_half_open_is_ignored():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    breaker.release()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    breaker.release()
+    assert not breaker.allow_request()
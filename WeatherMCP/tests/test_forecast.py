@@ -0,0 +1,182 @@
+import asyncio
+import time
+import pytest
+import weather
+from conftest import RecordingContext
+from loadtest.fake_nws import cell_for
+from nws.cache import ResponseCache
+
+LATITUDE, LONGITUDE = 40.7128, -74.0060
+
+
+def get_forecast() -> str:
+    async def run():
+        try:
+            return await weather.get_forecast(LATITUDE, LONGITUDE)
+        finally:
+            await weather.nws_client.aclose()
+
+    return asyncio.run(run())
+
+
+def cached_grid_point(latitude: float = LATITUDE, longitude: float = LONGITUDE):
+    return asyncio.run(weather.grid_cache.get(latitude, longitude))
+
+
+def test_forecast_resolves_and_caches_grid_point(weather_api):
+    server = weather_api()
+    assert "Temperature:" in get_forecast()
+    assert cached_grid_point() is not None
+    assert server.stats()["points"] == 1
+
+
+def test_outage_keeps_grid_point(weather_api, monkeypatch):
+    server = weather_api()
+    get_forecast()
+    monkeypatch.setattr(weather, "response_cache", ResponseCache())
+    server.config.error_rate = 1.0
+
+    assert get_forecast() == "Unable to fetch detailed forecast."
+    assert cached_grid_point() is not None
+
+
+def test_open_breaker_keeps_grid_point(weather_api, monkeypatch):
+    server = weather_api()
+    get_forecast()
+    monkeypatch.setattr(weather, "response_cache", ResponseCache())
+    for _ in range(weather.circuit_breaker.failure_threshold):
+        weather.circuit_breaker.record_failure()
+
+    assert get_forecast() == "Unable to fetch detailed forecast."
+    assert cached_grid_point() is not None
+    assert server.stats()["forecast"] == 1
+
+
+def test_missing_forecast_invalidates_grid_point(weather_api):
+    server = weather_api()
+    grid_point = {
+        "gridId": "OKX",
+        "gridX": 1,
+        "gridY": 2,
+        "forecast": f"{server.base_url}/gridpoints/OKX/moved",
+    }
+    asyncio.run(weather.grid_cache.store(LATITUDE, LONGITUDE, grid_point))
+
+    assert get_forecast() == "Unable to fetch detailed forecast."
+    assert server.stats()["notFound"] == 1
+    assert cached_grid_point() is None
+
+
+def test_malformed_forecast_invalidates_grid_point(weather_api, monkeypatch):
+    server = weather_api()
+    monkeypatch.setattr(server, "forecast_body", lambda grid_x, grid_y: {"properties": {}})
+
+    assert get_forecast() == "Unable to fetch detailed forecast."
+    assert cached_grid_point() is None
+
+
+# Three grid cells; the first two locations share a cell
+LOCATIONS = [
+    {"latitude": 40.7128, "longitude": -74.0060},
+    {"latitude": 40.7130, "longitude": -74.0055},
+    {"latitude": 34.0522, "longitude": -118.2437},
+    {"latitude": 41.8781, "longitude": -87.6298},
+]
+
+
+def get_forecasts(locations) -> tuple[str, RecordingContext]:
+    ctx = RecordingContext()
+
+    async def run():
+        try:
+            return await weather.get_forecasts(locations, ctx)
+        finally:
+            await weather.nws_client.aclose()
+
+    return asyncio.run(run()), ctx
+
+
+def location_results(result: str) -> list[tuple[str, str]]:
+    """Split a get_forecasts result into (location, forecast) pairs."""
+    pairs = []
+    for section in result.split("\n===\n"):
+        header, _, forecast = section.partition("\n")
+        pairs.append((header, forecast))
+    return pairs
+
+
+def test_forecasts_are_fetched_concurrently_and_listed_in_order(weather_api):
+    server = weather_api(latency=0.2)
+    # Listed in reverse, with a repeat, to check the order does not follow completion
+    locations = LOCATIONS[::-1] + [LOCATIONS[0]]
+
+    started = time.monotonic()
+    result, ctx = get_forecasts(locations)
+    elapsed = time.monotonic() - started
+
+    # One /points and one forecast round trip, not one per location
+    assert elapsed < 1.0
+    assert [header for header, _ in location_results(result)] == [
+        f"Location {location['latitude']}, {location['longitude']}:"
+        for location in locations
+    ]
+    assert all("Temperature:" in forecast for _, forecast in location_results(result))
+    # The repeated location is fetched and reported once
+    assert server.stats()["points"] == 4
+    assert server.stats()["forecast"] == 3
+    assert len(ctx.messages) == 4
+    assert ctx.progress[-1] == (4, 4)
+
+
+def test_one_failed_location_does_not_fail_the_others(weather_api, monkeypatch):
+    server = weather_api()
+    points_body = server.points_body
+    forecast_body = server.forecast_body
+    broken_x, _ = cell_for(LOCATIONS[2]["latitude"], LOCATIONS[2]["longitude"])
+
+    def unresolvable(latitude, longitude):
+        if latitude == LOCATIONS[3]["latitude"]:
+            return {}
+        return points_body(latitude, longitude)
+
+    def malformed(grid_x, grid_y):
+        if grid_x == broken_x:
+            return {"properties": {}}
+        return forecast_body(grid_x, grid_y)
+
+    monkeypatch.setattr(server, "points_body", unresolvable)
+    monkeypatch.setattr(server, "forecast_body", malformed)
+
+    result, _ = get_forecasts(LOCATIONS)
+    forecasts = [forecast for _, forecast in location_results(result)]
+    assert "Temperature:" in forecasts[0]
+    assert "Temperature:" in forecasts[1]
+    assert forecasts[2] == "Unable to fetch detailed forecast."
+    assert forecasts[3] == "Unable to fetch forecast data for this location."
+    # Only the malformed cell is resolved again next time
+    assert cached_grid_point(LOCATIONS[0]["latitude"], LOCATIONS[0]["longitude"])
+    assert cached_grid_point(LOCATIONS[2]["latitude"], LOCATIONS[2]["longitude"]) is None
+
+
+@pytest.mark.parametrize(
+    ("locations", "message"),
+    [
+        ([], "No locations given."),
+        ([{"latitude": 40.7}], "Each location needs a numeric latitude and longitude."),
+        (
+            [{"latitude": "north", "longitude": -74.0}],
+            "Each location needs a numeric latitude and longitude.",
+        ),
+        (
+            [{"latitude": None, "longitude": -74.0}],
+            "Each location needs a numeric latitude and longitude.",
+        ),
+        (["40.7,-74.0"], "Each location needs a numeric latitude and longitude."),
+    ],
+)
+def test_forecasts_validate_locations(weather_api, locations, message):
+    server = weather_api()
+    result, ctx = get_forecasts(locations)
+    assert result == message
+    assert ctx.messages == []
+    assert server.stats() == {}
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import random
+import pytest
+from nws.geojson_stream import FeatureStreamParser, iter_features
+
+
+def parse(text: str, chunk_size: int) -> list[dict]:
+    parser = FeatureStreamParser()
+    features = []
+    for i in range(0, len(text), chunk_size):
+        features.extend(parser.feed(text[i : i + chunk_size]))
+    features.extend(parser.close())
+    return features
+
+
+COLLECTION = {
+    "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+    "type": "FeatureCollection",
+    # A nested "features" key must not be mistaken for the top-level array
+    "metadata": {"features": [{"id": "not-a-feature"}]},
+    "features": [
+        {
+            "id": "alert-1",
+            "properties": {
+                "event": "Flood \"Warning\"",
+                "description": "Brackets ] } [ { and a backslash \\ inside a string",
+                "features": [],
+            },
+        },
+        {"id": "alert-2", "properties": {"event": "Wind Advisory é☃"}},
+        {"id": "alert-3", "geometry": None, "properties": {}},
+    ],
+    "title": "Current watches, warnings, and advisories",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100_000])
+def test_matches_json_loads_for_any_chunking(chunk_size):
+    text = json.dumps(COLLECTION, indent=2)
+    assert parse(text, chunk_size) == COLLECTION["features"]
+
+
+def test_escaped_quotes_split_across_chunks():
+    text = json.dumps(COLLECTION, ensure_ascii=True)
+    for split in range(len(text)):
+        parser = FeatureStreamParser()
+        features = parser.feed(text[:split]) + parser.feed(text[split:]) + parser.close()
+        assert features == COLLECTION["features"]
+
+
+def test_random_chunks():
+    rng = random.Random(0)
+    collection = {
+        "type": "FeatureCollection",
+        "features": [
+            {"id": f"alert-{i}", "properties": {"text": "x\\\"]" * rng.randrange(50)}}
+            for i in range(200)
+        ],
+    }
+    text = json.dumps(collection)
+    parser = FeatureStreamParser()
+    features = []
+    position = 0
+    while position < len(text):
+        size = rng.randrange(1, 300)
+        features.extend(parser.feed(text[position : position + size]))
+        position += size
+    features.extend(parser.close())
+    assert features == collection["features"]
+
+
+def test_empty_features():
+    assert parse('{"type": "FeatureCollection", "features": []}', 5) == []
+
+
+def test_missing_features_array():
+    with pytest.raises(ValueError, match="no features array"):
+        parse('{"type": "FeatureCollection", "title": "features"}', 4)
+
+
+def test_truncated_body():
+    text = json.dumps(COLLECTION)
+    cut = text.index('"alert-3"')
+    with pytest.raises(ValueError, match="ended inside"):
+        parse(text[:cut], 16)
+
+
+def test_features_are_yielded_before_the_body_ends():
+    text = json.dumps(COLLECTION)
+    cut = text.index('{"id": "alert-3"')
+    received = []
+
+    async def chunks():
+        yield text[:cut]
+        # The first two features are out before the rest of the body arrives
+        received.append(len(seen))
+        yield text[cut:]
+
+    async def run():
+        async for feature in iter_features(chunks()):
+            seen.append(feature)
+
+    seen = []
+    asyncio.run(run())
+    assert received == [2]
+    assert seen == COLLECTION["features"]
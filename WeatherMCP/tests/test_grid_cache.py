@@ -0,0 +1,100 @@
+import asyncio
+import time
+import weather
+from nws.grid_cache import GridPointCache
+
+LATITUDE, LONGITUDE = 40.7128, -74.0060
+# In the same replayed grid cell, about 50 m away
+NEARBY = (40.7130, -74.0055)
+# About 11 km north, outside every snap radius
+FAR = (40.8128, -74.0060)
+
+PROPERTIES = {
+    "gridId": "OKX",
+    "gridX": 33,
+    "gridY": 35,
+    "forecast": "https://api.weather.gov/gridpoints/OKX/33,35/forecast",
+}
+
+
+def get_forecasts(*coordinates) -> list[str]:
+    async def run():
+        try:
+            return [await weather.get_forecast(*c) for c in coordinates]
+        finally:
+            await weather.nws_client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_nearby_coordinate_snaps_to_resolved_cell(weather_api):
+    server = weather_api()
+    first, nearby = get_forecasts((LATITUDE, LONGITUDE), NEARBY)
+
+    assert nearby == first
+    assert server.stats()["points"] == 1
+    assert server.stats()["forecast"] == 1
+    assert weather.grid_cache.stats()["snaps"] == 1
+
+
+def test_coordinate_outside_snap_radius_is_resolved(weather_api):
+    server = weather_api()
+    get_forecasts((LATITUDE, LONGITUDE), FAR)
+
+    assert server.stats()["points"] == 2
+    assert server.stats()["forecast"] == 2
+    assert weather.grid_cache.stats()["snaps"] == 0
+
+
+def test_snap_radius_without_known_cell():
+    cache = GridPointCache(":memory:", snap_radius_km=2)
+
+    async def run():
+        await cache.store(LATITUDE, LONGITUDE, PROPERTIES)
+        return await cache.get(*NEARBY), await cache.get(*FAR)
+
+    nearby, far = asyncio.run(run())
+    assert nearby.forecast_url == PROPERTIES["forecast"]
+    assert far is None
+    assert cache.stats()["snaps"] == 1
+    cache.close()
+
+
+def test_grid_points_survive_restart(tmp_path):
+    path = str(tmp_path / "grid_points.db")
+    cache = GridPointCache(path)
+    asyncio.run(cache.store(LATITUDE, LONGITUDE, PROPERTIES))
+    cache.close()
+
+    cache = GridPointCache(path)
+    grid_point = asyncio.run(cache.get(LATITUDE, LONGITUDE))
+    assert grid_point.forecast_url == PROPERTIES["forecast"]
+    assert cache.stats()["hits"] == 1
+    cache.close()
+
+
+def test_database_reads_do_not_block_the_event_loop(tmp_path, monkeypatch):
+    cache = GridPointCache(str(tmp_path / "grid_points.db"))
+    read_point = cache._read_point
+
+    def slow_read_point(key):
+        time.sleep(0.2)
+        return read_point(key)
+
+    monkeypatch.setattr(cache, "_read_point", slow_read_point)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def run():
+        ticker = asyncio.create_task(tick())
+        await cache.get(LATITUDE, LONGITUDE)
+        ticker.cancel()
+
+    asyncio.run(run())
+    assert ticks >= 10
+    cache.close()
@@ -0,0 +1,122 @@
+import asyncio
+import weather
+from conftest import RecordingContext
+from nws.prefetch import Prefetcher
+
+
+async def wait_for_runs(prefetcher: Prefetcher, runs: int, timeout: float = 5) -> None:
+    async def poll():
+        while prefetcher.runs + prefetcher.failures < runs:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_prefetch_warms_the_cache(weather_api):
+    server = weather_api()
+    # Jobs are spread evenly over the interval
+    prefetcher = Prefetcher(weather.prefetch_jobs(), interval=0.8, jitter=0)
+    jobs = len(prefetcher.jobs)
+    city = weather.MAJOR_CITIES[0]
+
+    async def run():
+        try:
+            prefetcher.start()
+            await wait_for_runs(prefetcher, jobs)
+            await prefetcher.stop()
+            warmed = server.stats()
+
+            forecast = await weather.get_forecast(city["latitude"], city["longitude"])
+            alerts = await weather.get_alerts(weather.STATES[0]["code"], RecordingContext())
+            return warmed, forecast, alerts
+        finally:
+            await weather.nws_client.aclose()
+
+    warmed, forecast, alerts = asyncio.run(run())
+    assert warmed["points"] == len(weather.MAJOR_CITIES)
+    assert warmed["forecast"] >= len(weather.MAJOR_CITIES)
+    assert warmed["alerts"] >= len(weather.STATES)
+    assert prefetcher.failures == 0
+    # Both tools are answered from the warmed caches
+    assert "Temperature:" in forecast
+    assert "Event:" in alerts
+    assert server.stats() == warmed
+
+
+def test_failed_job_does_not_stop_the_others():
+    calls = []
+
+    async def fail():
+        calls.append("fail")
+        raise RuntimeError("upstream failed")
+
+    async def succeed():
+        calls.append("succeed")
+
+    prefetcher = Prefetcher([fail, succeed], interval=0.05, jitter=0)
+
+    async def run():
+        prefetcher.start()
+        await wait_for_runs(prefetcher, 4)
+        await prefetcher.stop()
+
+    asyncio.run(run())
+    assert prefetcher.failures >= 2
+    assert prefetcher.runs >= 2
+    assert calls[:4] == ["fail", "succeed", "fail", "succeed"]
+
+
+def test_stop_cancels_a_running_job():
+    finished = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            finished.append(True)
+
+    prefetcher = Prefetcher([slow], interval=60, jitter=0)
+
+    async def run():
+        prefetcher.start()
+        await asyncio.sleep(0.05)
+        assert prefetcher.stats()["running"]
+        await asyncio.wait_for(prefetcher.stop(), 1)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    assert finished == [True]
+    assert not prefetcher.stats()["running"]
+    assert prefetcher.runs == 0
+
+
+def lifespan_runs(monkeypatch, enabled: bool) -> tuple[int, bool]:
+    """Run the server lifespan briefly with a counting prefetch job."""
+    runs = 0
+
+    async def job():
+        nonlocal runs
+        runs += 1
+
+    prefetcher = Prefetcher([job], interval=0.01, jitter=0)
+    monkeypatch.setattr(weather, "prefetcher", prefetcher)
+    monkeypatch.setattr(weather, "PREFETCH_ENABLED", enabled)
+
+    async def run():
+        async with weather.lifespan(weather.mcp):
+            await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    return runs, prefetcher.stats()["running"]
+
+
+def test_lifespan_does_not_prefetch_when_disabled(weather_api, monkeypatch):
+    weather_api()
+    assert lifespan_runs(monkeypatch, enabled=False) == (0, False)
+
+
+def test_lifespan_stops_the_prefetcher_on_shutdown(weather_api, monkeypatch):
+    weather_api()
+    runs, running = lifespan_runs(monkeypatch, enabled=True)
+    assert runs > 0
+    assert not running
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import httpx
+import pytest
+import weather
+from conftest import RecordingContext
+from nws.client import NwsClient, ServiceBusyError
+from nws.rate_limit import RetryBudget, TokenBucket, retry_after_seconds
+
+
+def make_client(**kwargs) -> NwsClient:
+    kwargs.setdefault("rate_limiter", TokenBucket(rate=0))
+    kwargs.setdefault("retry_budget", RetryBudget(min_per_second=100))
+    return NwsClient("weather-test/1.0", **kwargs)
+
+
+def forecast_url(server) -> str:
+    return f"{server.base_url}/gridpoints/OKX/4240,5228/forecast"
+
+
+def throttled(retry_after: str | None) -> httpx.Response:
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return httpx.Response(429, headers=headers)
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(throttled("7")) == 7.0
+    assert retry_after_seconds(throttled("1.5")) == 1.5
+    assert retry_after_seconds(throttled("-3")) == 0.0
+    assert retry_after_seconds(throttled("soon")) is None
+    assert retry_after_seconds(throttled(None)) is None
+
+
+def test_retry_after_http_date():
+    now = datetime.now(timezone.utc)
+    later = format_datetime(now + timedelta(seconds=20), usegmt=True)
+    assert 18 <= retry_after_seconds(throttled(later)) <= 20
+    earlier = format_datetime(now - timedelta(seconds=20), usegmt=True)
+    assert retry_after_seconds(throttled(earlier)) == 0.0
+
+
+def test_retry_after_within_cap_is_honored(fake_nws):
+    server = fake_nws(error_rate=1.0, error_status=429, retry_after=0.2)
+    client = make_client(max_retries=1, max_retry_after=1)
+
+    async def run():
+        try:
+            return await client.get(forecast_url(server))
+        finally:
+            await client.aclose()
+
+    started = time.monotonic()
+    response = asyncio.run(run())
+    assert time.monotonic() - started >= 0.2
+    assert response.status_code == 429
+    assert server.stats()["errors"] == 2
+
+
+def test_retry_after_beyond_cap_fails_fast(fake_nws):
+    server = fake_nws(error_rate=1.0, error_status=429, retry_after=120)
+    limiter = TokenBucket(rate=1000)
+    client = make_client(rate_limiter=limiter, max_retries=3, max_retry_after=30)
+
+    async def run():
+        try:
+            with pytest.raises(ServiceBusyError) as get_error:
+                await client.get(forecast_url(server))
+            with pytest.raises(ServiceBusyError):
+                async with client.stream(forecast_url(server)):
+                    pass
+            return get_error.value
+        finally:
+            await client.aclose()
+
+    started = time.monotonic()
+    error = asyncio.run(run())
+    assert time.monotonic() - started < 1
+    assert error.retry_after == 120
+    # No retries, and other callers are not held back for two minutes
+    assert server.stats()["errors"] == 2
+    assert limiter.stats()["waits"] == 0
+
+
+def test_busy_service_result(weather_api):
+    weather_api(error_rate=1.0, error_status=429, retry_after=120)
+
+    async def run():
+        try:
+            return await weather.get_alerts("NY", RecordingContext())
+        finally:
+            await weather.nws_client.aclose()
+
+    assert asyncio.run(run()) == "The weather service is busy; retry after 120 seconds."
+
+
+def test_exhausted_budget_stops_retries(fake_nws):
+    server = fake_nws(error_rate=1.0)
+    budget = RetryBudget(ratio=0, min_per_second=0.01)
+    client = make_client(retry_budget=budget, max_retries=5)
+
+    async def run():
+        try:
+            return await client.get(forecast_url(server))
+        finally:
+            await client.aclose()
+
+    response = asyncio.run(run())
+    assert response.status_code == 503
+    # The budget holds a single retry
+    assert server.stats()["errors"] == 2
+    assert budget.stats()["retries"] == 1
+    assert budget.stats()["exhausted"] == 1
+
+
+def test_requests_earn_retries():
+    budget = RetryBudget(ratio=0.5, min_per_second=0)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert budget.stats()["retries"] == 2
+
+
+def test_token_bucket_limits_bursts():
+    limiter = TokenBucket(rate=20, burst=2)
+
+    async def run():
+        for _ in range(3):
+            await limiter.acquire()
+
+    started = time.monotonic()
+    asyncio.run(run())
+    # The third token refills at 20 per second
+    assert time.monotonic() - started >= 0.04
+    assert limiter.stats()["waits"] == 1
+
+
+def test_token_bucket_pause_holds_callers_back():
+    limiter = TokenBucket(rate=1000, burst=10)
+    limiter.pause(0.1)
+
+    started = time.monotonic()
+    asyncio.run(limiter.acquire())
+    assert time.monotonic() - started >= 0.1
+
+
+def test_unlimited_token_bucket_never_waits():
+    limiter = TokenBucket(rate=0)
+    limiter.pause(10)
+
+    async def run():
+        for _ in range(100):
+            await limiter.acquire()
+
+    started = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - started < 0.1
+    assert limiter.stats()["waits"] == 0
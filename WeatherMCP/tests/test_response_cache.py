@@ -0,0 +1,137 @@
+import asyncio
+import time
+import httpx
+import nws.cache
+import weather
+from conftest import RecordingContext
+from nws.cache import ResponseCache, freshness_lifetime
+
+URL = "https://api.weather.gov/gridpoints/OKX/33,35/forecast"
+
+
+class FakeClock:
+    """Stands in for the time module in the cache, moving only when told to."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return time.time()
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def response(status_code: int = 200, **headers: str) -> httpx.Response:
+    return httpx.Response(
+        status_code, headers={key.replace("_", "-"): value for key, value in headers.items()}
+    )
+
+
+def fake_clock(monkeypatch, *modules) -> FakeClock:
+    clock = FakeClock()
+    for module in (nws.cache, *modules):
+        monkeypatch.setattr(module, "time", clock)
+    return clock
+
+
+def test_fresh_entry_is_served_until_it_expires(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    cache = ResponseCache()
+    asyncio.run(cache.store(URL, response(Cache_Control="max-age=60", ETag='"v1"'), {"v": 1}))
+
+    clock.advance(59)
+    assert cache.get(URL) == {"v": 1}
+    clock.advance(1)
+    assert cache.get(URL) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    # Expired entries keep their validators for a conditional request
+    assert cache.get_entry(URL).conditional_headers() == {"If-None-Match": '"v1"'}
+
+
+def test_not_modified_refreshes_the_entry(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    cache = ResponseCache()
+    asyncio.run(cache.store(URL, response(Cache_Control="max-age=60", ETag='"v1"'), {"v": 1}))
+    clock.advance(90)
+    entry = cache.get_entry(URL)
+
+    data = asyncio.run(
+        cache.revalidate(URL, entry, response(304, Cache_Control="max-age=120", ETag='"v1"'))
+    )
+    assert data == {"v": 1}
+    assert entry.age(clock.now) == 0
+    clock.advance(119)
+    assert cache.get(URL) == {"v": 1}
+    clock.advance(1)
+    assert cache.get(URL) is None
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    fake_clock(monkeypatch)
+    cache = ResponseCache(max_entries=2)
+
+    async def run():
+        await cache.store("a", response(), "a")
+        await cache.store("b", response(), "b")
+        cache.get("a")
+        await cache.store("c", response(), "c")
+
+    asyncio.run(run())
+    assert cache.get_entry("b") is None
+    assert cache.get("a") == "a" and cache.get("c") == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stale_entries_stay_servable_for_max_staleness(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    cache = ResponseCache()
+    asyncio.run(cache.store(URL, response(Cache_Control="max-age=60"), {"v": 1}))
+
+    clock.advance(60 + 300)
+    assert cache.get_stale(URL, max_staleness=300).data == {"v": 1}
+    clock.advance(1)
+    assert cache.get_stale(URL, max_staleness=300) is None
+
+
+def test_freshness_lifetime():
+    assert freshness_lifetime(response(Cache_Control="max-age=60", Age="15"), 5) == 45
+    assert freshness_lifetime(response(Cache_Control="no-store"), 5) is None
+    assert freshness_lifetime(response(Cache_Control="no-cache"), 5) == 0
+    assert freshness_lifetime(response(), 5) == 5
+    expires = response(
+        Date="Sat, 18 Oct 2025 12:00:00 GMT", Expires="Sat, 18 Oct 2025 12:05:00 GMT"
+    )
+    assert freshness_lifetime(expires, 5) == 300
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(weather_api, monkeypatch):
+    server = weather_api(alert_count=2, latency=0.1, max_age=60)
+    monkeypatch.setattr(weather, "STALE_WHILE_REVALIDATE", True)
+    clock = fake_clock(monkeypatch, weather)
+
+    async def run():
+        try:
+            await weather.get_alerts("NY", RecordingContext())
+            clock.advance(90)
+            stale = await asyncio.gather(
+                *(weather.get_alerts("NY", RecordingContext()) for _ in range(5))
+            )
+            await asyncio.gather(*weather.background_refreshes)
+            fresh = await weather.get_alerts("NY", RecordingContext())
+            return stale, fresh
+        finally:
+            await weather.nws_client.aclose()
+
+    stale, fresh = asyncio.run(run())
+    assert all(result.startswith("(Cached data from 90 seconds ago.)") for result in stale)
+    assert not fresh.startswith("(Cached data")
+    # One conditional refresh for all five stale callers
+    assert server.stats()["alerts"] == 2
+    assert server.stats()["notModified"] == 1
+    assert weather.in_flight.stats()["calls"] == 2
@@ -0,0 +1,74 @@
+import asyncio
+import time
+import weather
+from conftest import RecordingContext
+from nws.cache import ResponseCache
+from nws.shared_cache import SharedCache
+
+
+def get_alerts(state: str) -> str:
+    async def run():
+        try:
+            return await weather.get_alerts(state, RecordingContext())
+        finally:
+            await weather.nws_client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_other_process_is_served_from_shared_cache(weather_api, monkeypatch, tmp_path):
+    server = weather_api(alert_count=2)
+    path = str(tmp_path / "responses.db")
+    monkeypatch.setattr(weather, "response_cache", ResponseCache(shared=SharedCache(path)))
+    get_alerts("NY")
+
+    # A second process has its own in-process cache over the same file
+    shared = SharedCache(path)
+    monkeypatch.setattr(weather, "response_cache", ResponseCache(shared=shared))
+    result = get_alerts("NY")
+    assert result.count("Event:") == 2
+    assert server.stats()["alerts"] == 1
+    assert shared.stats()["reads"] == 1
+
+    # Served from the in-process copy now, without reading the file again
+    get_alerts("NY")
+    assert shared.stats()["reads"] == 1
+    shared.close()
+
+
+def test_miss_reads_shared_cache_once(weather_api, monkeypatch, tmp_path):
+    server = weather_api(alert_count=2)
+    shared = SharedCache(str(tmp_path / "responses.db"))
+    monkeypatch.setattr(weather, "response_cache", ResponseCache(shared=shared))
+
+    get_alerts("CA")
+    assert server.stats()["alerts"] == 1
+    assert shared.stats() == {"reads": 1, "hits": 0, "writes": 1, "purged": 0}
+    shared.close()
+
+
+def test_shared_reads_do_not_block_the_event_loop(tmp_path, monkeypatch):
+    shared = SharedCache(str(tmp_path / "responses.db"))
+    cache = ResponseCache(shared=shared)
+
+    def slow_get(url):
+        time.sleep(0.2)
+        return None
+
+    monkeypatch.setattr(shared, "get", slow_get)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def run():
+        ticker = asyncio.create_task(tick())
+        await cache.load("https://api.weather.gov/alerts/active/area/NY")
+        ticker.cancel()
+
+    asyncio.run(run())
+    assert ticks >= 10
+    shared.close()
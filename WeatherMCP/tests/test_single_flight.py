@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+import weather
+from conftest import RecordingContext
+from nws.single_flight import SingleFlight
+
+# Concurrent identical get_alerts calls in the load test
+CALLERS = 100
+
+
+def test_concurrent_get_alerts_hit_upstream_once(weather_api):
+    # Latency keeps the upstream call open while every caller arrives
+    server = weather_api(alert_count=20, latency=0.2)
+    contexts = [RecordingContext() for _ in range(CALLERS)]
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(weather.get_alerts("CA", context) for context in contexts)
+            )
+        finally:
+            await weather.nws_client.aclose()
+
+    results = asyncio.run(run())
+    assert server.stats()["alerts"] == 1
+    assert weather.in_flight.stats() == {
+        "inFlight": 0,
+        "calls": 1,
+        "coalesced": CALLERS - 1,
+    }
+    # Every caller gets the same text, including the one that streamed it
+    assert sum(1 for context in contexts if context.messages) == 1
+    assert len(set(results)) == 1
+    assert results[0].count("Event:") == 20
+
+
+def test_sequential_calls_start_new_flights():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def run():
+        return [await single_flight.do("key", fetch) for _ in range(3)]
+
+    assert asyncio.run(run()) == [1, 2, 3]
+    assert len(single_flight) == 0
+
+
+def test_joined_callers_share_exceptions():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream failed")
+
+    async def run():
+        return await asyncio.gather(
+            *(single_flight.do("key", fail) for _ in range(5)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(single_flight.do("key", fetch))
+        second = asyncio.create_task(single_flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
@@ -0,0 +1,43 @@
+import random
+from nws.spatial_index import SpatialIndex, distance_km, point_in_ring
+
+
+def test_within_matches_brute_force():
+    rng = random.Random(0)
+    index = SpatialIndex()
+    points = {}
+    for i in range(2_000):
+        latitude = 40.5 + rng.random() * 0.5
+        longitude = -74.5 + rng.random() * 0.5
+        points[i] = (latitude, longitude)
+        index.add(i, latitude, longitude, f"point-{i}")
+
+    for _ in range(50):
+        latitude = 40.5 + rng.random() * 0.5
+        longitude = -74.5 + rng.random() * 0.5
+        radius = rng.choice([0.5, 2, 5])
+        expected = sorted(
+            key
+            for key, (point_lat, point_lon) in points.items()
+            if distance_km(latitude, longitude, point_lat, point_lon) <= radius
+        )
+        matches = index.within(latitude, longitude, radius)
+        assert sorted(key for _, key, _ in matches) == expected
+        assert [distance for distance, _, _ in matches] == sorted(
+            distance for distance, _, _ in matches
+        )
+
+
+def test_remove():
+    index = SpatialIndex()
+    index.add("a", 40.0, -74.0, 1)
+    index.add("b", 40.001, -74.0, 2)
+    index.remove("a", 40.0, -74.0)
+    assert [key for _, key, _ in index.within(40.0, -74.0, 1)] == ["b"]
+    assert len(index) == 1
+
+
+def test_point_in_ring():
+    ring = [[-74.0, 40.0], [-73.0, 40.0], [-73.0, 41.0], [-74.0, 41.0], [-74.0, 40.0]]
+    assert point_in_ring(40.5, -73.5, ring)
+    assert not point_in_ring(41.5, -73.5, ring)
@@ -1,27 +1,307 @@
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
-import httpx
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from nws.cache import MAX_STALENESS, STALE_WHILE_REVALIDATE, ResponseCache
+from nws.circuit_breaker import CircuitBreaker, CircuitOpenError
+from nws.client import NotFoundError, NwsClient, ServiceBusyError
+from nws.geojson_stream import iter_features
+from nws.prefetch import PREFETCH_ENABLED, PREFETCH_INTERVAL, Prefetcher
+from nws.grid_cache import GridPoint, GridPointCache
+from nws.shared_cache import SHARED_CACHE_PATH, SharedCache
+from nws.single_flight import SingleFlight
 import logging
 import json
 
-# Initialize FastMCP server
-mcp = FastMCP("weather")
-
 # Constants
-NWS_API_BASE = "https://api.weather.gov"
+# Overridable so load tests can point the server at a local replay of the API
+NWS_API_BASE = os.environ.get("NWS_API_BASE", "https://api.weather.gov").rstrip("/")
 USER_AGENT = "weather-app/1.0"
+FORECAST_BATCH_CONCURRENCY = int(os.environ.get("NWS_FORECAST_BATCH_CONCURRENCY", "20"))
+
+# Alert properties used by format_alert; the rest of each feature is dropped
+ALERT_PROPERTIES = ("event", "areaDesc", "severity", "description", "instruction")
+# Alerts kept per response. Larger collections are streamed to the caller
+# that fetched them but not cached, so memory stays bounded by this limit.
+ALERT_KEEP_LIMIT = int(os.environ.get("NWS_ALERT_KEEP_LIMIT", "500"))
+
+# Listed by the resources and kept warm by the prefetcher
+STATES = [
+    {"code": "AL", "name": "Alabama"},
+    {"code": "AK", "name": "Alaska"},
+    {"code": "CA", "name": "California"},
+    {"code": "NY", "name": "New York"},
+]
+MAJOR_CITIES = [
+    {"name": "New York, NY", "latitude": 40.7128, "longitude": -74.0060},
+    {"name": "Los Angeles, CA", "latitude": 34.0522, "longitude": -118.2437},
+    {"name": "Chicago, IL", "latitude": 41.8781, "longitude": -87.6298},
+    {"name": "Houston, TX", "latitude": 29.7604, "longitude": -95.3698},
+]
+
+
+# Parsed NWS responses, reused while their Cache-Control/Expires allow it.
+# Setting NWS_SHARED_CACHE_PATH also shares them with other processes.
+shared_cache = SharedCache(SHARED_CACHE_PATH) if SHARED_CACHE_PATH else None
+response_cache = ResponseCache(shared=shared_cache)
+
+# Coordinates already resolved to a forecast grid cell, kept across restarts
+grid_cache = GridPointCache()
+
+# Concurrent requests for the same URL share one upstream call
+in_flight = SingleFlight()
+
+# Fails fast (serving stale data where possible) while NWS keeps failing
+circuit_breaker = CircuitBreaker()
+
+# Shared, connection-pooled client used by every tool call. Every attempt,
+# retries included, is recorded on the circuit breaker.
+nws_client = NwsClient(USER_AGENT, breaker=circuit_breaker)
+
+# Refreshes started after serving a stale cache entry
+background_refreshes: set[asyncio.Task] = set()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Run the prefetcher if enabled; close the NWS client and on-disk caches on shutdown."""
+    if PREFETCH_ENABLED:
+        prefetcher.start()
+    try:
+        yield
+    finally:
+        await prefetcher.stop()
+        for task in background_refreshes:
+            task.cancel()
+        await nws_client.aclose()
+        grid_cache.close()
+        if shared_cache is not None:
+            shared_cache.close()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("weather", lifespan=lifespan)
 
 
 async def make_nws_request(url: str) -> dict[str, Any] | None:
     """Make a request to the NWS API with proper error handling."""
-    headers = {"User-Agent": USER_AGENT, "Accept": "application/geo+json"}
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
+    data, _ = await make_nws_request_with_age(url)
+    return data
+
+
+async def make_nws_request_with_age(
+    url: str,
+    fetch: Callable[[], Awaitable[dict[str, Any] | None]] | None = None,
+    foreground_fetch: Callable[[], Awaitable[dict[str, Any] | None]] | None = None,
+) -> tuple[dict[str, Any] | None, float | None]:
+    """Make a request to the NWS API, allowing a stale copy in stale-while-revalidate mode.
+
+    While the circuit breaker is open, any cached copy is served no matter
+    how old it is.
+
+    Args:
+        url: The NWS URL to request.
+        fetch: Fetches and caches the URL on a miss; defaults to fetch_nws.
+        foreground_fetch: Used instead of fetch when this caller starts the
+            fetch and waits for it, e.g. to stream results to the caller.
+            Background refreshes and other callers joining the fetch never
+            run it.
+
+    Returns:
+        The parsed response (None on failure) and, when a stale cached copy
+        was served, its age in seconds.
+
+    Raises:
+        ServiceBusyError: If NWS asked to wait longer than the client allows
+            and there is no cached copy to serve instead.
+    """
+    if fetch is None:
+        fetch = lambda: fetch_nws(url)
+
+    # The only lookup that may read the shared cache; the rest stay in-process
+    await response_cache.load(url)
+    cached = response_cache.get(url)
+    if cached is not None:
+        return cached, None
+
+    if STALE_WHILE_REVALIDATE:
+        entry = response_cache.get_stale(url, MAX_STALENESS)
+        if entry is not None:
+            refresh_in_background(url, fetch)
+            return entry.data, entry.age(time.monotonic())
+
+    try:
+        return await in_flight.do(url, foreground_fetch or fetch), None
+    except CircuitOpenError:
+        entry = response_cache.get_stale(url, math.inf)
+        if entry is None:
+            return None, None
+        return entry.data, entry.age(time.monotonic())
+    except ServiceBusyError:
+        entry = response_cache.get_stale(url, math.inf)
+        if entry is None:
+            raise
+        return entry.data, entry.age(time.monotonic())
+
+
+def refresh_in_background(
+    url: str, fetch: Callable[[], Awaitable[dict[str, Any] | None]]
+) -> None:
+    """Refresh a cached URL without making the caller wait for it."""
+    task = asyncio.create_task(refresh(url, fetch))
+    background_refreshes.add(task)
+    task.add_done_callback(background_refreshes.discard)
+
+
+async def refresh(url: str, fetch: Callable[[], Awaitable[dict[str, Any] | None]]) -> None:
+    """Fetch a URL into the cache, skipping it while the circuit breaker is open or NWS is busy."""
+    try:
+        await in_flight.do(url, fetch)
+    except (CircuitOpenError, NotFoundError, ServiceBusyError):
+        pass
+
+
+async def fetch_nws(url: str, raise_not_found: bool = False) -> dict[str, Any] | None:
+    """Fetch a URL from the NWS API and cache the parsed response.
+
+    Args:
+        url: The NWS URL to fetch.
+        raise_not_found: Raise NotFoundError on a 404 instead of returning None.
+
+    Raises:
+        CircuitOpenError: If the circuit breaker is not letting calls through.
+        NotFoundError: If raise_not_found is set and NWS answered 404.
+        ServiceBusyError: If NWS asked to wait longer than the client allows.
+    """
+    # Revalidate an expired entry instead of downloading it again
+    entry = response_cache.get_entry(url)
+    headers = entry.conditional_headers() if entry is not None else None
+
+    try:
+        response = await nws_client.get(url, headers=headers or None)
+    except (CircuitOpenError, ServiceBusyError):
+        raise
+    except Exception as e:
+        logging.warning(f"NWS request to {url} failed: {e!r}")
+        return None
+
+    if response.status_code == 404 and raise_not_found:
+        raise NotFoundError(f"NWS has no resource at {url}")
+
+    try:
+        if response.status_code == 304 and entry is not None:
+            return await response_cache.revalidate(url, entry, response)
+        response.raise_for_status()
+        data = response.json()
+    except Exception as e:
+        logging.warning(f"NWS request to {url} failed: {e!r}")
+        return None
+
+    await response_cache.store(url, response, data)
+    return data
+
+
+async def fetch_nws_alerts(
+    url: str, on_alert: Callable[[dict], Awaitable[None]] | None = None
+) -> dict[str, Any] | None:
+    """Stream an alerts FeatureCollection from the NWS API and cache the alerts.
+
+    Features are parsed one at a time as the body arrives and passed to
+    on_alert straight away, so the first alert is available before the
+    download finishes and the full payload is never held in memory. Only
+    the properties format_alert uses are kept, for at most ALERT_KEEP_LIMIT
+    alerts. Beyond that the rest are only passed to on_alert, the result
+    counts them under "omitted", and it is not cached.
+
+    Raises:
+        CircuitOpenError: If the circuit breaker is not letting calls through.
+        ServiceBusyError: If NWS asked to wait longer than the client allows.
+    """
+    entry = response_cache.get_entry(url)
+    headers = entry.conditional_headers() if entry is not None else None
+    features = []
+    omitted = 0
+
+    try:
+        async with nws_client.stream(url, headers=headers or None) as response:
+            if response.status_code == 304 and entry is not None:
+                return await response_cache.revalidate(url, entry, response)
             response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+
+            async for feature in iter_features(response.aiter_text()):
+                properties = feature.get("properties") or {}
+                alert = {
+                    "properties": {
+                        name: properties[name]
+                        for name in ALERT_PROPERTIES
+                        if name in properties
+                    }
+                }
+                if len(features) < ALERT_KEEP_LIMIT:
+                    features.append(alert)
+                else:
+                    omitted += 1
+                if on_alert is not None:
+                    await on_alert(alert)
+    except (CircuitOpenError, ServiceBusyError):
+        raise
+    except Exception as e:
+        logging.warning(f"NWS request to {url} failed: {e!r}")
+        return None
+
+    if omitted:
+        return {"features": features, "omitted": omitted}
+    data = {"features": features}
+    await response_cache.store(url, response, data)
+    return data
+
+
+async def prefetch_url(
+    url: str, fetch: Callable[[], Awaitable[dict[str, Any] | None]]
+) -> None:
+    """Refresh a URL unless its cached copy stays fresh until the next prefetch."""
+    await response_cache.load(url)
+    entry = response_cache.get_entry(url)
+    if entry is not None and entry.expires_at - time.monotonic() > PREFETCH_INTERVAL:
+        return
+    await refresh(url, fetch)
+
+
+async def prefetch_city(latitude: float, longitude: float) -> None:
+    """Keep a city's grid point and forecast cached."""
+    grid_point = await resolve_grid_point(latitude, longitude)
+    if grid_point is not None:
+        url = grid_point.forecast_url
+        await prefetch_url(url, partial(fetch_nws, url))
+
+
+def prefetch_jobs() -> list[Callable[[], Awaitable[None]]]:
+    """Prefetch jobs for the major city forecasts and the listed states' alerts."""
+    jobs = [
+        partial(prefetch_city, city["latitude"], city["longitude"])
+        for city in MAJOR_CITIES
+    ]
+    for state in STATES:
+        url = f"{NWS_API_BASE}/alerts/active/area/{state['code']}"
+        jobs.append(partial(prefetch_url, url, partial(fetch_nws_alerts, url)))
+    return jobs
+
+
+def mark_age(text: str, age: float | None) -> str:
+    """Prefix a tool result with the age of the cached data it was built from."""
+    if age is None:
+        return text
+    return f"(Cached data from {age:.0f} seconds ago.)\n{text}"
+
+
+def busy_message(error: ServiceBusyError) -> str:
+    """Tell the caller NWS is throttling requests and when to try again."""
+    return f"The weather service is busy; retry after {math.ceil(error.retry_after)} seconds."
 
 
 def format_alert(feature: dict) -> str:
@@ -37,15 +317,200 @@ Instructions: {props.get('instruction', 'No specific instructions provided')}
 
 
 @mcp.tool()
-async def get_alerts(state: str) -> str:
-    # Add tool that return weather alerts for a US state
-    return ""
+async def get_alerts(state: str, ctx: Context) -> str:
+    """Get weather alerts for a US state.
+
+    Args:
+        state: Two-letter US state code (e.g. CA, NY)
+    """
+    url = f"{NWS_API_BASE}/alerts/active/area/{state}"
+    active = True
+
+    # When this call downloads the alerts itself, also send each one to the
+    # client as soon as it has been parsed, and only while the call is
+    # running. The result always carries the alerts as well, since many
+    # clients never show log messages to the model.
+    async def send_alert(feature: dict) -> None:
+        if active:
+            await ctx.info(format_alert(feature))
+
+    try:
+        data, age = await make_nws_request_with_age(
+            url,
+            fetch=partial(fetch_nws_alerts, url),
+            foreground_fetch=partial(fetch_nws_alerts, url, send_alert),
+        )
+    except ServiceBusyError as e:
+        return busy_message(e)
+    finally:
+        active = False
+
+    if not data or "features" not in data:
+        return "Unable to fetch alerts or no alerts found."
+
+    if not data["features"]:
+        return mark_age("No active alerts for this state.", age)
+
+    alerts = [format_alert(feature) for feature in data["features"]]
+    if data.get("omitted"):
+        alerts.append(f"{data['omitted']} more alerts not shown.")
+    return mark_age("\n---\n".join(alerts), age)
 
 
 @mcp.tool()
 async def get_forecast(latitude: float, longitude: float) -> str:
-    # Add tool that return weather forecast for a location 
-    return ""
+    """Get weather forecast for a location.
+
+    Args:
+        latitude: Latitude of the location
+        longitude: Longitude of the location
+    """
+    try:
+        grid_point = await resolve_grid_point(latitude, longitude)
+        if grid_point is None:
+            return "Unable to fetch forecast data for this location."
+
+        forecast_data, age, gone = await request_forecast(grid_point.forecast_url)
+    except ServiceBusyError as e:
+        return busy_message(e)
+
+    if forecast_data is None:
+        if gone:
+            # The grid may have moved; resolve the location again next time
+            await grid_cache.invalidate(latitude, longitude)
+        return "Unable to fetch detailed forecast."
+
+    # Let nearby coordinates in the same grid cell reuse this forecast
+    await grid_cache.store_cell(grid_point.forecast_url, forecast_data.get("geometry"))
+    return mark_age(format_forecast(forecast_data), age)
+
+
+@mcp.tool()
+async def get_forecasts(locations: list[dict[str, float]], ctx: Context) -> str:
+    """Get weather forecasts for several locations at once.
+
+    Locations are fetched concurrently and those in the same forecast grid
+    cell share one request. Each forecast is sent as a log message as soon
+    as it completes; the returned text lists them in the order given.
+
+    Args:
+        locations: List of {"latitude": ..., "longitude": ...} objects
+    """
+    try:
+        coordinates = [
+            (float(location["latitude"]), float(location["longitude"]))
+            for location in locations
+        ]
+    except (KeyError, TypeError, ValueError):
+        return "Each location needs a numeric latitude and longitude."
+
+    if not coordinates:
+        return "No locations given."
+
+    semaphore = asyncio.Semaphore(FORECAST_BATCH_CONCURRENCY)
+    forecast_requests: dict[str, asyncio.Task] = {}
+
+    async def fetch_forecast(url: str) -> tuple[dict[str, Any] | None, float | None, bool]:
+        async with semaphore:
+            return await request_forecast(url)
+
+    async def forecast_for(latitude: float, longitude: float) -> tuple[float, float, str]:
+        try:
+            async with semaphore:
+                grid_point = await resolve_grid_point(latitude, longitude)
+            if grid_point is None:
+                return latitude, longitude, "Unable to fetch forecast data for this location."
+
+            # Locations in the same grid cell wait on the same forecast request
+            request = forecast_requests.get(grid_point.forecast_url)
+            if request is None:
+                request = asyncio.ensure_future(fetch_forecast(grid_point.forecast_url))
+                forecast_requests[grid_point.forecast_url] = request
+            forecast_data, age, gone = await request
+        except ServiceBusyError as e:
+            return latitude, longitude, busy_message(e)
+
+        if forecast_data is None:
+            if gone:
+                await grid_cache.invalidate(latitude, longitude)
+            return latitude, longitude, "Unable to fetch detailed forecast."
+
+        await grid_cache.store_cell(grid_point.forecast_url, forecast_data.get("geometry"))
+        return latitude, longitude, mark_age(format_forecast(forecast_data), age)
+
+    unique = list(dict.fromkeys(coordinates))
+    results: dict[tuple[float, float], str] = {}
+    for completed in asyncio.as_completed([forecast_for(*c) for c in unique]):
+        latitude, longitude, forecast = await completed
+        results[(latitude, longitude)] = forecast
+        await ctx.info(f"Forecast for {latitude}, {longitude}:\n{forecast}")
+        await ctx.report_progress(len(results), len(unique))
+
+    return "\n===\n".join(
+        f"Location {latitude}, {longitude}:\n{results[(latitude, longitude)]}"
+        for latitude, longitude in coordinates
+    )
+
+
+async def resolve_grid_point(latitude: float, longitude: float) -> GridPoint | None:
+    """Find the forecast grid cell for a location, resolving it with NWS if it is unknown."""
+    grid_point = await grid_cache.get(latitude, longitude)
+    if grid_point is not None:
+        return grid_point
+
+    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
+    points_data = await make_nws_request(points_url)
+
+    if not points_data or "properties" not in points_data:
+        return None
+
+    return await grid_cache.store(latitude, longitude, points_data["properties"])
+
+
+async def request_forecast(url: str) -> tuple[dict[str, Any] | None, float | None, bool]:
+    """Request a grid cell's forecast, telling whether the cell itself looks wrong.
+
+    Only a 404 or a forecast without periods suggests the grid moved and the
+    location should be resolved again. Outages, timeouts and an open circuit
+    breaker say nothing about the grid, so they must not invalidate it.
+
+    Args:
+        url: The forecast URL of the grid cell.
+
+    Returns:
+        The forecast (None on failure), the age of a stale cached copy if one
+        was served, and whether the grid cell was not found or malformed.
+    """
+    try:
+        forecast_data, age = await make_nws_request_with_age(
+            url, foreground_fetch=partial(fetch_nws, url, raise_not_found=True)
+        )
+    except NotFoundError:
+        return None, None, True
+
+    if forecast_data is None:
+        return None, None, False
+    properties = forecast_data.get("properties")
+    if not isinstance(properties, dict) or not isinstance(properties.get("periods"), list):
+        logging.warning(f"NWS forecast from {url} has no forecast periods")
+        return None, None, True
+    return forecast_data, age, False
+
+
+def format_forecast(forecast_data: dict) -> str:
+    """Format the next forecast periods into a readable string."""
+    periods = forecast_data["properties"]["periods"]
+    forecasts = []
+    for period in periods[:5]:  # Only show next 5 periods
+        forecast = f"""
+{period['name']}:
+Temperature: {period['temperature']}°{period['temperatureUnit']}
+Wind: {period['windSpeed']} {period['windDirection']}
+Forecast: {period['detailedForecast']}
+"""
+        forecasts.append(forecast)
+
+    return "\n---\n".join(forecasts)
 
 
 @mcp.prompt(title="New York Weather")
@@ -65,8 +530,13 @@ def los_angeles_weather() -> str:
     description="List of US state codes and names for weather alerts",
 )
 def get_state_codes_resource() -> str:
-    # Add resource that return JSON with US state codes and names
-    return ""
+    """Return JSON describing US state codes usable by the GetAlerts tool."""
+    return json.dumps(
+        {
+            "description": "US State codes for use with GetAlerts tool",
+            "states": STATES,
+        }
+    )
 
 
 @mcp.resource(
@@ -74,8 +544,35 @@ def get_state_codes_resource() -> str:
     description="Coordinates for major US cities to use with weather forecast",
 )
 def get_major_cities_resource() -> str:
-    # Add resource that return JSON with major US cities and their coordinates
-    return ""
+    """Return JSON with coordinates for a few major US cities."""
+    return json.dumps(
+        {
+            "description": "Pre-defined coordinates for major US cities",
+            "cities": MAJOR_CITIES,
+        }
+    )
+
+
+@mcp.resource(
+    uri="weather://metrics",
+    description="NWS circuit breaker state and caching, coalescing and rate limiting counters",
+)
+def get_metrics_resource() -> str:
+    return json.dumps(
+        {
+            "circuitBreaker": circuit_breaker.stats(),
+            "cache": response_cache.stats(),
+            "gridPoints": grid_cache.stats(),
+            "singleFlight": in_flight.stats(),
+            **nws_client.stats(),
+            "prefetcher": prefetcher.stats(),
+        },
+        indent=2,
+    )
+
+
+# Keeps popular forecasts and alerts cached when NWS_PREFETCH is set
+prefetcher = Prefetcher(prefetch_jobs())
 
 
 def main():